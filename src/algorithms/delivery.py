@@ -0,0 +1,101 @@
+from algorithms.supplies_per_vehicles import DEFAULT_ALLOCATOR, split_supplies_per_vehicle
+from supply import Supply, SupplyType
+from vehicle import VehicleStatus
+
+def get_supplies_to_send(start_point, end_point):
+    """
+    Works out which supplies a start point can send to an end point.
+
+    Args:
+        start_point (object): The starting node containing the supplies to be delivered.
+        end_point (object): The destination node where supplies are needed.
+
+    Returns:
+        tuple: The list of supplies to send and a dictionary mapping each supply type to the
+               quantity taken from the start point.
+    """
+    supplies_to_send = []
+    supplies_consumed = {supply_type: 0 for supply_type in SupplyType}
+    for needed_type, needed_quantity in end_point.supplies_needed.items():
+        total_available = sum(s.quantity for s in start_point.supplies if s.type == SupplyType[needed_type])
+        quantity = min(needed_quantity, total_available)
+        supplies_to_send.append(Supply(quantity, SupplyType[needed_type]))
+        supplies_consumed[SupplyType[needed_type]] = quantity
+    return supplies_to_send, supplies_consumed
+
+def transfer_supplies(start_point, end_point, supplies_consumed):
+    """
+    Takes supplies from a start point and gives them to an end point.
+
+    Args:
+        start_point (object): The starting node containing the supplies.
+        end_point (object): The destination node where supplies are needed.
+        supplies_consumed (dict): The quantity of each supply type to take from the start point.
+    """
+    for supply_type, quantity_used in supplies_consumed.items():
+        if quantity_used > 0:
+            for supply in start_point.supplies:
+                if supply.type == supply_type:
+                    if supply.quantity >= quantity_used:
+                        supply.quantity -= quantity_used
+                        end_point.satisfy_supplies([Supply(quantity_used, supply_type)])
+                        break
+                    else:
+                        quantity_used -= supply.quantity
+                        end_point.satisfy_supplies([Supply(supply.quantity, supply_type)])
+                        supply.quantity = 0
+
+def dispatch(state, start_point, end_point, route, terrain, allocator=DEFAULT_ALLOCATOR):
+    """
+    Sends the supplies needed by an end point along a route that has already been found.
+
+    This is the only step of a supply delivery that changes the state: the idle vehicles at the
+    start point that can cover the route are loaded, moved to the end point and marked as busy, and
+    the supplies they carry are taken from the start point and given to the end point.
+
+    Args:
+        state (object): The current state of the simulation.
+        start_point (object): The starting node containing the supplies to be delivered.
+        end_point (object): The destination node where supplies are needed.
+        route (Route): The route from the start point to the end point, or None if there is none.
+        terrain (object): The type of terrain for the delivery route.
+        allocator (str, optional): The name of the allocator sharing the supplies among the vehicles
+                                   (see algorithms/supplies_per_vehicles.py). Defaults to DEFAULT_ALLOCATOR.
+
+    Returns:
+        tuple: A tuple containing the path as a list of positions, total distance covered, total time taken,
+               and a dictionary mapping vehicle IDs to the supplies they delivered.
+               If there is no route, returns (None, 0, 0, "No path found."), and if there are no
+               available vehicles, returns (None, 0, 0, "There aren't any available vehicles.").
+    """
+    if route is None:
+        return None, 0, 0, "No path found."
+
+    supplies_to_send, _ = get_supplies_to_send(start_point, end_point)
+
+    # Assign supplies to vehicles
+    vehicles = [v for v in state.vehicles
+                if v.position == start_point.position and v.vehicle_status == VehicleStatus.IDLE and
+                v.current_fuel >= route.distance and v.type.can_access_terrain(terrain)]
+    supplies_per_vehicle = split_supplies_per_vehicle(vehicles, supplies_to_send, allocator)
+
+    total_time = 0
+    for vehicle, supplies in zip(vehicles, supplies_per_vehicle):
+        if supplies:
+            vehicle.position = end_point.position
+            vehicle.vehicle_status = VehicleStatus.BUSY
+            vehicle.current_fuel -= route.distance
+            total_time += route.travel_time(vehicle)
+
+    if not supplies_per_vehicle:
+        return None, 0, 0, "There aren't any available vehicles."
+
+    # Only what the vehicles could carry reaches the end point
+    supplies_consumed = {supply_type: 0 for supply_type in SupplyType}
+    for supplies in supplies_per_vehicle:
+        for supply in supplies:
+            supplies_consumed[supply.type] += supply.quantity
+    transfer_supplies(start_point, end_point, supplies_consumed)
+
+    return (list(route.positions), route.distance, total_time,
+        {vehicle.id: [s.type.name for s in supplies] for vehicle, supplies in zip(vehicles, supplies_per_vehicle)})
@@ -0,0 +1,424 @@
+import hashlib
+import json
+import os
+from os import path
+
+import numpy as np
+
+from algorithms.search import reconstruct_path, shortest_path_tree
+from graph.blocked_routes import BlockedRoutes
+from graph.compact_graph import CompactGraph
+from graph.contraction_hierarchy import graph_fingerprint
+from graph.position import Position
+from weather import DISTANCE_FACTORS, STORM_CODE, VELOCITY_FACTORS
+
+MATRIX_VERSION = 1
+MATRIX_DIRECTORY = os.environ.get(
+    "IA_MATRIX_DIR", path.join(path.dirname(__file__), "..", "..", "cache", "matrices")
+)
+
+# Cost of going into a node under each weather code, STORM nodes being inaccessible
+_ENTRY_COSTS = np.array([float('inf') if code == STORM_CODE else factor for code, factor in enumerate(DISTANCE_FACTORS)])
+_VELOCITY_FACTORS = np.array(VELOCITY_FACTORS, dtype=np.float64)
+
+class DistanceMatrix:
+    """
+    The travel distances and times between every pair of points of interest of a simulation: the
+    start point, the end points and the nodes where vehicles are parked.
+
+    Each row is computed with a single Dijkstra search from one point, which stops once it has
+    settled every other point, instead of one search per pair. The distances are stored in an
+    n x n NumPy array, and the travel times in a t x n x n array, one matrix per vehicle type,
+    computed along the same paths as Route.travel_time computes them.
+
+    Besides the paths, each row remembers which nodes its search settled, so after the weather or
+    the blocked routes change, refresh recomputes only the rows that may have changed: the rows
+    whose paths go through a node that got more expensive (or a route that was blocked), and the
+    rows whose search reached a node that got cheaper (or a route that was unblocked). A node the
+    search never reached, nor any of its neighbours, is farther than every point of the row, so it
+    cannot make any of its paths shorter.
+
+    Attributes:
+        graph (Graph or CompactGraph): The graph searched.
+        positions (tuple): The position of each point, in the order of the rows and columns.
+        node_ids (numpy.ndarray): The ID of the node of each point.
+        terrain (int): The type of terrain being traversed.
+        type_names (tuple): The name of each vehicle type, in the order of the time matrices.
+        velocities (numpy.ndarray): The average velocity of each vehicle type.
+        distances (numpy.ndarray): The distance between each pair of points (inf if unreachable).
+        times (numpy.ndarray): The travel time between each pair of points, per vehicle type.
+    """
+    def __init__(self, graph, positions, terrain, type_names, velocities):
+        """
+        Initializes a matrix without computing any row.
+
+        Args:
+            graph (Graph or CompactGraph): The graph to search.
+            positions (list): The positions of the points.
+            terrain (int): The type of terrain being traversed.
+            type_names (list): The name of each vehicle type.
+            velocities (list): The average velocity of each vehicle type.
+
+        Raises:
+            ValueError: If there is no node at one of the positions.
+        """
+        self.graph = graph
+        self.positions = tuple(positions)
+        self.terrain = terrain
+        self.type_names = tuple(type_names)
+        self.velocities = np.asarray(velocities, dtype=np.float64)
+
+        self._keys = []
+        for position in self.positions:
+            key = graph.key_of(position)
+            if key is None:
+                raise ValueError(f"There is no node at {position}.")
+            self._keys.append(key)
+        self._index = {position: i for i, position in enumerate(self.positions)}
+        self.node_ids = np.array([graph.node_id(key) for key in self._keys], dtype=np.int64)
+
+        n = len(self.positions)
+        self.distances = np.full((n, n), float('inf'))
+        self.times = np.full((len(self.type_names), n, n), float('inf'))
+        self._paths = [[None] * n for _ in range(n)]  # Node IDs of the path of each pair
+        self._settled = None  # Packed mask of the node IDs settled by the search of each row
+
+        # Conditions the rows were computed for, so refresh can tell what changed
+        self._codes = None
+        self._blocked = set()
+
+    @classmethod
+    def build(cls, state, terrain=0, weather=None, blocked_routes=(), executor=None):
+        """
+        Computes the matrix of the points of interest of a simulation.
+
+        Args:
+            state (object): The current simulation state, including vehicles and graph information.
+            terrain (int, optional): The type of terrain being traversed. Defaults to 0.
+            weather (Weather, optional): The weather conditions. Defaults to the weather of the state.
+            blocked_routes (BlockedRoutes or set, optional): The routes that cannot be used.
+            executor (RoutingExecutor, optional): Computes the rows in parallel in its workers, in
+                                                  which case it must have been created for the same
+                                                  state. Defaults to None (in this process).
+
+        Returns:
+            DistanceMatrix: The matrix.
+        """
+        type_names, velocities = _vehicle_types(state)
+        matrix = cls(state.graph, points_of_interest(state), terrain, type_names, velocities)
+        matrix._compute(range(len(matrix.positions)), weather or state.weather,
+                        BlockedRoutes.coerce(blocked_routes), executor)
+        return matrix
+
+    def __len__(self):
+        return len(self.positions)
+
+    def index(self, position):
+        """
+        Returns the row (and column) of the point at a position.
+
+        Args:
+            position (Position): The position of the point.
+
+        Returns:
+            int: The index of the point.
+
+        Raises:
+            KeyError: If there is no point at that position.
+        """
+        return self._index[position]
+
+    def distance(self, origin, destination):
+        """
+        Returns the distance between two points.
+
+        Args:
+            origin (Position): The position of the first point.
+            destination (Position): The position of the second point.
+
+        Returns:
+            float: The distance, or inf if the destination cannot be reached.
+        """
+        return float(self.distances[self.index(origin), self.index(destination)])
+
+    def travel_time(self, origin, destination, vehicle_type):
+        """
+        Returns how long a vehicle of some type takes to drive between two points.
+
+        Args:
+            origin (Position): The position of the first point.
+            destination (Position): The position of the second point.
+            vehicle_type (VehicleType or str): The vehicle type, or its name.
+
+        Returns:
+            float: The travel time, or inf if the destination cannot be reached.
+
+        Raises:
+            ValueError: If no vehicle of the simulation is of that type.
+        """
+        name = getattr(vehicle_type, "name", vehicle_type)
+        if name not in self.type_names:
+            raise ValueError(f"Unknown vehicle type '{name}'.")
+        return float(self.times[self.type_names.index(name), self.index(origin), self.index(destination)])
+
+    def path(self, origin, destination):
+        """
+        Returns the IDs of the nodes of the shortest path between two points.
+
+        Args:
+            origin (Position): The position of the first point.
+            destination (Position): The position of the second point.
+
+        Returns:
+            numpy.ndarray: The node IDs, from origin to destination, or None if the destination
+                           cannot be reached.
+        """
+        return self._paths[self.index(origin)][self.index(destination)]
+
+    def refresh(self, weather, blocked_routes=(), executor=None):
+        """
+        Recomputes the rows that may have changed since the matrix was computed, after a change of
+        the weather or of the blocked routes.
+
+        Args:
+            weather (Weather): The current weather conditions.
+            blocked_routes (BlockedRoutes or set, optional): The routes that cannot be used now.
+            executor (RoutingExecutor, optional): Computes the rows in parallel in its workers.
+
+        Returns:
+            list: The indices of the rows recomputed.
+        """
+        blocked_routes = BlockedRoutes.coerce(blocked_routes)
+        codes = np.asarray(weather.codes)
+        changed = (codes != self._codes).nonzero()[0]
+        old_costs, new_costs = _ENTRY_COSTS[self._codes[changed]], _ENTRY_COSTS[codes[changed]]
+
+        # Nodes that can only make the paths through them longer
+        worse = set(changed[new_costs > old_costs].tolist())
+        blocked = set(blocked_routes)
+        for a, b in blocked - self._blocked:
+            worse.update((a, b))
+
+        # Nodes that may now be part of shorter paths, along with the nodes they can be reached from
+        better = set()
+        for node_id in changed[new_costs < old_costs].tolist():
+            better.add(node_id)
+            key = self.graph.key_of(Position(float(weather.xs[node_id]), float(weather.ys[node_id])))
+            if key is not None:
+                better.update(self.graph.node_id(neighbour) for neighbour, _ in self.graph.edges(key))
+        for a, b in self._blocked - blocked:
+            better.update((a, b))
+
+        rows = []
+        worse, better = np.array(sorted(worse), dtype=np.int64), np.array(sorted(better), dtype=np.int64)
+        size = len(self._codes)
+        for i in range(len(self.positions)):
+            paths = [path for path in self._paths[i] if path is not None]
+            if len(worse) and paths and np.isin(worse, np.concatenate(paths)).any():
+                rows.append(i)
+            elif len(better) and np.unpackbits(self._settled[i], count=size)[better].any():
+                rows.append(i)
+
+        if rows:
+            self._compute(rows, weather, blocked_routes, executor)
+        self._codes = codes.copy()
+        self._blocked = blocked
+        return rows
+
+    def _compute(self, rows, weather, blocked_routes, executor):
+        """
+        Searches the given rows again and stores their distances, times, paths and settled nodes.
+        """
+        rows = list(rows)
+        if executor is not None:
+            results = executor.matrix_rows(self.positions, rows, self.terrain, blocked_routes)
+        else:
+            results = [matrix_row(self.graph, weather, self._keys[i], self._keys, self.terrain, blocked_routes)
+                       for i in rows]
+
+        codes = np.asarray(weather.codes)
+        if self._settled is None:
+            self._settled = np.zeros((len(self.positions), (len(codes) + 7) // 8), dtype=np.uint8)
+        for i, (distances, paths, settled) in zip(rows, results):
+            self.distances[i] = distances
+            self._paths[i] = paths
+            self._settled[i] = settled
+            for j, node_ids in enumerate(paths):
+                if node_ids is not None:
+                    self.times[:, i, j] = _path_time(node_ids, weather, codes) / self.velocities
+                else:
+                    self.times[:, i, j] = float('inf')
+        self._codes = codes.copy()
+        self._blocked = set(blocked_routes)
+
+    def save(self, file):
+        """
+        Writes the matrix, with the paths and the conditions it was computed for, to a .npz file.
+
+        Args:
+            file (str): The path of the file.
+        """
+        paths = [path if path is not None else np.empty(0, dtype=np.int64) for row in self._paths for path in row]
+        offsets = np.zeros(len(paths) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(path) for path in paths])
+        np.savez(file, version=MATRIX_VERSION, key=matrix_key(self.graph, self.positions, self.terrain,
+                                                              self.type_names, self.velocities),
+                 distances=self.distances, times=self.times, path_offsets=offsets,
+                 path_nodes=np.concatenate(paths) if paths else np.empty(0, dtype=np.int64),
+                 settled=self._settled, codes=self._codes,
+                 blocked=np.array(sorted(self._blocked), dtype=np.int64).reshape(-1, 2))
+
+    @classmethod
+    def load(cls, file, graph, positions, terrain, type_names, velocities):
+        """
+        Reads a matrix written by save.
+
+        Args:
+            file (str): The path of the file.
+            graph (Graph or CompactGraph): The graph the matrix was computed on.
+            positions (list): The positions of the points.
+            terrain (int): The type of terrain being traversed.
+            type_names (list): The name of each vehicle type.
+            velocities (list): The average velocity of each vehicle type.
+
+        Returns:
+            DistanceMatrix: The matrix, valid for the conditions it was saved with, or None if the
+                            file cannot be read or was computed for other points, another graph or
+                            by another version.
+        """
+        try:
+            with np.load(file) as arrays:
+                if (int(arrays["version"]) != MATRIX_VERSION or
+                        str(arrays["key"]) != matrix_key(graph, positions, terrain, type_names, velocities)):
+                    return None
+                matrix = cls(graph, positions, terrain, type_names, velocities)
+                matrix.distances = arrays["distances"]
+                matrix.times = arrays["times"]
+                offsets, nodes = arrays["path_offsets"], arrays["path_nodes"]
+                n = len(matrix.positions)
+                matrix._paths = [[nodes[offsets[i * n + j]:offsets[i * n + j + 1]] if offsets[i * n + j + 1] > offsets[i * n + j]
+                                  else None for j in range(n)] for i in range(n)]
+                matrix._settled = arrays["settled"]
+                matrix._codes = arrays["codes"]
+                matrix._blocked = {(int(a), int(b)) for a, b in arrays["blocked"]}
+                return matrix
+        except (OSError, ValueError, KeyError):
+            return None
+
+def points_of_interest(state):
+    """
+    Returns the positions of the points of interest of a simulation: the start point, then the end
+    points, then the positions of the vehicles, each position only once.
+
+    Args:
+        state (object): The current simulation state.
+
+    Returns:
+        list: The positions.
+    """
+    positions = [state.start_point.position] + [end_point.position for end_point in state.end_points]
+    positions += [vehicle.position for vehicle in state.vehicles]
+    return list(dict.fromkeys(positions))
+
+def matrix_row(graph, weather, source, targets, terrain, blocked_routes):
+    """
+    Computes one row of a distance matrix with a single Dijkstra search.
+
+    Args:
+        graph (Graph or CompactGraph): The graph to search.
+        weather (Weather): The weather conditions.
+        source (object): The key of the node of the row.
+        targets (list): The keys of the nodes of the columns.
+        terrain (int): The type of terrain being traversed.
+        blocked_routes (BlockedRoutes): The routes that cannot be used.
+
+    Returns:
+        tuple: The distance to each target (inf if unreachable), the node IDs of the path to each
+               target (None if unreachable), and the IDs of the nodes settled by the search as a
+               mask packed with numpy.packbits.
+    """
+    parents, distances = shortest_path_tree(graph, source, terrain, weather, blocked_routes, targets=targets)
+    row = np.array([distances.get(target, float('inf')) for target in targets], dtype=np.float64)
+    paths = [np.array([graph.node_id(key) for key in reconstruct_path(parents, target)], dtype=np.int64)
+             if target in parents else None for target in targets]
+
+    settled = np.zeros(len(weather.codes), dtype=bool)
+    settled[[graph.node_id(key) for key in parents]] = True
+    return row, paths, np.packbits(settled)
+
+def matrix_key(graph, positions, terrain, type_names, velocities):
+    """
+    Returns the key of the stored matrix of some points of a graph.
+
+    Args:
+        graph (Graph or CompactGraph): The graph.
+        positions (list): The positions of the points.
+        terrain (int): The type of terrain being traversed.
+        type_names (list): The name of each vehicle type.
+        velocities (list): The average velocity of each vehicle type.
+
+    Returns:
+        str: The hexadecimal key.
+    """
+    compact = graph if isinstance(graph, CompactGraph) else CompactGraph.from_graph(graph)
+    content = json.dumps([MATRIX_VERSION, graph_fingerprint(compact), [(p.x, p.y) for p in positions], terrain,
+                          list(type_names), [float(velocity) for velocity in velocities]])
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+def load_distance_matrix(state, terrain=0, weather=None, blocked_routes=(), directory=None, executor=None):
+    """
+    Returns the distance matrix of the points of interest of a simulation, reading it from disk if
+    it was already computed and storing it otherwise.
+
+    A stored matrix computed under other weather conditions or blocked routes is refreshed, so only
+    the rows affected by the differences are computed again.
+
+    Args:
+        state (object): The current simulation state.
+        terrain (int, optional): The type of terrain being traversed. Defaults to 0.
+        weather (Weather, optional): The weather conditions. Defaults to the weather of the state.
+        blocked_routes (BlockedRoutes or set, optional): The routes that cannot be used.
+        directory (str, optional): The directory the matrices are stored in. Defaults to
+                                   MATRIX_DIRECTORY.
+        executor (RoutingExecutor, optional): Computes the rows in parallel in its workers.
+
+    Returns:
+        DistanceMatrix: The matrix.
+    """
+    weather = weather or state.weather
+    directory = directory or MATRIX_DIRECTORY
+    type_names, velocities = _vehicle_types(state)
+    positions = points_of_interest(state)
+    file = path.join(directory, f"{matrix_key(state.graph, positions, terrain, type_names, velocities)}.npz")
+
+    matrix = DistanceMatrix.load(file, state.graph, positions, terrain, type_names, velocities)
+    if matrix is None:
+        matrix = DistanceMatrix.build(state, terrain, weather, blocked_routes, executor)
+    elif not matrix.refresh(weather, blocked_routes, executor):
+        return matrix
+
+    os.makedirs(directory, exist_ok=True)
+    temporary_file = f"{file}.tmp-{os.getpid()}.npz"
+    matrix.save(temporary_file)
+    os.replace(temporary_file, file)
+    return matrix
+
+def _vehicle_types(state):
+    """
+    Returns the names and average velocities of the vehicle types of a simulation, each type once.
+    """
+    types = {}
+    for vehicle in state.vehicles:
+        types.setdefault(vehicle.type.name, vehicle.type.average_velocity)
+    return list(types), list(types.values())
+
+def _path_time(node_ids, weather, codes):
+    """
+    Returns the time a vehicle with an average velocity of 1 takes along a path, skipping the first
+    edge as Route.travel_time does.
+    """
+    if len(node_ids) < 3:
+        return 0.0
+    xs, ys = weather.xs[node_ids[1:]], weather.ys[node_ids[1:]]
+    lengths = np.abs(np.diff(xs)) + np.abs(np.diff(ys))
+    return float(np.sum(lengths / _VELOCITY_FACTORS[codes[node_ids[1:-1]]]))
@@ -0,0 +1,122 @@
+import heapq
+from itertools import count
+
+# Best priority recorded for a node once it has been popped, so it is never pushed again
+_CLOSED = float('-inf')
+
+class Frontier:
+    """
+    The frontier of a best-first search: a binary heap with lazy deletion.
+
+    Instead of looking an entry up in the heap to lower its priority (decrease-key), a new entry is
+    pushed and the old one is left behind. The best priority pushed for each node is kept in a
+    dictionary, so pushes that would not improve it are ignored, and entries that were superseded
+    (or belong to nodes already popped) are recognised as stale and skipped when they reach the top.
+
+    Entries with the same priority are popped in the order they were pushed, through a counter
+    stored right after the priority. This makes the order independent of the type of the node
+    keys, which are never compared.
+
+    Attributes:
+        pushed (int): The number of entries pushed.
+        stale (int): The number of stale entries popped and discarded.
+    """
+    def __init__(self):
+        self._heap = []  # (priority, counter, key, item)
+        self._best = {}  # Key -> best priority pushed, or _CLOSED once popped
+        self._counter = count()
+        self.pushed = 0
+        self.stale = 0
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __bool__(self):
+        return self.peek() is not None
+
+    def push(self, key, priority, item=None):
+        """
+        Adds a node to the frontier, unless it was already added with a lower or equal priority
+        or has already been popped.
+
+        Args:
+            key (object): The key of the node.
+            priority (float): The priority of the node; the lowest is popped first.
+            item (object, optional): Data popped along with the node.
+
+        Returns:
+            bool: True if the node was added, otherwise False.
+        """
+        best = self._best.get(key)
+        if best is not None and best <= priority:
+            return False
+
+        self._best[key] = priority
+        heapq.heappush(self._heap, (priority, next(self._counter), key, item))
+        self.pushed += 1
+        return True
+
+    def pop(self):
+        """
+        Removes the node with the lowest priority from the frontier.
+
+        Returns:
+            tuple: The priority, the key and the item of the node.
+
+        Raises:
+            IndexError: If the frontier is empty.
+        """
+        heap, best = self._heap, self._best
+        while heap:
+            priority, _, key, item = heapq.heappop(heap)
+            if best[key] == priority:
+                best[key] = _CLOSED
+                return priority, key, item
+            self.stale += 1
+        raise IndexError("pop from an empty frontier")
+
+    def drain(self):
+        """
+        Pops nodes in priority order until the frontier is empty, including the ones pushed while
+        iterating. This is equivalent to calling pop while the frontier is not empty, but cheaper.
+
+        Yields:
+            tuple: The priority, the key and the item of each node.
+        """
+        heap, best = self._heap, self._best
+        heappop = heapq.heappop
+        while heap:
+            priority, _, key, item = heappop(heap)
+            if best[key] == priority:
+                best[key] = _CLOSED
+                yield priority, key, item
+            else:
+                self.stale += 1
+
+    def peek(self):
+        """
+        Returns the node with the lowest priority without removing it.
+
+        Returns:
+            tuple: The priority, the key and the item of the node, or None if the frontier is empty.
+        """
+        heap, best = self._heap, self._best
+        while heap:
+            priority, _, key, item = heap[0]
+            if best[key] == priority:
+                return priority, key, item
+            heapq.heappop(heap)
+            self.stale += 1
+        return None
+
+    def is_closed(self, key):
+        """
+        Checks whether a node has already been popped.
+
+        Args:
+            key (object): The key of the node.
+
+        Returns:
+            bool: True if the node was popped, otherwise False.
+        """
+        return self._best.get(key) == _CLOSED
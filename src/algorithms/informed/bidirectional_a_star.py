@@ -0,0 +1,65 @@
+from algorithms.delivery import dispatch
+from algorithms.informed.heuristic_context import bind_heuristic
+from algorithms.route import Route
+from algorithms.search import bidirectional_search
+
+def bidirectional_a_star_route(state, start_point, end_point, heuristic, terrain, weather, blocked_routes, stats=None):
+    """
+    Finds a route from a start point to an end point with bidirectional A*, without changing the
+    state.
+
+    Args:
+        state (object): The current state of the simulation, including the graph, vehicles, and other relevant data.
+        start_point (object): The starting node containing the supplies to be delivered.
+        end_point (object): The destination node where supplies are needed.
+        heuristic (function): A heuristic function used to estimate the cost to the goal.
+        terrain (object): The type of terrain for the delivery route.
+        weather (WeatherCondition): Current weather conditions affecting route accessibility and velocity.
+        blocked_routes (set): A set of blocked routes that vehicles cannot traverse.
+        stats (SearchStats, optional): Counters to update while searching.
+
+    Returns:
+        Route: The route found, or None if there is no path.
+    """
+    graph = state.graph
+    start, goal = start_point.position, end_point.position
+    estimate = bind_heuristic(heuristic, state, end_point)
+
+    def potential(key):
+        position = graph.position_of(key)
+        return (estimate(position, goal) - estimate(start, position)) / 2
+
+    path, total_distance = bidirectional_search(
+        graph, graph.key_of(start), graph.key_of(goal), terrain, weather, blocked_routes, potential=potential,
+        stats=stats
+    )
+    if path is None:
+        return None
+    return Route.from_keys(graph, weather, path, total_distance)
+
+def bidirectional_a_star_supply_delivery(state, start_point, end_point, heuristic, terrain, weather, blocked_routes):
+    """
+    Implements bidirectional A* for supply delivery.
+
+    Like bidirectional UCS, one search runs from the start point and another one backwards from the
+    end point, but both are guided by the heuristic. To keep the two searches consistent with each
+    other, they share the average potential (h(node, end) - h(start, node)) / 2 instead of using the
+    heuristic directly. The path found is the shortest one as long as the heuristic is consistent,
+    as the Manhattan heuristic is.
+
+    Args:
+        state (object): The current state of the simulation, including the graph, vehicles, and other relevant data.
+        start_point (object): The starting node containing the supplies to be delivered.
+        end_point (object): The destination node where supplies are needed.
+        heuristic (function): A heuristic function used to estimate the cost between two positions.
+        terrain (object): The type of terrain for the delivery route.
+        weather (WeatherCondition): Current weather conditions affecting route accessibility and velocity.
+        blocked_routes (set): A set of blocked routes that vehicles cannot traverse.
+
+    Returns:
+        tuple: A tuple containing the path as a list of positions, total distance covered, total time taken,
+               and a dictionary mapping vehicle IDs to the supplies they delivered.
+               If no path is found, returns (None, 0, 0, "No path found.").
+    """
+    route = bidirectional_a_star_route(state, start_point, end_point, heuristic, terrain, weather, blocked_routes)
+    return dispatch(state, start_point, end_point, route, terrain)
@@ -0,0 +1,212 @@
+from bisect import bisect_right
+
+import numpy as np
+
+from algorithms.informed import heuristics
+from algorithms.informed.landmarks import get_landmarks
+from supply import SupplyType, get_weight_volume_per_supply
+from vehicle import VehicleStatus
+
+BLOCKED_EDGE_PENALTY = 10
+SUPPLY_DEFICIT_PENALTY = 5
+
+class HeuristicContext:
+    """
+    The heuristics of algorithms/informed/heuristics.py, with everything that does not depend on
+    the node being evaluated computed once per query.
+
+    The heuristics in heuristics.py look at the vehicles, the supplies of the start point and the
+    supplies needed at the end point every time they are called, although none of them changes
+    while a search runs. This class reads them once, so evaluating a node only takes its Manhattan
+    distance to the goal and a few float operations. The results are the ones the functions in
+    heuristics.py return, except where those divide by zero. When the end point needs no weight or
+    no volume, delivery_success_probability_heuristic (and final_combined_heuristic with it) raises
+    ZeroDivisionError once an idle vehicle has the fuel to cover the distance; here the supplies
+    are taken to fit in every vehicle instead.
+
+    Attributes:
+        state (object): The current state of the simulation.
+        end_point (object): The end node representing the delivery destination.
+        max_idle_velocity (float): The highest average velocity of the idle vehicles (0 if none).
+        supply_penalty (float): The penalty dynamic_supply_priority_heuristic adds for supply deficits.
+    """
+    def __init__(self, state, end_point):
+        """
+        Precomputes the terms of the heuristics that only depend on the state and the end point.
+
+        Args:
+            state (object): The current state of the simulation.
+            end_point (object): The end node representing the delivery destination.
+        """
+        self.state = state
+        self.end_point = end_point
+        idle_vehicles = [v for v in state.vehicles if v.vehicle_status == VehicleStatus.IDLE]
+        self.max_idle_velocity = max((v.type.average_velocity for v in idle_vehicles), default=0)
+
+        supplies_needed = end_point.get_supplies_needed()
+        self.supply_penalty = 0
+        for supply_type, quantity in supplies_needed.items():
+            for supply in state.start_point.supplies:
+                if supply.type.name == supply_type and supply.quantity < quantity:
+                    self.supply_penalty += (quantity - supply.quantity) * SUPPLY_DEFICIT_PENALTY
+
+        # Success probability of each idle vehicle, sorted by decreasing fuel, so the vehicles that
+        # can cover a distance are always a prefix of the list
+        total_weight_needed = sum(
+            quantity * get_weight_volume_per_supply(SupplyType[supply_type])[0]
+            for supply_type, quantity in supplies_needed.items()
+        )
+        total_volume_needed = sum(
+            quantity * get_weight_volume_per_supply(SupplyType[supply_type])[1]
+            for supply_type, quantity in supplies_needed.items()
+        )
+        candidates = []
+        for vehicle in idle_vehicles:
+            weight_available = vehicle.type.weight_capacity - vehicle.current_weight
+            volume_available = vehicle.type.volume_capacity - vehicle.current_volume
+            # Nothing left to deliver fits in any vehicle
+            weight_factor = min(1, weight_available / total_weight_needed) if total_weight_needed else 1
+            volume_factor = min(1, volume_available / total_volume_needed) if total_volume_needed else 1
+            candidates.append((vehicle.current_fuel, weight_factor * volume_factor))
+        candidates.sort(key=lambda candidate: -candidate[0])
+
+        self._negated_fuels = [-fuel for fuel, _ in candidates]
+        self._best_probabilities = [0]
+        for _, probability in candidates:
+            self._best_probabilities.append(max(self._best_probabilities[-1], probability))
+        self._negated_fuels_array = np.array(self._negated_fuels, dtype=np.float64)
+        self._best_probabilities_array = np.array(self._best_probabilities, dtype=np.float64)
+
+        self._blocked_penalties = {}  # Position -> penalty for its closed edges
+        self._landmarks = None
+
+    def manhattan(self, p1, p2):
+        """
+        Same as manhattan_heuristic.
+        """
+        return abs(p1.x - p2.x) + abs(p1.y - p2.y)
+
+    def time_estimation(self, p1, p2):
+        """
+        Same as time_estimation_heuristic.
+        """
+        if not self.max_idle_velocity:
+            return float('inf')
+        return (abs(p1.x - p2.x) + abs(p1.y - p2.y)) / self.max_idle_velocity
+
+    def blocked_route(self, p1, p2):
+        """
+        Same as blocked_route_heuristic.
+        """
+        return abs(p1.x - p2.x) + abs(p1.y - p2.y) + self._blocked_penalty(p1)
+
+    def dynamic_supply_priority(self, p1, p2):
+        """
+        Same as dynamic_supply_priority_heuristic.
+        """
+        return abs(p1.x - p2.x) + abs(p1.y - p2.y) + self.supply_penalty
+
+    def delivery_success_probability(self, p1, p2):
+        """
+        Same as delivery_success_probability_heuristic.
+        """
+        distance = abs(p1.x - p2.x) + abs(p1.y - p2.y)
+        success_probability = self._best_probabilities[bisect_right(self._negated_fuels, -distance)]
+        return (1 - success_probability) * 100
+
+    def final_combined(self, p1, p2):
+        """
+        Same as final_combined_heuristic.
+        """
+        distance = abs(p1.x - p2.x) + abs(p1.y - p2.y)
+        time_cost = distance / self.max_idle_velocity if self.max_idle_velocity else float('inf')
+        block_cost = distance + self._blocked_penalty(p1)
+        supply_cost = distance + self.supply_penalty
+        success_probability = self._best_probabilities[bisect_right(self._negated_fuels, -distance)]
+        success_cost = (1 - success_probability) * 100
+        return distance + time_cost + block_cost + supply_cost + success_cost
+
+    def landmark(self, p1, p2):
+        """
+        Same as landmark_heuristic.
+        """
+        if self._landmarks is None:
+            self._landmarks = get_landmarks(self.state.graph)
+        return max(self._landmarks.lower_bound(p1, p2), abs(p1.x - p2.x) + abs(p1.y - p2.y))
+
+    def final_combined_batch(self, xs, ys, p2, closed_edges):
+        """
+        Evaluates final_combined for many nodes at once.
+
+        Args:
+            xs (numpy.ndarray): The x-coordinates of the nodes.
+            ys (numpy.ndarray): The y-coordinates of the nodes.
+            p2 (Position): The destination point.
+            closed_edges (numpy.ndarray): The number of closed edges of each node (see closed_edge_counts).
+
+        Returns:
+            numpy.ndarray: The heuristic value of each node.
+        """
+        distances = np.abs(np.asarray(xs) - p2.x) + np.abs(np.asarray(ys) - p2.y)
+        if self.max_idle_velocity:
+            time_costs = distances / self.max_idle_velocity
+        else:
+            time_costs = np.full(len(distances), np.inf)
+        block_costs = distances + np.asarray(closed_edges) * BLOCKED_EDGE_PENALTY
+        supply_costs = distances + self.supply_penalty
+        counts = np.searchsorted(self._negated_fuels_array, -distances, side='right')
+        success_costs = (1 - self._best_probabilities_array[counts]) * 100
+        return distances + time_costs + block_costs + supply_costs + success_costs
+
+    def _blocked_penalty(self, position):
+        penalty = self._blocked_penalties.get(position)
+        if penalty is None:
+            graph = self.state.graph
+            penalty = sum(BLOCKED_EDGE_PENALTY for _, is_open in graph.edges(graph.key_of(position)) if not is_open)
+            self._blocked_penalties[position] = penalty
+        return penalty
+
+def closed_edge_counts(graph):
+    """
+    Counts the closed edges of every node of a compact graph.
+
+    Args:
+        graph (CompactGraph): The graph.
+
+    Returns:
+        numpy.ndarray: The number of closed edges of each node, by index.
+    """
+    closed = 1 - np.unpackbits(graph.open_mask, bitorder='little')[:graph.edge_count]
+    owners = np.repeat(np.arange(len(graph)), np.diff(graph.offsets))
+    return np.bincount(owners, weights=closed, minlength=len(graph)).astype(np.int64)
+
+# Heuristic function -> method of HeuristicContext computing the same value
+_CONTEXT_METHODS = {
+    heuristics.manhattan_heuristic: "manhattan",
+    heuristics.time_estimation_heuristic: "time_estimation",
+    heuristics.blocked_route_heuristic: "blocked_route",
+    heuristics.dynamic_supply_priority_heuristic: "dynamic_supply_priority",
+    heuristics.delivery_success_probability_heuristic: "delivery_success_probability",
+    heuristics.final_combined_heuristic: "final_combined",
+    heuristics.landmark_heuristic: "landmark",
+}
+
+def bind_heuristic(heuristic, state, end_point):
+    """
+    Returns a function of two points computing a heuristic for one query.
+
+    The heuristics of heuristics.py are replaced by the equivalent method of a HeuristicContext
+    built for the query; any other function is simply called with the state and the end point.
+
+    Args:
+        heuristic (function): A heuristic with the (p1, p2, state, end_point) signature.
+        state (object): The current state of the simulation.
+        end_point (object): The end node representing the delivery destination.
+
+    Returns:
+        function: A function receiving two points and returning the heuristic value.
+    """
+    method = _CONTEXT_METHODS.get(heuristic)
+    if method is None:
+        return lambda p1, p2: heuristic(p1, p2, state, end_point)
+    return getattr(HeuristicContext(state, end_point), method)
@@ -1,3 +1,4 @@
+from algorithms.informed.landmarks import get_landmarks
 from algorithms.utils import manhattan_distance
 from supply import SupplyType, get_weight_volume_per_supply
 from vehicle import VehicleStatus
@@ -18,6 +19,26 @@ def manhattan_heuristic(p1, p2, state, end_point):
     """
     return abs(p1.x - p2.x) + abs(p1.y - p2.y)
 
+# Heuristic based on precomputed distances to landmarks (ALT)
+def landmark_heuristic(p1, p2, state, end_point):
+    """
+    Estimates the cost between two points using the triangle inequality over a set of landmarks.
+
+    The landmarks of the graph and their distances to every node are computed the first time the
+    heuristic is used on it. The estimate never exceeds the real cost, so A* still finds the
+    shortest path, and it is never below the Manhattan distance.
+
+    Args:
+        p1 (Point): The starting point.
+        p2 (Point): The destination point.
+        state (object): The current state of the simulation, including the graph.
+        end_point (object): The end node representing the delivery destination.
+
+    Returns:
+        float: The largest of the landmark bounds and the Manhattan distance between the two points.
+    """
+    return max(get_landmarks(state.graph).lower_bound(p1, p2), manhattan_distance(p1, p2))
+
 # Heuristic to estimate the minimum time to traverse between points
 def time_estimation_heuristic(p1, p2, state, end_point):
     """
@@ -55,11 +76,9 @@ def blocked_route_heuristic(p1, p2, state, end_point):
         float: The heuristic value including penalties for blocked routes.
     """
     penalty = 0
-    current_node = state.graph.nodes.get(p1)
-    if current_node:
-        for _, is_open in current_node.neighbours:
-            if not is_open:
-                penalty += 10  # Arbitrary penalty value for blocked routes
+    for _, is_open in state.graph.edges(state.graph.key_of(p1)):
+        if not is_open:
+            penalty += 10  # Arbitrary penalty value for blocked routes
     return manhattan_distance(p1, p2) + penalty
 
 # Heuristic to prioritize addressing supply deficits dynamically
@@ -0,0 +1,56 @@
+from algorithms.delivery import dispatch
+from algorithms.informed.heuristic_context import bind_heuristic
+from algorithms.route import Route
+from algorithms.search import iterative_deepening_search
+
+def ida_star_route(state, start_point, end_point, heuristic, terrain, weather, blocked_routes, stats=None):
+    """
+    Finds a route from a start point to an end point with Iterative Deepening A* (IDA*), without
+    changing the state.
+
+    IDA* finds the same routes as A* with an admissible heuristic, but searches depth-first within a
+    growing bound on distance plus heuristic, so it never holds a frontier in memory.
+
+    Args:
+        state (object): The current state of the simulation, including the graph, vehicles, and other relevant data.
+        start_point (object): The starting node containing the supplies to be delivered.
+        end_point (object): The destination node where supplies are needed.
+        heuristic (function): A heuristic function used to estimate the cost to the goal.
+        terrain (object): The type of terrain for the delivery route.
+        weather (WeatherCondition): Current weather conditions affecting route accessibility and velocity.
+        blocked_routes (set): A set of blocked routes that vehicles cannot traverse.
+        stats (SearchStats, optional): Counters to update while searching.
+
+    Returns:
+        Route: The route found, or None if there is no path.
+    """
+    graph = state.graph
+    estimate = bind_heuristic(heuristic, state, end_point)
+    path, total_distance = iterative_deepening_search(
+        graph, graph.key_of(start_point.position), graph.key_of(end_point.position), terrain, weather, blocked_routes,
+        estimate=lambda key: estimate(graph.position_of(key), end_point.position), stats=stats
+    )
+    if path is None:
+        return None
+    return Route.from_keys(graph, weather, path, total_distance)
+
+def ida_star_supply_delivery(state, start_point, end_point, heuristic, terrain, weather, blocked_routes):
+    """
+    Implements the Iterative Deepening A* (IDA*) algorithm for supply delivery.
+
+    Args:
+        state (object): The current state of the simulation, including the graph, vehicles, and other relevant data.
+        start_point (object): The starting node containing the supplies to be delivered.
+        end_point (object): The destination node where supplies are needed.
+        heuristic (function): A heuristic function used to estimate the cost to the goal.
+        terrain (object): The type of terrain for the delivery route.
+        weather (WeatherCondition): Current weather conditions affecting route accessibility and velocity.
+        blocked_routes (set): A set of blocked routes that vehicles cannot traverse.
+
+    Returns:
+        tuple: A tuple containing the path as a list of positions, total distance covered, total time taken,
+               and a dictionary mapping vehicle IDs to the supplies they delivered.
+               If no path is found, returns (None, 0, 0, "No path found").
+    """
+    route = ida_star_route(state, start_point, end_point, heuristic, terrain, weather, blocked_routes)
+    return dispatch(state, start_point, end_point, route, terrain)
@@ -0,0 +1,193 @@
+import heapq
+import random
+from collections import OrderedDict
+
+import numpy as np
+
+from graph.compact_graph import CompactGraph
+
+LANDMARK_COUNT = 8
+
+# Number of graphs whose landmarks are kept
+LANDMARK_GRAPHS = 2
+
+# Graph -> its Landmarks, least recently used first, so they are only selected once per graph. The
+# Landmarks of a graph may hold the graph itself, so the landmarks of a graph that is no longer
+# used are dropped as other graphs are used, or by clear_landmarks
+_landmarks = OrderedDict()
+
+class Landmarks:
+    """
+    Landmarks for the ALT (A*, Landmarks, Triangle inequality) heuristic.
+
+    A few nodes, spread around the edges of the graph, are chosen as landmarks, and the distance
+    from each one to every node is computed in advance. By the triangle inequality, the distance
+    between two nodes a and b is at least |d(L, b) - d(L, a)| for every landmark L, which is usually
+    much closer to the real distance than the Manhattan distance between them.
+
+    The distances are computed on the base metric (every open edge costs its Manhattan length, as
+    when every node is SUNNY). Bad weather and blocked routes only make routes longer, so the bound
+    stays admissible and consistent under any conditions.
+
+    Attributes:
+        graph (CompactGraph): The graph the landmarks belong to.
+        landmarks (list): The indices of the landmark nodes.
+        distances (numpy.ndarray): float64 array of shape (nodes, landmarks) with the distance from
+                                   each landmark to each node (inf if it cannot be reached).
+    """
+    def __init__(self, graph, landmarks, distances):
+        """
+        Initializes the landmarks of a graph.
+
+        Args:
+            graph (CompactGraph): The graph the landmarks belong to.
+            landmarks (list): The indices of the landmark nodes.
+            distances (numpy.ndarray): The distances from each landmark to each node.
+        """
+        self.graph = graph
+        self.landmarks = list(landmarks)
+        self.distances = np.ascontiguousarray(distances, dtype=np.float64)
+        self._index = {graph.position_of(key): key for key in range(len(graph))}
+        # The rows as lists of floats, since comparing a few floats in Python is much faster than
+        # calling NumPy on arrays this small
+        self._rows = self.distances.tolist()
+
+    @classmethod
+    def select(cls, graph, count=LANDMARK_COUNT, seed=0):
+        """
+        Chooses the landmarks of a graph by farthest-point selection.
+
+        Starting from the node farthest from a random one, each new landmark is the node farthest
+        from all the landmarks chosen so far, which places them around the borders of the graph
+        (and in every part of it that is not connected to the rest).
+
+        Args:
+            graph (Graph or CompactGraph): The graph.
+            count (int, optional): The number of landmarks. Defaults to LANDMARK_COUNT.
+            seed (int, optional): The seed used to choose the first node. Defaults to 0.
+
+        Returns:
+            Landmarks: The landmarks of the graph.
+        """
+        if not isinstance(graph, CompactGraph):
+            graph = CompactGraph.from_graph(graph)
+        count = min(count, len(graph))
+        if count == 0:
+            return cls(graph, [], np.zeros((len(graph), 0)))
+
+        adjacency = _base_adjacency(graph)
+        reference = base_distances(adjacency, random.Random(seed).randrange(len(graph)))
+        nearest = np.where(np.isinf(reference), -1, reference)
+
+        landmarks, columns = [], []
+        for _ in range(count):
+            landmark = int(np.argmax(nearest))
+            if landmark in landmarks:
+                break
+            distances = base_distances(adjacency, landmark)
+            landmarks.append(landmark)
+            columns.append(distances)
+            nearest = np.minimum(nearest, distances) if len(landmarks) > 1 else distances.copy()
+
+        return cls(graph, landmarks, np.column_stack(columns))
+
+    def estimate(self, a, b):
+        """
+        Returns a lower bound of the distance between two nodes.
+
+        Args:
+            a (int): The index of one of the nodes.
+            b (int): The index of the other node.
+
+        Returns:
+            float: The largest landmark bound, or inf if the nodes are not connected.
+        """
+        bound = 0.0
+        for distance_a, distance_b in zip(self._rows[a], self._rows[b]):
+            # Landmarks that reach neither node give inf - inf = NaN, which fails both comparisons
+            difference = distance_a - distance_b
+            if difference > bound:
+                bound = difference
+            elif -difference > bound:
+                bound = -difference
+        return bound
+
+    def lower_bound(self, p1, p2):
+        """
+        Returns a lower bound of the distance between the nodes at two positions.
+
+        Args:
+            p1 (Position): The position of one of the nodes.
+            p2 (Position): The position of the other node.
+
+        Returns:
+            float: The largest landmark bound, or 0 if either position is not a node of the graph.
+        """
+        a, b = self._index.get(p1), self._index.get(p2)
+        if a is None or b is None:
+            return 0.0
+        return self.estimate(a, b)
+
+def _base_adjacency(graph):
+    """
+    Returns the open edges of a compact graph, as lists of (neighbour, Manhattan length) per node.
+    """
+    xs, ys = graph.xs.tolist(), graph.ys.tolist()
+    adjacency = []
+    for key in range(len(graph)):
+        x, y = xs[key], ys[key]
+        adjacency.append([(neighbour, abs(x - xs[neighbour]) + abs(y - ys[neighbour]))
+                          for neighbour, open in graph.edges(key) if open])
+    return adjacency
+
+def base_distances(adjacency, source):
+    """
+    Computes the base distance from a node to every other node, with Dijkstra's algorithm.
+
+    Args:
+        adjacency (list): The open edges of each node, as (neighbour, length) pairs.
+        source (int): The index of the source node.
+
+    Returns:
+        numpy.ndarray: The distance to each node, inf for the ones that cannot be reached.
+    """
+    distances = [float('inf')] * len(adjacency)
+    distances[source] = 0
+    queue = [(0, source)]
+    while queue:
+        distance, node = heapq.heappop(queue)
+        if distance > distances[node]:
+            continue
+        for neighbour, length in adjacency[node]:
+            new_distance = distance + length
+            if new_distance < distances[neighbour]:
+                distances[neighbour] = new_distance
+                heapq.heappush(queue, (new_distance, neighbour))
+    return np.array(distances, dtype=np.float64)
+
+def get_landmarks(graph):
+    """
+    Returns the landmarks of a graph, selecting them the first time.
+
+    The landmarks of the last LANDMARK_GRAPHS graphs are kept; the least recently used ones are
+    dropped when there are more.
+
+    Args:
+        graph (Graph or CompactGraph): The graph.
+
+    Returns:
+        Landmarks: The landmarks of the graph.
+    """
+    landmarks = _landmarks.get(graph)
+    if landmarks is None:
+        landmarks = _landmarks[graph] = Landmarks.select(graph)
+        if len(_landmarks) > LANDMARK_GRAPHS:
+            _landmarks.popitem(last=False)
+    _landmarks.move_to_end(graph)
+    return landmarks
+
+def clear_landmarks():
+    """
+    Drops the landmarks of every graph, and with them the graphs, as when the dataset is loaded again.
+    """
+    _landmarks.clear()
@@ -0,0 +1,339 @@
+import heapq
+from collections import OrderedDict
+from itertools import count
+
+from algorithms.delivery import dispatch
+from algorithms.informed.heuristic_context import bind_heuristic
+from algorithms.route import Route
+from graph.blocked_routes import BlockedRoutes
+from graph.position import Position
+
+PLANNER_LIMIT = 16
+
+INFINITY = float('inf')
+
+# (graph, start, goal, terrain, heuristic) -> LifelongPlanner, least recently used first. A planner
+# holds its graph, so the planners of a graph that is no longer used are dropped as the cache fills
+# up, or by clear_planners
+_planners = OrderedDict()
+
+class LifelongPlanner:
+    """
+    Lifelong Planning A* (LPA*) between two nodes of a graph.
+
+    The first search is an A* search that keeps, for every node it reaches, its distance from the
+    start (g) and a one-step lookahead of it computed from its predecessors (rhs). When the weather
+    of some nodes or the blocked routes change, only the nodes whose lookahead changed are put back
+    in the queue, and the search repairs the distances from there, instead of searching the whole
+    graph again. After a single node changes, only the nodes whose distance from the start actually
+    depends on it are visited again.
+
+    The heuristic is bound again for every search or repair, since what it depends on (the idle
+    vehicles, the supplies, the closed edges) may have changed since the last one, and the nodes
+    in the queue are keyed again with it. It must stay consistent for the distances found to be the
+    shortest ones, as the Manhattan and landmark heuristics are.
+
+    If the start or the goal is not a node of the graph, the planner never finds a path.
+
+    Attributes:
+        graph (Graph or CompactGraph): The graph searched.
+        start (object): The key of the start node.
+        goal (object): The key of the goal node.
+        terrain (int): The type of terrain being traversed.
+        expanded (int): The number of nodes expanded by the last search or repair.
+        peak_queue (int): The largest number of entries the queue held during the last search or repair.
+    """
+    def __init__(self, graph, start, goal, terrain, estimate):
+        """
+        Initializes a planner without searching yet.
+
+        Args:
+            graph (Graph or CompactGraph): The graph to search.
+            start (object): The key of the start node, or None if there is no node there.
+            goal (object): The key of the goal node, or None if there is no node there.
+            terrain (int): The type of terrain being traversed.
+            estimate (function): A function receiving two positions and estimating the distance
+                                 between them.
+        """
+        self.graph = graph
+        self.start = start
+        self.goal = goal
+        self.terrain = terrain
+        self.expanded = 0
+        self.peak_queue = 0
+        self._goal_position = graph.position_of(goal) if goal is not None else None
+        self._estimate = estimate
+        self._h = {}
+        self._g = {}
+        self._rhs = {start: 0}
+        self._queue = []  # (key, counter, node)
+        self._queued = {}  # Node -> key of its current entry in the queue
+        self._counter = count()
+        if start is not None and goal is not None:
+            self._push(start)
+
+        # Conditions the distances were computed for, so the next call can tell what changed
+        self._weather = None
+        self._weather_version = None
+        self._codes = None
+        self._blocked_routes = None
+        self._blocked_version = None
+        self._blocked = set()
+
+    def plan(self, weather, blocked_routes, estimate=None):
+        """
+        Finds the shortest path from the start to the goal under the given conditions, repairing the
+        previous search if the conditions changed since the last call.
+
+        Args:
+            weather (Weather): The current weather conditions.
+            blocked_routes (BlockedRoutes or set): The routes that cannot be used.
+            estimate (function, optional): The heuristic bound for the current state, replacing the
+                                           one used so far. Defaults to None (keep it).
+
+        Returns:
+            tuple: The keys of the nodes of the path (including start and goal) and its total
+                   distance, or (None, 0) if the goal cannot be reached.
+        """
+        self.expanded = 0
+        self.peak_queue = 0
+        if self.start is None or self.goal is None:
+            return None, 0
+
+        blocked_routes = BlockedRoutes.coerce(blocked_routes)
+        if estimate is not None and estimate is not self._estimate:
+            self._rebind(estimate)
+        if self._weather is not None:
+            for key in self._changed_nodes(weather, blocked_routes):
+                self._update(key, weather, blocked_routes)
+        self._remember(weather, blocked_routes)
+
+        self._compute(weather, blocked_routes)
+        if self._g.get(self.goal, INFINITY) == INFINITY:
+            return None, 0
+        return self._path(weather, blocked_routes), self._g[self.goal]
+
+    def _changed_nodes(self, weather, blocked_routes):
+        """
+        Returns the nodes whose lookahead may have changed since the last call: the nodes whose
+        weather changed, the ends of the routes blocked or unblocked, and their neighbours.
+        """
+        changed_ids = set()
+        if weather is not self._weather or weather.version != self._weather_version:
+            changed_ids.update(int(node_id) for node_id in (weather.codes != self._codes).nonzero()[0])
+        if blocked_routes is not self._blocked_routes or blocked_routes.version != self._blocked_version:
+            for a, b in self._blocked.symmetric_difference(blocked_routes):
+                changed_ids.update((a, b))
+
+        graph = self.graph
+        keys = set()
+        for node_id in changed_ids:
+            key = graph.key_of(Position(float(weather.xs[node_id]), float(weather.ys[node_id])))
+            if key is not None:
+                keys.add(key)
+                keys.update(neighbour for neighbour, _ in graph.edges(key))
+        return keys
+
+    def _remember(self, weather, blocked_routes):
+        if weather is not self._weather or weather.version != self._weather_version:
+            self._codes = weather.codes.copy()
+        self._weather, self._weather_version = weather, weather.version
+        if blocked_routes is not self._blocked_routes or blocked_routes.version != self._blocked_version:
+            self._blocked = set(blocked_routes)
+        self._blocked_routes, self._blocked_version = blocked_routes, blocked_routes.version
+
+    def _rebind(self, estimate):
+        """
+        Replaces the heuristic, keying the queued nodes again with it.
+        """
+        self._estimate = estimate
+        self._h = {}
+        queued = list(self._queued)
+        self._queue, self._queued = [], {}
+        for node in queued:
+            self._push(node)
+
+    def _heuristic(self, key):
+        h = self._h.get(key)
+        if h is None:
+            h = self._h[key] = self._estimate(self.graph.position_of(key), self._goal_position)
+        return h
+
+    def _key(self, node):
+        best = min(self._g.get(node, INFINITY), self._rhs.get(node, INFINITY))
+        return best + self._heuristic(node), best
+
+    def _push(self, node):
+        key = self._key(node)
+        self._queued[node] = key
+        heapq.heappush(self._queue, (key, next(self._counter), node))
+
+    def _top(self):
+        """
+        Returns the key of the first valid entry of the queue, discarding the stale ones.
+        """
+        queue, queued = self._queue, self._queued
+        while queue:
+            key, _, node = queue[0]
+            if queued.get(node) == key:
+                return key
+            heapq.heappop(queue)
+        return (INFINITY, INFINITY)
+
+    def _update(self, node, weather, blocked_routes):
+        """
+        Recomputes the lookahead of a node from its predecessors and queues it if it is inconsistent.
+        """
+        if node != self.start:
+            g = self._g
+            rhs = INFINITY
+            for predecessor, cost in self.graph.predecessors(node, self.terrain, weather, blocked_routes,
+                                                             source=self.start):
+                distance = g.get(predecessor, INFINITY) + cost
+                if distance < rhs:
+                    rhs = distance
+            self._rhs[node] = rhs
+        self._requeue(node)
+
+    def _requeue(self, node):
+        """
+        Removes a node from the queue, and queues it again with its new key if it is inconsistent.
+        """
+        self._queued.pop(node, None)
+        if self._g.get(node, INFINITY) != self._rhs.get(node, INFINITY):
+            self._push(node)
+
+    def _compute(self, weather, blocked_routes):
+        """
+        Expands inconsistent nodes until the distance of the goal is known.
+        """
+        graph, start, goal, g, rhs = self.graph, self.start, self.goal, self._g, self._rhs
+        while self._top() < self._key(goal) or rhs.get(goal, INFINITY) != g.get(goal, INFINITY):
+            if not self._queue:
+                break
+            self.peak_queue = max(self.peak_queue, len(self._queue))
+            _, _, node = heapq.heappop(self._queue)
+            del self._queued[node]
+            self.expanded += 1
+
+            if g.get(node, INFINITY) > rhs.get(node, INFINITY):
+                # The distance of the node went down, which can only lower the lookahead of its
+                # successors, so there is no need to look at all their predecessors
+                distance = g[node] = rhs[node]
+                for successor, cost in graph.successors(node, self.terrain, weather, blocked_routes):
+                    if successor != start and distance + cost < rhs.get(successor, INFINITY):
+                        rhs[successor] = distance + cost
+                        self._requeue(successor)
+            else:
+                g[node] = INFINITY
+                self._update(node, weather, blocked_routes)
+                for successor, _ in graph.successors(node, self.terrain, weather, blocked_routes):
+                    self._update(successor, weather, blocked_routes)
+
+    def _path(self, weather, blocked_routes):
+        """
+        Follows the predecessors that give each node its distance, from the goal back to the start.
+        """
+        graph, g = self.graph, self._g
+        path = [self.goal]
+        node = self.goal
+        while node != self.start:
+            best, best_distance = None, INFINITY
+            for predecessor, cost in graph.predecessors(node, self.terrain, weather, blocked_routes,
+                                                        source=self.start):
+                distance = g.get(predecessor, INFINITY) + cost
+                if distance < best_distance:
+                    best, best_distance = predecessor, distance
+            node = best
+            path.append(node)
+        path.reverse()
+        return path
+
+def get_planner(state, start_point, end_point, heuristic, terrain):
+    """
+    Returns the planner of a query, creating it the first time.
+
+    Up to PLANNER_LIMIT planners are kept, over every graph; the least recently used one is dropped
+    when there are more.
+
+    Args:
+        state (object): The current state of the simulation.
+        start_point (object): The starting node.
+        end_point (object): The destination node.
+        heuristic (function): A heuristic with the (p1, p2, state, end_point) signature.
+        terrain (int): The type of terrain being traversed.
+
+    Returns:
+        LifelongPlanner: The planner.
+    """
+    graph = state.graph
+    key = (graph, start_point.position, end_point.position, terrain, heuristic)
+    planner = _planners.get(key)
+    if planner is None:
+        planner = _planners[key] = LifelongPlanner(
+            graph, graph.key_of(start_point.position), graph.key_of(end_point.position), terrain,
+            bind_heuristic(heuristic, state, end_point)
+        )
+        if len(_planners) > PLANNER_LIMIT:
+            _planners.popitem(last=False)
+    _planners.move_to_end(key)
+    return planner
+
+def clear_planners():
+    """
+    Drops every planner, and with them the graphs they were searching, as when the dataset is loaded
+    again.
+    """
+    _planners.clear()
+
+def lpa_star_route(state, start_point, end_point, heuristic, terrain, weather, blocked_routes, stats=None):
+    """
+    Finds the route from a start point to an end point with Lifelong Planning A*, without changing
+    the state, reusing the previous search between the same points if there was one.
+
+    Args:
+        state (object): The current state of the simulation, including the graph, vehicles, and other relevant data.
+        start_point (object): The starting node containing the supplies to be delivered.
+        end_point (object): The destination node where supplies are needed.
+        heuristic (function): A heuristic function used to estimate the cost to the goal.
+        terrain (object): The type of terrain for the delivery route.
+        weather (WeatherCondition): Current weather conditions affecting route accessibility and velocity.
+        blocked_routes (set): A set of blocked routes that vehicles cannot traverse.
+        stats (SearchStats, optional): Counters to update while searching.
+
+    Returns:
+        Route: The route found, or None if there is no path.
+    """
+    planner = get_planner(state, start_point, end_point, heuristic, terrain)
+    path, total_distance = planner.plan(weather, blocked_routes, bind_heuristic(heuristic, state, end_point))
+    if stats:
+        stats.expanded += planner.expanded
+        stats.peak_frontier = max(stats.peak_frontier, planner.peak_queue)
+    if path is None:
+        return None
+    return Route.from_keys(state.graph, weather, path, total_distance)
+
+def lpa_star_supply_delivery(state, start_point, end_point, heuristic, terrain, weather, blocked_routes):
+    """
+    Implements Lifelong Planning A* (LPA*) for supply delivery.
+
+    The search state of each pair of start and end points is kept between calls. When the weather
+    or the blocked routes change, for instance a node turning STORM, the next delivery between the
+    same points repairs the previous search instead of running A* from scratch.
+
+    Args:
+        state (object): The current state of the simulation, including the graph, vehicles, and other relevant data.
+        start_point (object): The starting node containing the supplies to be delivered.
+        end_point (object): The destination node where supplies are needed.
+        heuristic (function): A heuristic function used to estimate the cost to the goal.
+        terrain (object): The type of terrain for the delivery route.
+        weather (WeatherCondition): Current weather conditions affecting route accessibility and velocity.
+        blocked_routes (set): A set of blocked routes that vehicles cannot traverse.
+
+    Returns:
+        tuple: A tuple containing the path as a list of positions, total distance covered, total time taken,
+               and a dictionary mapping vehicle IDs to the supplies they delivered.
+               If no path is found, returns (None, 0, 0, "No path found.").
+    """
+    route = lpa_star_route(state, start_point, end_point, heuristic, terrain, weather, blocked_routes)
+    return dispatch(state, start_point, end_point, route, terrain)
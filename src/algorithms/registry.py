@@ -0,0 +1,122 @@
+from algorithms.informed import heuristics
+from algorithms.informed.a_star import a_star_route, a_star_supply_delivery
+from algorithms.informed.bidirectional_a_star import bidirectional_a_star_route, bidirectional_a_star_supply_delivery
+from algorithms.informed.greedy import greedy_route, greedy_supply_delivery
+from algorithms.informed.ida_star import ida_star_route, ida_star_supply_delivery
+from algorithms.informed.lpa_star import lpa_star_route, lpa_star_supply_delivery
+from algorithms.uninformed.bfs import bfs_route, bfs_supply_delivery
+from algorithms.uninformed.bidirectional_ucs import bidirectional_ucs_route, bidirectional_ucs_supply_delivery
+from algorithms.uninformed.ch_search import ch_route, ch_supply_delivery
+from algorithms.uninformed.dfs import dfs_route, dfs_supply_delivery
+from algorithms.uninformed.iterative_deepening import ids_route, ids_supply_delivery
+from algorithms.uninformed.uniform_cost import ucs_route, ucs_supply_delivery
+
+DEFAULT_HEURISTIC = "manhattan_heuristic"
+
+# Uninformed algorithms: (state, start_point, end_point, terrain, weather, blocked_routes)
+UNINFORMED_ALGORITHMS = {
+    "bfs": bfs_supply_delivery,
+    "dfs": dfs_supply_delivery,
+    "ids": ids_supply_delivery,
+    "ucs": ucs_supply_delivery,
+    "bi_ucs": bidirectional_ucs_supply_delivery,
+    "ch": ch_supply_delivery,
+}
+
+# Informed algorithms also receive a heuristic, after the end point
+INFORMED_ALGORITHMS = {
+    "a_star": a_star_supply_delivery,
+    "bi_a_star": bidirectional_a_star_supply_delivery,
+    "greedy": greedy_supply_delivery,
+    "ida_star": ida_star_supply_delivery,
+    "lpa_star": lpa_star_supply_delivery,
+}
+
+# Searches of the algorithms, which return a Route without changing the state
+UNINFORMED_ROUTES = {
+    "bfs": bfs_route,
+    "dfs": dfs_route,
+    "ids": ids_route,
+    "ucs": ucs_route,
+    "bi_ucs": bidirectional_ucs_route,
+    "ch": ch_route,
+}
+
+INFORMED_ROUTES = {
+    "a_star": a_star_route,
+    "bi_a_star": bidirectional_a_star_route,
+    "greedy": greedy_route,
+    "ida_star": ida_star_route,
+    "lpa_star": lpa_star_route,
+}
+
+HEURISTICS = (
+    "manhattan_heuristic",
+    "landmark_heuristic",
+    "time_estimation_heuristic",
+    "blocked_route_heuristic",
+    "dynamic_supply_priority_heuristic",
+    "delivery_success_probability_heuristic",
+    "final_combined_heuristic",
+)
+
+def get_algorithm(algorithm, heuristic=DEFAULT_HEURISTIC):
+    """
+    Returns the supply delivery function of an algorithm, with the heuristic already bound for the
+    informed ones.
+
+    Args:
+        algorithm (str): The name of the algorithm (e.g. "bfs" or "a_star").
+        heuristic (str, optional): The name of a function of heuristics.py. Defaults to DEFAULT_HEURISTIC.
+
+    Returns:
+        function: A function receiving the state, start point, end point, terrain, weather and
+                  blocked routes, and returning the path, distance, time and supplies delivered.
+
+    Raises:
+        ValueError: If the algorithm or the heuristic is unknown.
+    """
+    if algorithm in UNINFORMED_ALGORITHMS:
+        return UNINFORMED_ALGORITHMS[algorithm]
+    if algorithm not in INFORMED_ALGORITHMS:
+        raise ValueError(f"Unknown algorithm '{algorithm}'.")
+    if heuristic not in HEURISTICS:
+        raise ValueError(f"Unknown heuristic '{heuristic}'.")
+
+    function, heuristic_function = INFORMED_ALGORITHMS[algorithm], getattr(heuristics, heuristic)
+    return lambda state, start, end, terrain, weather, blocked_routes: function(
+        state, start, end, heuristic_function, terrain, weather, blocked_routes
+    )
+
+def find_route(state, start_point, end_point, algorithm, heuristic, terrain, weather, blocked_routes):
+    """
+    Runs the search of an algorithm without delivering anything, so the state is left untouched.
+
+    The route found is the one the supply delivery function of the algorithm would deliver along.
+
+    Args:
+        state (object): The current state of the simulation.
+        start_point (object): The starting node.
+        end_point (object): The destination node.
+        algorithm (str): The name of the algorithm.
+        heuristic (str): The name of the heuristic, used by the informed algorithms.
+        terrain (int): The type of terrain being traversed.
+        weather (Weather): The current weather conditions.
+        blocked_routes (BlockedRoutes or set): The routes that cannot be used.
+
+    Returns:
+        Route: The route found, or None if there is no path.
+
+    Raises:
+        ValueError: If the algorithm or the heuristic is unknown, or the algorithm is not supported.
+    """
+    if algorithm in UNINFORMED_ROUTES:
+        return UNINFORMED_ROUTES[algorithm](state, start_point, end_point, terrain, weather, blocked_routes)
+    if algorithm in INFORMED_ROUTES:
+        if heuristic not in HEURISTICS:
+            raise ValueError(f"Unknown heuristic '{heuristic}'.")
+        return INFORMED_ROUTES[algorithm](state, start_point, end_point, getattr(heuristics, heuristic),
+                                          terrain, weather, blocked_routes)
+    if algorithm in UNINFORMED_ALGORITHMS:
+        raise ValueError(f"The '{algorithm}' algorithm cannot run without delivering.")
+    raise ValueError(f"Unknown algorithm '{algorithm}'.")
@@ -0,0 +1,98 @@
+from typing import NamedTuple
+
+from algorithms.utils import manhattan_distance
+from weather import DISTANCE_FACTORS
+
+class Route(NamedTuple):
+    """
+    A path found by one of the search algorithms, independent of any vehicle or supply.
+
+    Finding a route never changes the state of the simulation, and a Route cannot be changed once
+    found, so the same route can be cached, computed in another process, compared with the routes
+    of other algorithms, or used to dispatch several vehicles (see algorithms/delivery.py).
+
+    The weather of every node is recorded when the route is found, so the distance and the travel
+    times of a route always agree, even if the weather changes before it is used.
+
+    Attributes:
+        node_ids (tuple): The IDs of the nodes of the route, from the start node to the goal node.
+        positions (tuple): The positions of the same nodes.
+        conditions (tuple): The WeatherCondition of each node when the route was found.
+        distance (float): The total distance of the route, with every weather factor applied.
+    """
+    node_ids: tuple
+    positions: tuple
+    conditions: tuple
+    distance: float
+
+    @classmethod
+    def from_keys(cls, graph, weather, keys, distance):
+        """
+        Builds a route from the node keys of a path returned by one of the searches of search.py.
+
+        Args:
+            graph (Graph or CompactGraph): The graph that was searched.
+            weather (Weather): The weather the graph was searched with.
+            keys (list): The keys of the nodes of the path, including the start and the goal.
+            distance (float): The total distance of the path.
+
+        Returns:
+            Route: The route.
+        """
+        node_ids = tuple(graph.node_id(key) for key in keys)
+        return cls(
+            node_ids,
+            tuple(graph.position_of(key) for key in keys),
+            tuple(weather.node_condition(node_id) for node_id in node_ids),
+            distance,
+        )
+
+    @property
+    def start(self):
+        """
+        The position of the first node of the route.
+        """
+        return self.positions[0]
+
+    @property
+    def goal(self):
+        """
+        The position of the last node of the route.
+        """
+        return self.positions[-1]
+
+    @property
+    def edge_lengths(self):
+        """
+        The Manhattan length of each edge of the route, before any weather factor.
+        """
+        return tuple(manhattan_distance(a, b) for a, b in zip(self.positions, self.positions[1:]))
+
+    @property
+    def weather_factors(self):
+        """
+        The factor applied to the length of each edge of the route, given by the weather of the node
+        the edge leads into.
+        """
+        return tuple(DISTANCE_FACTORS[condition.value] for condition in self.conditions[1:])
+
+    def travel_time(self, vehicle):
+        """
+        Computes how long a vehicle takes to drive along the route.
+
+        The velocity on each edge is adjusted to the weather of the node the edge leaves. As the
+        supply delivery functions have always done, the first edge, leaving the start point, is not
+        counted.
+
+        Args:
+            vehicle (Vehicle): The vehicle.
+
+        Returns:
+            float: The travel time, or inf if the vehicle cannot move in the weather of some node.
+        """
+        total_time = 0
+        for i in range(1, len(self.positions) - 1):
+            velocity = vehicle.type.adjust_velocity(self.conditions[i])
+            distance = manhattan_distance(self.positions[i], self.positions[i + 1])
+            total_time += distance / velocity if velocity > 0 else float('inf')
+        return total_time
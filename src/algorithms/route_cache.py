@@ -0,0 +1,197 @@
+import time
+from collections import OrderedDict
+
+from algorithms.registry import INFORMED_ROUTES, find_route
+from graph.blocked_routes import BlockedRoutes
+from weather import DISTANCE_FACTORS, WeatherCondition
+
+DEFAULT_MAX_SIZE = 256
+
+class RouteCache:
+    """
+    A bounded cache of the routes found by the search algorithms.
+
+    Entries are keyed by the algorithm, the heuristic (for the informed algorithms), the start and
+    end positions and the terrain, and hold the Route found (or None, if there was no path). The
+    least recently used entry is evicted when the cache is full, and entries can also expire after
+    a time to live.
+
+    The entries are only valid for the Weather and BlockedRoutes objects, and the versions of them,
+    they were found with. After a change, the cache can be told which nodes or routes changed, and
+    then only the entries whose routes go through them are dropped: a change that only makes routes
+    longer cannot make any other route shorter, nor connect nodes that were not connected. Changes
+    that can make routes shorter (better weather, unblocked routes), and changes the cache is not
+    told about (found when the versions moved by more than the change reported), drop every entry.
+    The algorithms that do not look for the shortest route (DFS, greedy) might find a different
+    route if they ran again after such a change, but the cached one is still valid.
+
+    Attributes:
+        max_size (int): The largest number of entries kept.
+        ttl (float): The number of seconds an entry is kept, or None to keep it until it is evicted.
+        hits (int): The number of lookups answered from the cache.
+        misses (int): The number of lookups that had to run a search.
+        evictions (int): The number of entries dropped because the cache was full or they expired.
+        invalidations (int): The number of entries dropped because of a change of the weather or
+                             the blocked routes.
+    """
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, ttl=None, clock=time.monotonic):
+        """
+        Initializes an empty cache.
+
+        Args:
+            max_size (int, optional): The largest number of entries kept. Defaults to DEFAULT_MAX_SIZE.
+            ttl (float, optional): The number of seconds an entry is kept. Defaults to None (forever).
+            clock (function, optional): Returns the current time in seconds. Defaults to time.monotonic.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()  # Key -> (route, expiry time)
+        # Weather, BlockedRoutes and their versions the entries are valid for
+        self._sources = (None, 0, None, 0)
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def key(algorithm, heuristic, start, goal, terrain):
+        """
+        Returns the key of a query.
+
+        Args:
+            algorithm (str): The name of the algorithm.
+            heuristic (str): The name of the heuristic, ignored for the uninformed algorithms.
+            start (Position): The position of the start point.
+            goal (Position): The position of the end point.
+            terrain (int): The type of terrain being traversed.
+
+        Returns:
+            tuple: The key.
+        """
+        return algorithm, heuristic if algorithm in INFORMED_ROUTES else None, start, goal, terrain
+
+    def find_route(self, state, start_point, end_point, algorithm, heuristic, terrain, weather, blocked_routes):
+        """
+        Returns the route of a query, from the cache if possible, otherwise with find_route.
+
+        The arguments are the ones of algorithms.registry.find_route. The blocked routes should be
+        a BlockedRoutes object, since a set of strings is converted into a new one on every call,
+        and so never finds anything in the cache.
+
+        Returns:
+            Route: The route found, or None if there is no path.
+
+        Raises:
+            ValueError: If the algorithm or the heuristic is unknown, or the algorithm is not supported.
+        """
+        blocked_routes = BlockedRoutes.coerce(blocked_routes)
+        key = self.key(algorithm, heuristic, start_point.position, end_point.position, terrain)
+        self._check_versions(weather, blocked_routes)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            route, expiry = entry
+            if expiry is None or expiry > self.clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return route
+            del self._entries[key]
+            self.evictions += 1
+
+        self.misses += 1
+        route = find_route(state, start_point, end_point, algorithm, heuristic, terrain, weather, blocked_routes)
+        self._entries[key] = (route, self.clock() + self.ttl if self.ttl is not None else None)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return route
+
+    def invalidate_nodes(self, node_ids, weather, blocked_routes, previous=None):
+        """
+        Drops the entries whose routes go through nodes whose weather just changed.
+
+        Must be called right after the change, before the cache is used again, otherwise the
+        cache cannot tell which changes it was told about, and drops every entry.
+
+        Args:
+            node_ids (list): The IDs of the nodes whose weather changed, each one set with its own
+                             call to Weather.set_node_condition or Weather.set_condition.
+            weather (Weather): The weather, after the change.
+            blocked_routes (BlockedRoutes): The blocked routes.
+            previous (list, optional): The WeatherCondition of each node before the change. If a
+                                       node got cheaper to go through, or it is not given, every
+                                       entry is dropped.
+        """
+        node_ids = list(node_ids)
+        cheaper = previous is None or any(_is_cheaper(old, weather.node_condition(node_id))
+                                          for node_id, old in zip(node_ids, previous))
+        if cheaper or not self._follows(weather, blocked_routes, len(node_ids), 0):
+            self.clear()
+        else:
+            changed = set(node_ids)
+            self._drop(lambda route: not changed.isdisjoint(route.node_ids))
+        self._sources = (weather, weather.version, blocked_routes, blocked_routes.version)
+
+    def invalidate_routes(self, routes, weather, blocked_routes, unblocked=False):
+        """
+        Drops the entries whose routes use routes that were just blocked.
+
+        Must be called right after the change, before the cache is used again, otherwise the
+        cache cannot tell which changes it was told about, and drops every entry.
+
+        Args:
+            routes (list): The routes that changed, as "node1,node2" strings or ID pairs, each one
+                           blocked with its own call to BlockedRoutes.add.
+            weather (Weather): The weather.
+            blocked_routes (BlockedRoutes): The blocked routes, after the change.
+            unblocked (bool, optional): Whether the routes were unblocked instead, in which case
+                                        every entry is dropped. Defaults to False.
+        """
+        routes = list(routes)
+        if unblocked or not self._follows(weather, blocked_routes, 0, len(routes)):
+            self.clear()
+        else:
+            changed = {BlockedRoutes.parse(route) for route in routes}
+            self._drop(lambda route: any((a, b) in changed or (b, a) in changed
+                                         for a, b in zip(route.node_ids, route.node_ids[1:])))
+        self._sources = (weather, weather.version, blocked_routes, blocked_routes.version)
+
+    def clear(self):
+        """
+        Drops every entry.
+        """
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+
+    def _follows(self, weather, blocked_routes, weather_changes, blocked_changes):
+        """
+        Checks whether the weather and the blocked routes are the ones of the entries, changed the
+        given number of times since.
+        """
+        last_weather, weather_version, last_blocked_routes, blocked_version = self._sources
+        return (weather is last_weather and weather.version == weather_version + weather_changes and
+                blocked_routes is last_blocked_routes and blocked_routes.version == blocked_version + blocked_changes)
+
+    def _check_versions(self, weather, blocked_routes):
+        if not self._follows(weather, blocked_routes, 0, 0):
+            # Changed without the cache being told what changed
+            self.clear()
+            self._sources = (weather, weather.version, blocked_routes, blocked_routes.version)
+
+    def _drop(self, touches):
+        for key in [key for key, (route, _) in self._entries.items() if route is not None and touches(route)]:
+            del self._entries[key]
+            self.invalidations += 1
+
+def _is_cheaper(old, new):
+    """
+    Checks whether going through a node can be cheaper under a new weather condition than under
+    the old one.
+    """
+    if old == WeatherCondition.STORM:
+        return new != WeatherCondition.STORM
+    return new != WeatherCondition.STORM and DISTANCE_FACTORS[new.value] < DISTANCE_FACTORS[old.value]
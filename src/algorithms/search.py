@@ -0,0 +1,439 @@
+import heapq
+from collections import deque
+
+from algorithms.frontier import Frontier
+from graph.blocked_routes import BlockedRoutes
+
+# Tolerance when comparing path costs with the bound of iterative_deepening_search, so a path whose
+# cost adds up to the bound in a different order is not cut off by rounding
+BOUND_EPSILON = 1e-12
+
+class SearchStats:
+    """
+    Counters collected while a search runs.
+
+    Attributes:
+        expanded (int): The number of nodes expanded (popped from the frontier and not yet visited).
+        generated (int): The number of entries pushed onto the frontier.
+        stale (int): The number of superseded frontier entries popped and discarded.
+        peak_frontier (int): The largest number of entries the frontier held when a node was expanded.
+    """
+    def __init__(self):
+        self.expanded = 0
+        self.generated = 0
+        self.stale = 0
+        self.peak_frontier = 0
+
+def reconstruct_path(parents, goal):
+    """
+    Rebuilds the path to a node by following the recorded predecessors back to the start.
+
+    Args:
+        parents (dict): A dictionary mapping each visited node to the node it was reached from
+                        (None for the start node).
+        goal (object): The key of the last node of the path.
+
+    Returns:
+        list: The keys of the nodes of the path, from the start node to the goal.
+    """
+    path = []
+    key = goal
+    while key is not None:
+        path.append(key)
+        key = parents[key]
+    path.reverse()
+    return path
+
+def breadth_first_search(graph, start, goal, terrain, weather, blocked_routes, stats=None):
+    """
+    Searches for a path from start to goal, expanding nodes in the order they are discovered.
+
+    Instead of carrying a copy of the path in every frontier entry, each entry only holds the node
+    it was reached from, which is recorded when the node is visited. The path is rebuilt once, when
+    the goal is reached.
+
+    Args:
+        graph (Graph or CompactGraph): The graph to search.
+        start (object): The key of the start node.
+        goal (object): The key of the goal node.
+        terrain (int): The type of terrain being traversed.
+        weather (Weather): The current weather conditions.
+        blocked_routes (BlockedRoutes or set): The routes that cannot be used, possibly as a set of
+                                               "node1,node2" strings.
+        stats (SearchStats, optional): Counters to update while searching.
+
+    Returns:
+        tuple: The keys of the nodes of the path (including start and goal) and its total distance,
+               or (None, 0) if no path is found.
+    """
+    blocked_routes = BlockedRoutes.coerce(blocked_routes)
+    parents = {}
+    queue = deque([(start, None, 0)])
+
+    while queue:
+        current, parent, total_distance = queue.popleft()
+
+        if current in parents:
+            continue
+
+        parents[current] = parent
+        if stats:
+            stats.expanded += 1
+            stats.peak_frontier = max(stats.peak_frontier, len(queue))
+
+        if current == goal:
+            return reconstruct_path(parents, goal), total_distance
+
+        for neighbor, distance in graph.successors(current, terrain, weather, blocked_routes):
+            if neighbor not in parents:
+                queue.append((neighbor, current, total_distance + distance))
+                if stats:
+                    stats.generated += 1
+
+    return None, 0
+
+def depth_first_search(graph, start, goal, terrain, weather, blocked_routes, stats=None):
+    """
+    Searches for a path from start to goal, always expanding the most recently discovered node.
+
+    Neighbours are pushed in reverse order, so they are expanded in the order the graph lists them.
+    Like breadth_first_search, only the predecessor of each node is stored.
+
+    Args:
+        graph (Graph or CompactGraph): The graph to search.
+        start (object): The key of the start node.
+        goal (object): The key of the goal node.
+        terrain (int): The type of terrain being traversed.
+        weather (Weather): The current weather conditions.
+        blocked_routes (BlockedRoutes or set): The routes that cannot be used, possibly as a set of
+                                               "node1,node2" strings.
+        stats (SearchStats, optional): Counters to update while searching.
+
+    Returns:
+        tuple: The keys of the nodes of the path (including start and goal) and its total distance,
+               or (None, 0) if no path is found.
+    """
+    blocked_routes = BlockedRoutes.coerce(blocked_routes)
+    parents = {}
+    stack = [(start, None, 0)]
+
+    while stack:
+        current, parent, total_distance = stack.pop()
+
+        if current in parents:
+            continue
+
+        parents[current] = parent
+        if stats:
+            stats.expanded += 1
+            stats.peak_frontier = max(stats.peak_frontier, len(stack))
+
+        if current == goal:
+            return reconstruct_path(parents, goal), total_distance
+
+        for neighbor, distance in reversed(list(graph.successors(current, terrain, weather, blocked_routes))):
+            if neighbor not in parents:
+                stack.append((neighbor, current, total_distance + distance))
+                if stats:
+                    stats.generated += 1
+
+    return None, 0
+
+def iterative_deepening_search(graph, start, goal, terrain, weather, blocked_routes, estimate=None, max_bound=None,
+                               stats=None):
+    """
+    Searches for a path from start to goal with a series of depth-first searches, each one
+    abandoning the paths whose cost goes over a bound that grows from one search to the next.
+
+    Without an estimate this is Iterative Deepening Search: the cost of a path is its number of
+    edges, and the first path found has the fewest edges. With an estimate of the distance left to
+    the goal it is IDA*: the cost of a path is its distance plus the estimate at its last node, and
+    with an admissible estimate the first path found is a shortest one. Either way, the next bound
+    is the smallest cost that went over the current one, and the search gives up once no path went
+    over it (every reachable node was searched) or the bound would exceed max_bound.
+
+    The depth-first searches run on an explicit stack of successor iterators rather than on
+    recursion, so the length of the path is not limited by the Python stack. A transposition table,
+    kept from one search to the next, records the smallest cost each node was reached with and the
+    search that reached it: a node reached again at a higher cost is not searched again, and
+    neither is one already searched at the same cost by the current search. Only the current path
+    and the table are kept in memory.
+
+    Args:
+        graph (Graph or CompactGraph): The graph to search.
+        start (object): The key of the start node.
+        goal (object): The key of the goal node.
+        terrain (int): The type of terrain being traversed.
+        weather (Weather): The current weather conditions.
+        blocked_routes (BlockedRoutes or set): The routes that cannot be used, possibly as a set of
+                                               "node1,node2" strings.
+        estimate (function, optional): A function receiving the key of a node and returning an
+                                       estimate of its distance to the goal. Defaults to None
+                                       (bound the number of edges instead of the distance).
+        max_bound (float, optional): The largest bound searched. Defaults to None (no limit).
+        stats (SearchStats, optional): Counters to update while searching.
+
+    Returns:
+        tuple: The keys of the nodes of the path (including start and goal) and its total distance,
+               or (None, 0) if no path is found.
+    """
+    if start is None or goal is None:
+        return None, 0
+    if start == goal:
+        return [start], 0
+
+    blocked_routes = BlockedRoutes.coerce(blocked_routes)
+    table = {}  # Key: (smallest cost, search that reached it at that cost)
+    bound = estimate(start) if estimate else 0
+    iteration = 0
+
+    while max_bound is None or bound <= max_bound + BOUND_EPSILON:
+        iteration += 1
+        next_bound = float('inf')
+        table[start] = (0, iteration)
+        path, distances, costs = [start], [0], [0]
+        stack = [iter(graph.successors(start, terrain, weather, blocked_routes))]
+        if stats:
+            stats.expanded += 1
+
+        while stack:
+            for neighbor, distance in stack[-1]:
+                cost = costs[-1] + (distance if estimate else 1)
+                total = cost + estimate(neighbor) if estimate else cost
+                if total > bound + BOUND_EPSILON:
+                    next_bound = min(next_bound, total)
+                    continue
+
+                seen = table.get(neighbor)
+                if seen is not None and (cost > seen[0] + BOUND_EPSILON or
+                                         (seen[1] == iteration and cost >= seen[0] - BOUND_EPSILON)):
+                    continue
+
+                table[neighbor] = (cost, iteration)
+                path.append(neighbor)
+                distances.append(distances[-1] + distance)
+                if neighbor == goal:
+                    return path, distances[-1]
+
+                costs.append(cost)
+                stack.append(iter(graph.successors(neighbor, terrain, weather, blocked_routes)))
+                if stats:
+                    stats.expanded += 1
+                    stats.generated += 1
+                    stats.peak_frontier = max(stats.peak_frontier, len(stack))
+                break
+            else:
+                stack.pop()
+                path.pop()
+                distances.pop()
+                costs.pop()
+
+        if next_bound == float('inf'):
+            break
+        bound = next_bound
+
+    return None, 0
+
+def best_first_search(graph, start, goal, terrain, weather, blocked_routes, priority, stats=None):
+    """
+    Searches for a path from start to goal, always expanding the frontier node with the lowest priority.
+
+    This is the common core of Uniform Cost Search (priority = distance so far), A* (distance so
+    far plus heuristic) and Greedy Best-First Search (heuristic only). Like breadth_first_search,
+    only the predecessor of each node is stored. A node is only pushed again when its priority
+    improves (see Frontier), and nodes with equal priorities are expanded in the order they were
+    discovered.
+
+    Args:
+        graph (Graph or CompactGraph): The graph to search.
+        start (object): The key of the start node.
+        goal (object): The key of the goal node.
+        terrain (int): The type of terrain being traversed.
+        weather (Weather): The current weather conditions.
+        blocked_routes (BlockedRoutes or set): The routes that cannot be used, possibly as a set of
+                                               "node1,node2" strings.
+        priority (function): A function receiving the key of a node and the distance travelled to
+                             reach it, and returning its priority in the frontier.
+        stats (SearchStats, optional): Counters to update while searching.
+
+    Returns:
+        tuple: The keys of the nodes of the path (including start and goal) and its total distance,
+               or (None, 0) if no path is found.
+    """
+    blocked_routes = BlockedRoutes.coerce(blocked_routes)
+    parents = {}
+    frontier = Frontier()
+    frontier.push(start, 0, (None, 0))  # Item: (parent, total_distance)
+
+    try:
+        for _, current, (parent, total_distance) in frontier.drain():
+            parents[current] = parent
+            if stats:
+                stats.expanded += 1
+                stats.peak_frontier = max(stats.peak_frontier, len(frontier))
+
+            if current == goal:
+                return reconstruct_path(parents, goal), total_distance
+
+            for neighbor, distance in graph.successors(current, terrain, weather, blocked_routes):
+                if neighbor not in parents:
+                    new_distance = total_distance + distance
+                    if frontier.push(neighbor, priority(neighbor, new_distance), (current, new_distance)) and stats:
+                        stats.generated += 1
+    finally:
+        if stats:
+            stats.stale += frontier.stale
+
+    return None, 0
+
+def shortest_path_tree(graph, start, terrain, weather, blocked_routes, targets=None, stats=None):
+    """
+    Computes the shortest paths from start to many nodes at once, with a single Dijkstra search.
+
+    The nodes are settled in the same order as best_first_search settles them with the distance as
+    priority (Uniform Cost Search), so the path to each node is the one UCS would find for it. The
+    search stops as soon as every target is settled, or when every reachable node is.
+
+    Args:
+        graph (Graph or CompactGraph): The graph to search.
+        start (object): The key of the start node.
+        terrain (int): The type of terrain being traversed.
+        weather (Weather): The current weather conditions.
+        blocked_routes (BlockedRoutes or set): The routes that cannot be used, possibly as a set of
+                                               "node1,node2" strings.
+        targets (iterable, optional): The keys of the nodes whose paths are needed. Defaults to None
+                                      (every node). Keys that are None or not of a node of the graph
+                                      are left out of both dictionaries, as unreachable.
+        stats (SearchStats, optional): Counters to update while searching.
+
+    Returns:
+        tuple: A dictionary mapping each settled node to its parent (None for start), and a
+               dictionary mapping each settled node to its distance from start.
+    """
+    blocked_routes = BlockedRoutes.coerce(blocked_routes)
+    remaining = None
+    if targets is not None:
+        # A target that is not a node is never settled, and would keep the search from stopping
+        remaining = {key for key in targets if key is not None and graph.node_id(key) is not None}
+    parents, distances = {}, {}
+    frontier = Frontier()
+    frontier.push(start, 0, None)  # Item: parent
+
+    try:
+        for total_distance, current, parent in frontier.drain():
+            parents[current] = parent
+            distances[current] = total_distance
+            if stats:
+                stats.expanded += 1
+                stats.peak_frontier = max(stats.peak_frontier, len(frontier))
+
+            if remaining is not None:
+                remaining.discard(current)
+                if not remaining:
+                    break
+
+            for neighbor, distance in graph.successors(current, terrain, weather, blocked_routes):
+                if neighbor not in parents:
+                    if frontier.push(neighbor, total_distance + distance, current) and stats:
+                        stats.generated += 1
+    finally:
+        if stats:
+            stats.stale += frontier.stale
+
+    return parents, distances
+
+def bidirectional_search(graph, start, goal, terrain, weather, blocked_routes, potential=None, stats=None):
+    """
+    Searches for the shortest path from start to goal with two Dijkstra searches, one running forward
+    from start and one running backward from goal, until they meet.
+
+    The backward search follows graph.predecessors, so it sees the same edge costs as the forward
+    search (weather-adjusted, and only through open, unblocked edges into accessible nodes). Each
+    step expands the side with the smaller frontier. The search stops once the smallest keys of both
+    frontiers add up to at least the length of the best path found so far, at which point no
+    shorter path can exist.
+
+    Given a potential function p, this becomes bidirectional A*: the forward search is ordered by
+    distance + p(node) and the backward search by distance - p(node). With p = (h_goal - h_start) / 2,
+    where h_goal and h_start are consistent estimates of the distance to the goal and from the
+    start, both searches see non-negative reduced costs and the result is still optimal.
+
+    Args:
+        graph (Graph or CompactGraph): The graph to search.
+        start (object): The key of the start node.
+        goal (object): The key of the goal node.
+        terrain (int): The type of terrain being traversed.
+        weather (Weather): The current weather conditions.
+        blocked_routes (BlockedRoutes or set): The routes that cannot be used, possibly as a set of
+                                               "node1,node2" strings.
+        potential (function, optional): A function receiving the key of a node and returning its
+                                        potential. Defaults to 0 (bidirectional Dijkstra).
+        stats (SearchStats, optional): Counters to update while searching.
+
+    Returns:
+        tuple: The keys of the nodes of the path (including start and goal) and its total distance,
+               or (None, 0) if no path is found.
+    """
+    if start is None or goal is None:
+        return None, 0
+    if start == goal:
+        return [start], 0
+
+    blocked_routes = BlockedRoutes.coerce(blocked_routes)
+    potential = potential or (lambda key: 0)
+    start_potential, goal_potential = potential(start), potential(goal)
+
+    # Forward keys are distance + p(node) - p(start) and backward keys distance - p(node) + p(goal),
+    # so both start at 0 and the stopping rule only needs the offset below
+    offset = goal_potential - start_potential
+    distances = ({start: 0}, {goal: 0})
+    parents = ({start: None}, {goal: None})
+    settled = (set(), set())
+    frontiers = ([(0, start)], [(0, goal)])
+    best, meeting = float('inf'), None
+
+    while frontiers[0] and frontiers[1]:
+        if frontiers[0][0][0] + frontiers[1][0][0] >= best + offset:
+            break
+
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        _, current = heapq.heappop(frontiers[side])
+        if current in settled[side]:
+            continue
+
+        settled[side].add(current)
+        if stats:
+            stats.expanded += 1
+            stats.peak_frontier = max(stats.peak_frontier, len(frontiers[0]) + len(frontiers[1]))
+
+        if side == 0:
+            neighbours = graph.successors(current, terrain, weather, blocked_routes)
+            sign, base = 1, -start_potential
+        else:
+            neighbours = graph.predecessors(current, terrain, weather, blocked_routes, source=start)
+            sign, base = -1, goal_potential
+
+        own_distances, other_distances = distances[side], distances[1 - side]
+        current_distance = own_distances[current]
+        for neighbor, distance in neighbours:
+            new_distance = current_distance + distance
+            if new_distance < own_distances.get(neighbor, float('inf')):
+                own_distances[neighbor] = new_distance
+                parents[side][neighbor] = current
+                heapq.heappush(frontiers[side], (new_distance + sign * potential(neighbor) + base, neighbor))
+                if stats:
+                    stats.generated += 1
+
+                if neighbor in other_distances and new_distance + other_distances[neighbor] < best:
+                    best = new_distance + other_distances[neighbor]
+                    meeting = neighbor
+
+    if meeting is None:
+        return None, 0
+
+    path = reconstruct_path(parents[0], meeting)
+    key = parents[1][meeting]
+    while key is not None:
+        path.append(key)
+        key = parents[1][key]
+    return path, best
@@ -2,12 +2,46 @@ import supply as sp
 import vehicle as vh
 from collections import defaultdict
 
-def split_supplies_per_vehicle(vehicles, supplies):
+DEFAULT_ALLOCATOR = "best_fit_decreasing"
+
+# Largest number of lots the exact allocator searches over, falling back to best-fit-decreasing
+EXACT_LOT_LIMIT = 8
+
+# Tolerance when comparing loads to capacities, since the weights of some supplies are not integers
+EPSILON = 1e-9
+
+def split_supplies_per_vehicle(vehicles, supplies, allocator=DEFAULT_ALLOCATOR):
+    """
+    Distributes supplies among vehicles based on each vehicle's weight and volume capacity, and
+    loads them: the weight and volume of each vehicle grow by what it was given.
+
+    Args:
+        vehicles (list): List of available vehicles.
+        supplies (list): List of supplies to be distributed.
+        allocator (str, optional): The name of the allocator in ALLOCATORS. Defaults to
+                                   DEFAULT_ALLOCATOR.
+
+    Returns:
+        list: A list of supplies assigned to each vehicle.
+
+    Raises:
+        ValueError: If the allocator is unknown.
     """
-    Distributes supplies among vehicles based on each vehicle's weight and volume capacity.
+    if allocator not in ALLOCATORS:
+        raise ValueError(f"Unknown allocator '{allocator}'.")
+    supplies_per_vehicle = ALLOCATORS[allocator](vehicles, supplies)
 
-    For each supply, the function checks if the vehicle can carry the supply's weight and volume.
-    If it can, the supply is assigned to that vehicle.
+    for vehicle, vehicle_supplies in zip(vehicles, supplies_per_vehicle):
+        for supply in vehicle_supplies:
+            supply_weight, supply_volume = sp.get_weight_volume_per_supply(supply.type)
+            vehicle.current_weight += supply_weight * supply.quantity
+            vehicle.current_volume += supply_volume * supply.quantity
+    return supplies_per_vehicle
+
+def first_fit(vehicles, supplies):
+    """
+    Gives each supply, whole, to the first vehicle that can carry it. A supply that does not fit
+    in any vehicle is left out.
 
     Args:
         vehicles (list): List of available vehicles.
@@ -17,23 +51,186 @@ def split_supplies_per_vehicle(vehicles, supplies):
         list: A list of supplies assigned to each vehicle.
     """
     supply_type_data = defaultdict(lambda: None)
+    capacities = _capacities(vehicles)
     supplies_per_vehicle = [[] for _ in range(len(vehicles))]
-    
+
     for supply in supplies:
         if supply.type not in supply_type_data:
             supply_type_data[supply.type] = sp.get_weight_volume_per_supply(supply.type)
-        
+
         supply_weight, supply_volume = supply_type_data[supply.type]
         total_supply_weight = supply_weight * supply.quantity
         total_supply_volume = supply_volume * supply.quantity
-        
-        for i, vehicle in enumerate(vehicles):
-            if (vehicle.current_weight + total_supply_weight <= vehicle.type.weight_capacity and
-                vehicle.current_volume + total_supply_volume <= vehicle.type.volume_capacity):
-                
-                vehicle.current_weight += total_supply_weight
-                vehicle.current_volume += total_supply_volume
+
+        for i, capacity in enumerate(capacities):
+            if total_supply_weight <= capacity[0] and total_supply_volume <= capacity[1]:
+                capacity[0] -= total_supply_weight
+                capacity[1] -= total_supply_volume
                 supplies_per_vehicle[i].append(supply)
-                break 
+                break
 
     return supplies_per_vehicle
+
+def best_fit_decreasing(vehicles, supplies):
+    """
+    Gives the supplies out from the heaviest to the lightest, each one, whole, to the vehicle it
+    leaves the least capacity in. A supply that does not fit whole in any vehicle is split, unit by
+    unit, over the vehicles with the most capacity left, so it is only left out (in part) when the
+    vehicles are full.
+
+    Args:
+        vehicles (list): List of available vehicles.
+        supplies (list): List of supplies to be distributed.
+
+    Returns:
+        list: A list of supplies assigned to each vehicle.
+    """
+    capacities = _capacities(vehicles)
+    supplies_per_vehicle = [[] for _ in range(len(vehicles))]
+
+    for supply, weight, volume in sorted(_lots(supplies), key=lambda lot: (-lot[1], -lot[2])):
+        best = None
+        for i, (weight_left, volume_left) in enumerate(capacities):
+            if weight <= weight_left + EPSILON and volume <= volume_left + EPSILON:
+                if best is None or [weight_left, volume_left] < capacities[best]:
+                    best = i
+        if best is not None:
+            capacities[best][0] -= weight
+            capacities[best][1] -= volume
+            supplies_per_vehicle[best].append(supply)
+        else:
+            _spread(supply, capacities, supplies_per_vehicle)
+
+    return supplies_per_vehicle
+
+def exact(vehicles, supplies):
+    """
+    Finds, with a branch and bound search, the assignment of whole supplies to vehicles that carries
+    the most weight, and among those the one using the fewest vehicles. The supplies left out are
+    then split over the capacity left, as best_fit_decreasing does.
+
+    With more than EXACT_LOT_LIMIT supplies the search could take too long, and best_fit_decreasing
+    is used instead.
+
+    Args:
+        vehicles (list): List of available vehicles.
+        supplies (list): List of supplies to be distributed.
+
+    Returns:
+        list: A list of supplies assigned to each vehicle.
+    """
+    lots = sorted(_lots(supplies), key=lambda lot: (-lot[1], -lot[2]))
+    if len(lots) > EXACT_LOT_LIMIT:
+        return best_fit_decreasing(vehicles, supplies)
+
+    capacities = _capacities(vehicles)
+    remaining_weight = [0] * (len(lots) + 1)
+    for i in range(len(lots) - 1, -1, -1):
+        remaining_weight[i] = remaining_weight[i + 1] + lots[i][1]
+
+    assignment = [None] * len(lots)
+    loads = [0] * len(vehicles)  # Number of lots given to each vehicle
+    best = [-1, len(vehicles) + 1, list(assignment)]  # Weight carried, vehicles used, assignment
+
+    def search(i, carried, used):
+        if carried + remaining_weight[i] < best[0] - EPSILON:
+            return
+        if carried + remaining_weight[i] <= best[0] + EPSILON and used >= best[1]:
+            return
+        if i == len(lots):
+            best[:] = [carried, used, list(assignment)]
+            return
+
+        _, weight, volume = lots[i]
+        tried_empty = set()
+        for v, capacity in enumerate(capacities):
+            if weight > capacity[0] + EPSILON or volume > capacity[1] + EPSILON:
+                continue
+            if not loads[v]:
+                # Empty vehicles with the same capacity are interchangeable
+                if tuple(capacity) in tried_empty:
+                    continue
+                tried_empty.add(tuple(capacity))
+            capacity[0] -= weight
+            capacity[1] -= volume
+            loads[v] += 1
+            assignment[i] = v
+            search(i + 1, carried + weight, used + (loads[v] == 1))
+            assignment[i] = None
+            loads[v] -= 1
+            capacity[0] += weight
+            capacity[1] += volume
+        search(i + 1, carried, used)
+
+    search(0, 0, 0)
+
+    capacities = _capacities(vehicles)
+    supplies_per_vehicle = [[] for _ in range(len(vehicles))]
+    left_out = []
+    for (supply, weight, volume), v in zip(lots, best[2]):
+        if v is None:
+            left_out.append(supply)
+        else:
+            capacities[v][0] -= weight
+            capacities[v][1] -= volume
+            supplies_per_vehicle[v].append(supply)
+    for supply in left_out:
+        _spread(supply, capacities, supplies_per_vehicle)
+    return supplies_per_vehicle
+
+def vehicle_utilisation(vehicles):
+    """
+    Returns how full each vehicle is, by weight and by volume.
+
+    Args:
+        vehicles (list): List of vehicles.
+
+    Returns:
+        dict: A dictionary mapping each vehicle ID to the fractions of its weight and volume
+              capacities in use.
+    """
+    return {vehicle.id: (vehicle.current_weight / vehicle.type.weight_capacity if vehicle.type.weight_capacity else 0,
+                         vehicle.current_volume / vehicle.type.volume_capacity if vehicle.type.volume_capacity else 0)
+            for vehicle in vehicles}
+
+ALLOCATORS = {
+    "first_fit": first_fit,
+    "best_fit_decreasing": best_fit_decreasing,
+    "exact": exact,
+}
+
+def _capacities(vehicles):
+    """
+    Returns the weight and volume each vehicle can still carry, as lists that can be updated.
+    """
+    return [[vehicle.type.weight_capacity - vehicle.current_weight,
+             vehicle.type.volume_capacity - vehicle.current_volume] for vehicle in vehicles]
+
+def _lots(supplies):
+    """
+    Returns each supply with a positive quantity along with its total weight and volume.
+    """
+    lots = []
+    for supply in supplies:
+        if supply.quantity > 0:
+            supply_weight, supply_volume = sp.get_weight_volume_per_supply(supply.type)
+            lots.append((supply, supply_weight * supply.quantity, supply_volume * supply.quantity))
+    return lots
+
+def _spread(supply, capacities, supplies_per_vehicle):
+    """
+    Splits a supply over the vehicles with the most capacity left, giving each one as many whole
+    units as it can carry, until the supply runs out or the vehicles are full.
+    """
+    supply_weight, supply_volume = sp.get_weight_volume_per_supply(supply.type)
+    quantity = supply.quantity
+    for i in sorted(range(len(capacities)), key=lambda i: capacities[i], reverse=True):
+        if quantity <= 0:
+            break
+        weight_left, volume_left = capacities[i]
+        units = int(min(quantity, weight_left / supply_weight + EPSILON, volume_left / supply_volume + EPSILON))
+        if units > 0:
+            capacities[i][0] -= supply_weight * units
+            capacities[i][1] -= supply_volume * units
+            supplies_per_vehicle[i].append(sp.Supply(units, supply.type))
+            quantity -= units
@@ -0,0 +1,55 @@
+from algorithms.delivery import dispatch
+from algorithms.route import Route
+from algorithms.search import bidirectional_search
+
+def bidirectional_ucs_route(state, start_point, end_point, terrain, weather, blocked_routes, stats=None):
+    """
+    Finds the route of minimum total distance from a start point to an end point, with bidirectional
+    Uniform Cost Search, without changing the state.
+
+    Args:
+        state (object): The current simulation state, including vehicles and graph information.
+        start_point (object): The starting node representing the origin of supplies.
+        end_point (object): The end node representing the delivery destination.
+        terrain (object): Terrain information to determine vehicle accessibility.
+        weather (object): Weather conditions impacting traversal.
+        blocked_routes (set): A set of blocked routes that vehicles cannot use.
+        stats (SearchStats, optional): Counters to update while searching.
+
+    Returns:
+        Route: The route found, or None if there is no path.
+    """
+    graph = state.graph
+    path, total_distance = bidirectional_search(
+        graph, graph.key_of(start_point.position), graph.key_of(end_point.position), terrain, weather, blocked_routes,
+        stats=stats
+    )
+    if path is None:
+        return None
+    return Route.from_keys(graph, weather, path, total_distance)
+
+def bidirectional_ucs_supply_delivery(state, start_point, end_point, terrain, weather, blocked_routes):
+    """
+    Implements bidirectional Uniform Cost Search for supply delivery.
+
+    Two uniform cost searches run at the same time, one from the start point and one backwards from
+    the end point, and stop as soon as no path through the nodes left in their frontiers could be
+    shorter than the best one connecting them. Each search only has to cover about half of the
+    distance, so on road networks they settle far fewer nodes than a single search, while still
+    finding the path of minimum total distance.
+
+    Args:
+        state (object): The current simulation state, including vehicles, graph, and terrain information.
+        start_point (object): The starting node (origin) containing the available supplies.
+        end_point (object): The end node (destination) with supplies needed for delivery.
+        terrain (object): Terrain information to determine vehicle accessibility.
+        weather (object): Weather conditions impacting vehicle movement and travel times.
+        blocked_routes (set): A set of blocked routes that vehicles cannot use.
+
+    Returns:
+        tuple: A tuple containing the path as a list of positions, total distance covered, total time taken,
+               and a dictionary mapping vehicle IDs to the supplies they delivered.
+               If no path is found, returns (None, 0, 0, "No path found.").
+    """
+    return dispatch(state, start_point, end_point,
+                    bidirectional_ucs_route(state, start_point, end_point, terrain, weather, blocked_routes), terrain)
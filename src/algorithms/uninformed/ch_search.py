@@ -0,0 +1,142 @@
+from collections import OrderedDict
+
+from algorithms.delivery import dispatch
+from algorithms.route import Route
+from algorithms.search import bidirectional_search
+from graph.blocked_routes import BlockedRoutes
+from graph.contraction_hierarchy import load_contraction_hierarchy
+
+# Number of graphs whose contraction hierarchy is kept
+HIERARCHY_GRAPHS = 2
+
+# Graph -> its ContractionHierarchy, least recently used first, so the hierarchy is only loaded (or
+# built) once per graph. A hierarchy holds its CompactGraph, which may be the graph itself, so the
+# hierarchies of graphs no longer used are dropped as other graphs are used, or by
+# clear_contraction_hierarchies
+_hierarchies = OrderedDict()
+
+def get_contraction_hierarchy(graph):
+    """
+    Returns the contraction hierarchy of a graph, loading or building it the first time.
+
+    The hierarchies of the last HIERARCHY_GRAPHS graphs are kept; the least recently used ones are
+    dropped when there are more.
+
+    Args:
+        graph (Graph or CompactGraph): The graph.
+
+    Returns:
+        ContractionHierarchy: The hierarchy of the graph.
+    """
+    hierarchy = _hierarchies.get(graph)
+    if hierarchy is None:
+        hierarchy = _hierarchies[graph] = load_contraction_hierarchy(graph)
+        if len(_hierarchies) > HIERARCHY_GRAPHS:
+            _hierarchies.popitem(last=False)
+    _hierarchies.move_to_end(graph)
+    return hierarchy
+
+def clear_contraction_hierarchies():
+    """
+    Drops the hierarchy of every graph, and with them the graphs, as when the dataset is loaded again.
+    The hierarchies stored on disk are kept.
+    """
+    _hierarchies.clear()
+
+def ch_shortest_path(graph, start, goal, terrain, weather, blocked_routes, hierarchy=None, stats=None):
+    """
+    Finds the path of minimum total distance between two positions with the contraction hierarchy
+    of the graph.
+
+    The hierarchy answers for a graph where every node is SUNNY and no route is blocked. If the
+    path it finds is affected by the current weather, terrain or blocked routes, the path is
+    searched again with bidirectional UCS on the graph itself, so the result is always the one
+    UCS would find.
+
+    Args:
+        graph (Graph or CompactGraph): The graph to search.
+        start (Position): The position of the start node.
+        goal (Position): The position of the goal node.
+        terrain (int): The type of terrain being traversed.
+        weather (Weather): The current weather conditions.
+        blocked_routes (BlockedRoutes or set): The routes that cannot be used.
+        hierarchy (ContractionHierarchy, optional): The hierarchy of the graph. Defaults to the one
+                                                    returned by get_contraction_hierarchy.
+        stats (SearchStats, optional): Counters to update while searching.
+
+    Returns:
+        tuple: The positions of the nodes of the path (including start and goal), its total
+               distance, and whether the hierarchy could be used, or (None, 0, used) if no path
+               is found.
+    """
+    hierarchy = hierarchy or get_contraction_hierarchy(graph)
+    blocked_routes = BlockedRoutes.coerce(blocked_routes)
+
+    path, _ = hierarchy.query(hierarchy.graph.key_of(start), hierarchy.graph.key_of(goal), stats)
+    if path is None:
+        # Not even connected when nothing is closed, so no conditions can connect them
+        return None, 0, True
+
+    if hierarchy.is_usable(path, terrain, weather, blocked_routes):
+        positions = [hierarchy.graph.position_of(key) for key in path]
+        # Summed edge by edge, in the same order as the searches do
+        total_distance = 0
+        for a, b in zip(positions, positions[1:]):
+            total_distance += abs(a.x - b.x) + abs(a.y - b.y)
+        return positions, total_distance, True
+
+    path, total_distance = bidirectional_search(
+        graph, graph.key_of(start), graph.key_of(goal), terrain, weather, blocked_routes, stats=stats
+    )
+    if path is None:
+        return None, 0, False
+    return [graph.position_of(key) for key in path], total_distance, False
+
+def ch_route(state, start_point, end_point, terrain, weather, blocked_routes, stats=None):
+    """
+    Finds the route of minimum total distance from a start point to an end point with the
+    contraction hierarchy of the graph (see ch_shortest_path), without changing the state.
+
+    Args:
+        state (object): The current simulation state, including vehicles and graph information.
+        start_point (object): The starting node representing the origin of supplies.
+        end_point (object): The end node representing the delivery destination.
+        terrain (object): Terrain information to determine vehicle accessibility.
+        weather (object): Weather conditions impacting traversal.
+        blocked_routes (set): A set of blocked routes that vehicles cannot use.
+        stats (SearchStats, optional): Counters to update while searching.
+
+    Returns:
+        Route: The route found, or None if there is no path.
+    """
+    graph = state.graph
+    path, total_distance, _ = ch_shortest_path(
+        graph, start_point.position, end_point.position, terrain, weather, blocked_routes, stats=stats
+    )
+    if path is None:
+        return None
+    return Route.from_keys(graph, weather, [graph.key_of(position) for position in path], total_distance)
+
+def ch_supply_delivery(state, start_point, end_point, terrain, weather, blocked_routes):
+    """
+    Implements supply delivery over the shortest path found with Contraction Hierarchies.
+
+    The hierarchy of the road network is built the first time it is needed and stored on disk,
+    after which most queries only visit a few hundred nodes. The path found is the same one UCS
+    would find (see ch_shortest_path).
+
+    Args:
+        state (object): The current simulation state, including vehicles, graph, and terrain information.
+        start_point (object): The starting node (origin) containing the available supplies.
+        end_point (object): The end node (destination) with supplies needed for delivery.
+        terrain (object): Terrain information to determine vehicle accessibility.
+        weather (object): Weather conditions impacting vehicle movement and travel times.
+        blocked_routes (set): A set of blocked routes that vehicles cannot use.
+
+    Returns:
+        tuple: A tuple containing the path as a list of positions, total distance covered, total time taken,
+               and a dictionary mapping vehicle IDs to the supplies they delivered.
+               If no path is found, returns (None, 0, 0, "No path found.").
+    """
+    return dispatch(state, start_point, end_point,
+                    ch_route(state, start_point, end_point, terrain, weather, blocked_routes), terrain)
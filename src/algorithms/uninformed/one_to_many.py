@@ -0,0 +1,104 @@
+from algorithms.delivery import dispatch
+from algorithms.route import Route
+from algorithms.search import reconstruct_path, shortest_path_tree
+
+class ShortestPathTree:
+    """
+    The shortest paths from one node to many others, found with a single Dijkstra search.
+
+    Routing to every end point with a separate search from the same start point repeats most of the
+    work, since all the searches expand the nodes around the start point. The tree is built once
+    and then each end point's route, distance and travel time are read from it.
+
+    Attributes:
+        graph (Graph or CompactGraph): The graph searched.
+        weather (Weather): The weather the graph was searched with.
+        start (object): The key of the start node.
+        parents (dict): The parent of each settled node in the tree (None for the start node).
+        distances (dict): The distance from the start node to each settled node.
+    """
+    def __init__(self, graph, weather, start, parents, distances):
+        """
+        Initializes a tree from the result of shortest_path_tree.
+
+        Args:
+            graph (Graph or CompactGraph): The graph searched.
+            weather (Weather): The weather the graph was searched with.
+            start (object): The key of the start node.
+            parents (dict): The parent of each settled node.
+            distances (dict): The distance to each settled node.
+        """
+        self.graph = graph
+        self.weather = weather
+        self.start = start
+        self.parents = parents
+        self.distances = distances
+
+    @classmethod
+    def build(cls, state, start_point, end_points, terrain, weather, blocked_routes, stats=None):
+        """
+        Searches the shortest paths from a start point to several end points.
+
+        Args:
+            state (object): The current simulation state, including vehicles and graph information.
+            start_point (object): The starting node representing the origin of supplies.
+            end_points (list): The end nodes to find paths to.
+            terrain (object): Terrain information to determine vehicle accessibility.
+            weather (object): Weather conditions impacting traversal.
+            blocked_routes (set): A set of blocked routes that vehicles cannot use.
+            stats (SearchStats, optional): Counters to update while searching.
+
+        Returns:
+            ShortestPathTree: The tree, covering every end point that can be reached.
+        """
+        graph = state.graph
+        start = graph.key_of(start_point.position)
+        targets = [graph.key_of(end_point.position) for end_point in end_points]
+        parents, distances = shortest_path_tree(graph, start, terrain, weather, blocked_routes,
+                                                targets=targets, stats=stats)
+        return cls(graph, weather, start, parents, distances)
+
+    def route(self, position):
+        """
+        Returns the route from the start node to the node at a position.
+
+        Args:
+            position (Position): The position of the node.
+
+        Returns:
+            Route: The route, or None if the node cannot be reached (or was not a target).
+        """
+        key = self.graph.key_of(position)
+        if key not in self.parents:
+            return None
+        return Route.from_keys(self.graph, self.weather, reconstruct_path(self.parents, key), self.distances[key])
+
+def serve_all_end_points(state, terrain, weather, blocked_routes, start_point=None):
+    """
+    Sends supplies from the start point to every end point, routing all of them with one search.
+
+    The end points are served by priority (highest first) and then by distance, nearest first,
+    since the supplies and vehicles run out as the deliveries go. Each delivery is the one
+    ucs_supply_delivery would have made at that moment.
+
+    Args:
+        state (object): The current simulation state, including vehicles and graph information.
+        terrain (object): Terrain information to determine vehicle accessibility.
+        weather (object): Weather conditions impacting traversal.
+        blocked_routes (set): A set of blocked routes that vehicles cannot use.
+        start_point (object, optional): The starting node. Defaults to the start point of the state.
+
+    Returns:
+        list: A (end point, delivery result) pair for each end point, in the order they were served,
+              where each delivery result is the tuple returned by the supply delivery functions.
+    """
+    start_point = start_point or state.start_point
+    tree = ShortestPathTree.build(state, start_point, state.end_points, terrain, weather, blocked_routes)
+    routes = {id(end_point): tree.route(end_point.position) for end_point in state.end_points}
+
+    def order(end_point):
+        route = routes[id(end_point)]
+        return -end_point.priority, route.distance if route is not None else float('inf')
+
+    return [(end_point, dispatch(state, start_point, end_point, routes[id(end_point)], terrain))
+            for end_point in sorted(state.end_points, key=order)]
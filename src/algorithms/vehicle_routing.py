@@ -0,0 +1,486 @@
+import time
+from typing import NamedTuple
+
+from algorithms.delivery import transfer_supplies
+from algorithms.distance_matrix import DistanceMatrix
+from graph.position import Position
+from supply import Supply, SupplyType, get_weight_volume_per_supply
+from vehicle import VehicleStatus
+
+DEFAULT_TIME_BUDGET = 1.0
+
+# Longest run of consecutive visits moved at once by the or-opt moves
+OR_OPT_LENGTH = 3
+
+# Smallest improvement accepted by the local search, so rounding errors cannot make it loop
+EPSILON = 1e-9
+
+class Visit(NamedTuple):
+    """
+    A stop of a tour, where some supplies are left at an end point.
+
+    An end point needing more than any vehicle can carry is split into several visits.
+
+    Attributes:
+        end_point (EndPoint): The end point.
+        index (int): The index of the end point in the distance matrix.
+        supplies (tuple): The supplies left, one Supply per type.
+        weight (float): The total weight of the supplies.
+        volume (float): The total volume of the supplies.
+    """
+    end_point: object
+    index: int
+    supplies: tuple
+    weight: float
+    volume: float
+
+class Tour(NamedTuple):
+    """
+    The stops of one vehicle, which leaves the start point loaded and stays at its last stop, as
+    the vehicles sent by the supply delivery functions do.
+
+    Attributes:
+        vehicle (Vehicle): The vehicle.
+        visits (tuple): The visits, in the order they are made.
+        node_ids (tuple): The IDs of the nodes driven through, from the start point to the last stop.
+        positions (tuple): The positions of the same nodes.
+        distance (float): The total distance driven.
+        time (float): The total travel time of the vehicle.
+    """
+    vehicle: object
+    visits: tuple
+    node_ids: tuple
+    positions: tuple
+    distance: float
+    time: float
+
+    @property
+    def weight(self):
+        """
+        The total weight the vehicle carries when it leaves.
+        """
+        return sum(visit.weight for visit in self.visits)
+
+    @property
+    def volume(self):
+        """
+        The total volume the vehicle carries when it leaves.
+        """
+        return sum(visit.volume for visit in self.visits)
+
+class RoutingPlan(NamedTuple):
+    """
+    The tours planned to serve the end points of a simulation.
+
+    Attributes:
+        tours (list): The Tour of each vehicle used.
+        unserved (list): The visits no vehicle could make, for lack of capacity, fuel or a path.
+        distance (float): The total distance driven by all the vehicles.
+        elapsed (float): The number of seconds spent planning, including the distance matrix.
+    """
+    tours: list
+    unserved: list
+    distance: float
+    elapsed: float
+
+class VehicleRoutingSolver:
+    """
+    Plans multi-stop tours for the idle vehicles at the start point, as a capacitated vehicle
+    routing problem with a heterogeneous fleet and open tours.
+
+    The supplies of the start point are shared among the end points by priority, highest first.
+    Each vehicle can carry what its weight and volume capacity have left, and cannot drive farther
+    than its fuel allows. The tours are built with the Clarke-Wright savings heuristic (joining the
+    tour ending at one end point with the tour starting at another, in decreasing order of the
+    distance saved), and vehicles are given to them by priority. The visits left over are inserted
+    where they cost least, in a tour or in a new tour of a vehicle still unused, and then the tours
+    are improved with 2-opt and or-opt moves (reversing a part of a tour, or moving up to
+    OR_OPT_LENGTH consecutive visits elsewhere in the same or in another tour) until no move
+    shortens them or the time budget runs out.
+
+    The distances between the points are read from a DistanceMatrix, so the whole plan needs one
+    search per point.
+    """
+    def __init__(self, state, matrix, terrain=0, time_budget=DEFAULT_TIME_BUDGET, clock=time.perf_counter):
+        """
+        Initializes the solver.
+
+        Args:
+            state (object): The current simulation state.
+            matrix (DistanceMatrix): The distances between the points of interest of the state.
+            terrain (int, optional): The type of terrain being traversed. Defaults to 0.
+            time_budget (float, optional): The number of seconds the local search may run for.
+                                           Defaults to DEFAULT_TIME_BUDGET.
+            clock (function, optional): Returns the current time in seconds. Defaults to
+                                        time.perf_counter.
+        """
+        self.state = state
+        self.matrix = matrix
+        self.terrain = terrain
+        self.time_budget = time_budget
+        self.clock = clock
+        self.depot = matrix.index(state.start_point.position)
+        self.vehicles = [vehicle for vehicle in state.vehicles
+                         if vehicle.position == state.start_point.position and
+                         vehicle.vehicle_status == VehicleStatus.IDLE and vehicle.type.can_access_terrain(terrain)]
+        self._distances = matrix.distances.tolist()
+        self._capacities = sorted(((vehicle.type.weight_capacity - vehicle.current_weight,
+                                    vehicle.type.volume_capacity - vehicle.current_volume)
+                                   for vehicle in self.vehicles), reverse=True)
+
+    def solve(self, weather):
+        """
+        Plans the tours.
+
+        Args:
+            weather (Weather): The weather the distance matrix was computed with.
+
+        Returns:
+            RoutingPlan: The plan. The elapsed time only covers the planning, not the matrix.
+        """
+        begin = self.clock()
+        visits, unserved = self._visits()
+        routes = self._savings(visits)
+        tours, left_over, free = self._assign(routes, visits)
+        unserved += self._insert([visits[i] for route in left_over for i in route], tours, free)
+        self._improve(tours, begin + self.time_budget)
+
+        tours = [self._tour(vehicle, route, weather) for vehicle, route in tours if route]
+        return RoutingPlan(tours, unserved, sum(tour.distance for tour in tours), self.clock() - begin)
+
+    def _visits(self):
+        """
+        Shares the supplies of the start point among the end points, by priority, and splits them
+        into visits that fit in the largest vehicle.
+        """
+        if not self.vehicles:
+            return [], [Visit(end_point, self.matrix.index(end_point.position), (), 0, 0)
+                        for end_point in self.state.end_points if end_point.get_supplies_needed()]
+
+        available = {supply_type: 0 for supply_type in SupplyType}
+        for supply in self.state.start_point.supplies:
+            available[supply.type] += supply.quantity
+        largest = max(self.vehicles, key=lambda vehicle: vehicle.type.weight_capacity - vehicle.current_weight)
+        capacity = (largest.type.weight_capacity - largest.current_weight,
+                    largest.type.volume_capacity - largest.current_volume)
+
+        visits, unserved = [], []
+        for end_point in sorted(self.state.end_points, key=lambda end_point: -end_point.priority):
+            index = self.matrix.index(end_point.position)
+            reachable = self._distances[self.depot][index] < float('inf')
+            quantities = []
+            for needed_type, needed_quantity in end_point.get_supplies_needed().items():
+                supply_type = SupplyType[needed_type]
+                quantity = min(needed_quantity, available[supply_type]) if reachable else needed_quantity
+                if quantity > 0:
+                    quantities.append((supply_type, quantity))
+                    if reachable:
+                        available[supply_type] -= quantity
+            if quantities:
+                split = _split(end_point, index, quantities, *capacity)
+                if reachable:
+                    visits += split
+                else:
+                    unserved += split
+        return visits, unserved
+
+    def _savings(self, visits):
+        """
+        Joins the visits into routes with the Clarke-Wright savings heuristic.
+        """
+        distances, depot = self._distances, self.depot
+        routes = {i: [i] for i in range(len(visits))}  # First visit -> route
+        route_of = list(range(len(visits)))  # Visit -> first visit of its route
+        lengths = {i: distances[depot][visits[i].index] for i in range(len(visits))}
+
+        savings = []
+        for a, first in enumerate(visits):
+            for b, second in enumerate(visits):
+                if a != b:
+                    saving = distances[depot][second.index] - distances[first.index][second.index]
+                    if saving > 0:
+                        savings.append((-saving, -max(first.end_point.priority, second.end_point.priority), a, b))
+        savings.sort()
+
+        for _, _, a, b in savings:
+            head, tail = route_of[a], b
+            if head == route_of[b] or routes[head][-1] != a or route_of[b] != b:
+                continue  # a must end one route and b must start another
+            route = routes[head] + routes[tail]
+            length = (lengths[head] + distances[visits[a].index][visits[b].index] + lengths[tail] -
+                      distances[depot][visits[b].index])
+            if not any(self._fits(vehicle, route, visits, length) for vehicle in self.vehicles):
+                continue
+            loads = [_load(visits, routes[key]) for key in routes if key not in (head, tail)]
+            if not self._fleet_fits(loads + [_load(visits, route)]):
+                continue
+            routes[head] = route
+            lengths[head] = length
+            del routes[tail], lengths[tail]
+            for i in route:
+                route_of[i] = head
+        return list(routes.values())
+
+    def _fleet_fits(self, loads):
+        """
+        Checks whether the heaviest routes can still be matched with the vehicles, the heaviest
+        route with the vehicle with the most capacity left, and so on, so joining routes never
+        leaves a route too heavy for every vehicle that would be left for it.
+        """
+        loads = sorted(loads, reverse=True)
+        return all(weight <= capacity_weight and volume <= capacity_volume
+                   for (weight, volume), (capacity_weight, capacity_volume) in zip(loads, self._capacities))
+
+    def _assign(self, routes, visits):
+        """
+        Gives a vehicle to each route, the routes with the highest priority first, choosing the
+        vehicle with the least capacity that can make it.
+
+        Returns:
+            tuple: A list of (vehicle, list of visits) tours, the routes left without a vehicle, and
+                   the vehicles left without a route.
+        """
+        routes = sorted(routes, key=lambda route: (-max(visits[i].end_point.priority for i in route),
+                                                   -sum(visits[i].weight for i in route)))
+        free = list(self.vehicles)
+        tours, left_over = [], []
+        for route in routes:
+            length = self._length([visits[i] for i in route])
+            candidates = [vehicle for vehicle in free if self._fits(vehicle, route, visits, length)]
+            if not candidates:
+                left_over.append(route)
+                continue
+            vehicle = min(candidates, key=lambda vehicle: vehicle.type.weight_capacity - vehicle.current_weight)
+            free.remove(vehicle)
+            tours.append((vehicle, [visits[i] for i in route]))
+        return tours, left_over, free
+
+    def _insert(self, visits, tours, free):
+        """
+        Inserts visits where they lengthen the tours the least, the highest priority first. A visit
+        may also start a new tour of one of the free vehicles, which is then no longer free.
+
+        Returns:
+            list: The visits that do not fit in any tour nor in any free vehicle.
+        """
+        unserved = []
+        for visit in sorted(visits, key=lambda visit: -visit.end_point.priority):
+            best = None
+            length = self._length([visit])
+            candidates = [vehicle for vehicle in free if self._fits_visits(vehicle, [visit], length)]
+            if candidates:
+                # The vehicle with the least capacity that can make it, as in _assign
+                vehicle = min(candidates, key=lambda vehicle: vehicle.type.weight_capacity - vehicle.current_weight)
+                best = (length, vehicle, None)
+            for vehicle, route in tours:
+                length = self._length(route)
+                for position in range(len(route) + 1):
+                    candidate = route[:position] + [visit] + route[position:]
+                    candidate_length = self._length(candidate)
+                    if ((best is None or candidate_length - length < best[0]) and
+                            self._fits_visits(vehicle, candidate, candidate_length)):
+                        best = (candidate_length - length, route, position)
+            if best is None:
+                unserved.append(visit)
+            elif best[2] is None:
+                free.remove(best[1])
+                tours.append((best[1], [visit]))
+            else:
+                _, route, position = best
+                route.insert(position, visit)
+        return unserved
+
+    def _improve(self, tours, deadline):
+        """
+        Applies improving 2-opt and or-opt moves to the tours, in place, until there are none or the
+        deadline is reached.
+        """
+        improved = True
+        while improved and self.clock() < deadline:
+            improved = False
+            for _, route in tours:
+                improved |= self._two_opt(route, deadline)
+            for source in range(len(tours)):
+                improved |= self._or_opt(tours, source, deadline)
+
+    def _two_opt(self, route, deadline):
+        """
+        Reverses parts of a tour while that shortens it. Since the distances are not symmetric, the
+        whole tour is measured again after each reversal.
+        """
+        improved = False
+        length = self._length(route)
+        for i in range(len(route) - 1):
+            if self.clock() >= deadline:
+                break
+            for j in range(i + 1, len(route)):
+                candidate = route[:i] + route[i:j + 1][::-1] + route[j + 1:]
+                candidate_length = self._length(candidate)
+                if candidate_length < length - EPSILON:
+                    route[:] = candidate
+                    length = candidate_length
+                    improved = True
+        return improved
+
+    def _or_opt(self, tours, source, deadline):
+        """
+        Moves runs of consecutive visits of a tour to wherever they shorten the tours the most,
+        within the same tour or into another one whose vehicle can still make it.
+        """
+        improved = False
+        _, route = tours[source]
+        for size in range(1, OR_OPT_LENGTH + 1):
+            start = 0
+            while start + size <= len(route):
+                if self.clock() >= deadline:
+                    return improved
+                segment = route[start:start + size]
+                remaining = route[:start] + route[start + size:]
+                saved = self._length(route) - self._length(remaining)
+
+                best = None
+                for target, (vehicle, other) in enumerate(tours):
+                    base = remaining if target == source else other
+                    base_length = self._length(base)
+                    for position in range(len(base) + 1):
+                        if target == source and position == start:
+                            continue
+                        candidate = base[:position] + segment + base[position:]
+                        candidate_length = self._length(candidate)
+                        gain = saved - (candidate_length - base_length)
+                        if (gain > EPSILON and (best is None or gain > best[0]) and
+                                (target == source or self._fits_visits(vehicle, candidate, candidate_length))):
+                            best = (gain, target, candidate)
+                if best is None:
+                    start += 1
+                    continue
+
+                _, target, candidate = best
+                if target == source:
+                    route[:] = candidate
+                else:
+                    route[:] = remaining
+                    tours[target][1][:] = candidate
+                improved = True
+        return improved
+
+    def _length(self, visits):
+        """
+        Returns the distance of an open tour, from the start point through the visits.
+        """
+        distances = self._distances
+        length, previous = 0, self.depot
+        for visit in visits:
+            length += distances[previous][visit.index]
+            previous = visit.index
+        return length
+
+    def _fits(self, vehicle, route, visits, length):
+        return self._fits_visits(vehicle, [visits[i] for i in route], length)
+
+    @staticmethod
+    def _fits_visits(vehicle, visits, length):
+        """
+        Checks whether a vehicle can carry the supplies of some visits and has the fuel to make them.
+        """
+        return (sum(visit.weight for visit in visits) <= vehicle.type.weight_capacity - vehicle.current_weight and
+                sum(visit.volume for visit in visits) <= vehicle.type.volume_capacity - vehicle.current_volume and
+                length <= vehicle.current_fuel)
+
+    def _tour(self, vehicle, visits, weather):
+        """
+        Builds the Tour of a vehicle, following the paths of the distance matrix between its stops.
+        """
+        matrix = self.matrix
+        type_index = matrix.type_names.index(vehicle.type.name)
+        node_ids, travel_time, previous = [], 0, self.depot
+        for visit in visits:
+            path = matrix.path(matrix.positions[previous], matrix.positions[visit.index])
+            node_ids += path[1:].tolist() if node_ids else path.tolist()
+            travel_time += float(matrix.times[type_index, previous, visit.index])
+            previous = visit.index
+        positions = tuple(Position(float(weather.xs[node_id]), float(weather.ys[node_id])) for node_id in node_ids)
+        return Tour(vehicle, tuple(visits), tuple(node_ids), positions, self._length(visits), travel_time)
+
+def _load(visits, route):
+    """
+    Returns the total weight and volume of the visits of a route.
+    """
+    return sum(visits[i].weight for i in route), sum(visits[i].volume for i in route)
+
+def _split(end_point, index, quantities, max_weight, max_volume):
+    """
+    Splits the supplies for an end point into visits that fit in a vehicle with the given capacity.
+    Units that do not fit even in an empty vehicle are left out.
+    """
+    visits, supplies, weight, volume = [], [], 0, 0
+    for supply_type, quantity in quantities:
+        unit_weight, unit_volume = get_weight_volume_per_supply(supply_type)
+        while quantity > 0:
+            fit = min(quantity, int((max_weight - weight) // unit_weight), int((max_volume - volume) // unit_volume))
+            if fit > 0:
+                supplies.append(Supply(fit, supply_type))
+                weight += fit * unit_weight
+                volume += fit * unit_volume
+                quantity -= fit
+            elif supplies:
+                visits.append(Visit(end_point, index, tuple(supplies), weight, volume))
+                supplies, weight, volume = [], 0, 0
+            else:
+                break
+    if supplies:
+        visits.append(Visit(end_point, index, tuple(supplies), weight, volume))
+    return visits
+
+def plan_tours(state, terrain=0, weather=None, blocked_routes=(), matrix=None, time_budget=DEFAULT_TIME_BUDGET):
+    """
+    Plans multi-stop tours serving the end points of a simulation with the idle vehicles at the
+    start point, without changing the state (see VehicleRoutingSolver).
+
+    Args:
+        state (object): The current simulation state.
+        terrain (int, optional): The type of terrain being traversed. Defaults to 0.
+        weather (Weather, optional): The weather conditions. Defaults to the weather of the state.
+        blocked_routes (BlockedRoutes or set, optional): The routes that cannot be used.
+        matrix (DistanceMatrix, optional): The distances between the points of interest, computed
+                                           with the same conditions. Defaults to building it.
+        time_budget (float, optional): The number of seconds the local search may run for.
+
+    Returns:
+        RoutingPlan: The plan, whose elapsed time includes building the distance matrix.
+    """
+    begin = time.perf_counter()
+    weather = weather or state.weather
+    if matrix is None:
+        matrix = DistanceMatrix.build(state, terrain, weather, blocked_routes)
+    plan = VehicleRoutingSolver(state, matrix, terrain, time_budget).solve(weather)
+    return plan._replace(elapsed=time.perf_counter() - begin)
+
+def dispatch_tours(state, plan):
+    """
+    Sends the vehicles of a plan on their tours: the supplies of every visit are taken from the
+    start point and given to its end point, and each vehicle is moved to its last stop and marked
+    as busy.
+
+    Args:
+        state (object): The current simulation state the plan was made for.
+        plan (RoutingPlan): The plan.
+
+    Returns:
+        list: A tuple for each tour containing the path as a list of positions, the distance driven,
+              the travel time, and a dictionary mapping the vehicle ID to the supplies it delivered.
+    """
+    results = []
+    for tour in plan.tours:
+        for visit in tour.visits:
+            transfer_supplies(state.start_point, visit.end_point,
+                              {supply.type: supply.quantity for supply in visit.supplies})
+        vehicle = tour.vehicle
+        vehicle.current_weight += tour.weight
+        vehicle.current_volume += tour.volume
+        vehicle.current_fuel -= tour.distance
+        vehicle.position = tour.visits[-1].end_point.position
+        vehicle.vehicle_status = VehicleStatus.BUSY
+        results.append((list(tour.positions), tour.distance, tour.time,
+                        {vehicle.id: [supply.type.name for visit in tour.visits for supply in visit.supplies]}))
+    return results
@@ -0,0 +1,65 @@
+import argparse
+import random
+import time
+
+from algorithms.supplies_per_vehicles import ALLOCATORS
+from supply import Supply, SupplyType, get_weight_volume_per_supply
+from vehicle import Vehicle, VehicleStatus, VehicleType
+
+def random_instance(rng, max_vehicles, max_lots):
+    """
+    Builds a random fleet, some of it already partly loaded, and random supplies to share among it.
+
+    Args:
+        rng (random.Random): The random number generator.
+        max_vehicles (int): The largest number of vehicles.
+        max_lots (int): The largest number of supplies.
+
+    Returns:
+        tuple: The list of vehicles and the list of supplies.
+    """
+    types = (VehicleType("Camião", 0, 1000, 120, 120, 60), VehicleType("Carrinha", 0, 500, 60, 60, 80),
+             VehicleType("Mota", 0, 100, 15, 10, 100))
+    vehicles = []
+    for i in range(rng.randint(1, max_vehicles)):
+        vehicle_type = rng.choice(types)
+        load = rng.choice((0, 0, rng.uniform(0, vehicle_type.weight_capacity / 2)))
+        vehicles.append(Vehicle(i, None, vehicle_type, 1000, load, load, VehicleStatus.IDLE))
+    supplies = [Supply(rng.randint(1, 150), rng.choice(list(SupplyType))) for _ in range(rng.randint(1, max_lots))]
+    return vehicles, supplies
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares the supply allocators on random fleets: time per call, "
+                                                 "supplies left behind and capacity used.")
+    parser.add_argument("--instances", type=int, default=2000)
+    parser.add_argument("--vehicles", type=int, default=8, help="Largest fleet")
+    parser.add_argument("--lots", type=int, default=6, help="Largest number of supplies")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    instances = [random_instance(rng, args.vehicles, args.lots) for _ in range(args.instances)]
+    needed = sum(supply.quantity for _, supplies in instances for supply in supplies)
+
+    print(f"== {args.instances} random instances, up to {args.vehicles} vehicles and {args.lots} supplies")
+    for name, allocator in ALLOCATORS.items():
+        elapsed, carried, used, utilisation = 0.0, 0, 0, 0.0
+        for vehicles, supplies in instances:
+            begin = time.perf_counter()
+            supplies_per_vehicle = allocator(vehicles, supplies)
+            elapsed += time.perf_counter() - begin
+
+            for vehicle, vehicle_supplies in zip(vehicles, supplies_per_vehicle):
+                if vehicle_supplies:
+                    weight = sum(get_weight_volume_per_supply(supply.type)[0] * supply.quantity
+                                 for supply in vehicle_supplies)
+                    carried += sum(supply.quantity for supply in vehicle_supplies)
+                    used += 1
+                    utilisation += (vehicle.current_weight + weight) / vehicle.type.weight_capacity
+
+        print(f"{name:<20} {elapsed * 1e6 / args.instances:7.1f} us/call | {100 * (1 - carried / needed):5.1f}% "
+              f"units left behind | {used / args.instances:4.2f} vehicles loaded/call, "
+              f"{100 * utilisation / max(used, 1):5.1f}% of their weight capacity")
+
+if __name__ == '__main__':
+    main()
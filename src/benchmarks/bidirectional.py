@@ -0,0 +1,94 @@
+import argparse
+import random
+import time
+
+from algorithms.search import SearchStats, best_first_search, bidirectional_search
+from algorithms.utils import manhattan_distance
+from benchmarks.synthetic import grid_graph, sunny_weather
+from graph.blocked_routes import BlockedRoutes
+from graph.compact_graph import CompactGraph
+from weather import WeatherCondition
+
+def random_conditions(graph, weather, rng, fraction):
+    """
+    Gives a random RAINY, SNOWY or STORM condition to a fraction of the nodes of a graph.
+    """
+    ids, _, _ = graph.coordinates()
+    for node_id in rng.sample(list(ids), int(len(ids) * fraction)):
+        weather.set_node_condition(int(node_id), rng.choice([WeatherCondition.RAINY, WeatherCondition.SNOWY, WeatherCondition.STORM]))
+
+def random_blocked_routes(graph, rng, count):
+    """
+    Blocks a number of random edges of a graph.
+    """
+    blocked_routes = BlockedRoutes()
+    for key in rng.sample(range(len(graph)), count):
+        neighbours = [neighbour for neighbour, _ in graph.edges(key)]
+        if neighbours:
+            blocked_routes.add((graph.node_id(key), graph.node_id(rng.choice(neighbours))))
+    return blocked_routes
+
+def searches(graph, start, goal):
+    """
+    Returns the searches being compared, each one as a function of (terrain, weather, blocked routes, stats).
+    """
+    start_position, goal_position = graph.position_of(start), graph.position_of(goal)
+    to_goal = lambda key: manhattan_distance(graph.position_of(key), goal_position)
+
+    def potential(key):
+        position = graph.position_of(key)
+        return (manhattan_distance(position, goal_position) - manhattan_distance(start_position, position)) / 2
+
+    return {
+        "ucs": lambda terrain, weather, blocked_routes, stats: best_first_search(
+            graph, start, goal, terrain, weather, blocked_routes, lambda key, distance: distance, stats),
+        "bi_ucs": lambda terrain, weather, blocked_routes, stats: bidirectional_search(
+            graph, start, goal, terrain, weather, blocked_routes, stats=stats),
+        "a_star": lambda terrain, weather, blocked_routes, stats: best_first_search(
+            graph, start, goal, terrain, weather, blocked_routes, lambda key, distance: distance + to_goal(key), stats),
+        "bi_a_star": lambda terrain, weather, blocked_routes, stats: bidirectional_search(
+            graph, start, goal, terrain, weather, blocked_routes, potential, stats),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares unidirectional and bidirectional UCS and A*.")
+    parser.add_argument("--size", type=int, default=200, help="Side of the synthetic grid")
+    parser.add_argument("--queries", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    graph = CompactGraph.from_graph(grid_graph(args.size, args.size, seed=args.seed))
+    weather = sunny_weather(graph)
+    random_conditions(graph, weather, rng, 0.3)
+    blocked_routes = random_blocked_routes(graph, rng, len(graph) // 20)
+
+    totals = {}
+    found = 0
+    for _ in range(args.queries):
+        start, goal = rng.sample(range(len(graph)), 2)
+        distances = {}
+        for name, search in searches(graph, start, goal).items():
+            stats = SearchStats()
+            begin = time.perf_counter()
+            path, distance = search(0, weather, blocked_routes, stats)
+            elapsed = time.perf_counter() - begin
+            distances[name] = distance if path is not None else None
+
+            total = totals.setdefault(name, [0, 0.0])
+            total[0] += stats.expanded
+            total[1] += elapsed
+
+        reference = distances["ucs"]
+        for name, distance in distances.items():
+            if (distance is None) != (reference is None) or (distance is not None and abs(distance - reference) > 1e-9):
+                raise AssertionError(f"{name} found a distance of {distance}, UCS found {reference}")
+        found += reference is not None
+
+    print(f"== synthetic grid {args.size}x{args.size}, 30% bad weather, {len(blocked_routes)} blocked routes,"
+          f" {args.queries} random queries ({found} with a path)")
+    for name, (expanded, elapsed) in totals.items():
+        print(f"{name:<10} {expanded / args.queries:>10.0f} settled/query | {elapsed * 1000 / args.queries:8.1f} ms/query")
+
+if __name__ == '__main__':
+    main()
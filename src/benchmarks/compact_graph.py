@@ -0,0 +1,129 @@
+import argparse
+import gc
+import time
+import tracemalloc
+
+from algorithms.informed import heuristics
+from algorithms.informed.a_star import a_star_supply_delivery
+from algorithms.informed.greedy import greedy_supply_delivery
+from algorithms.uninformed.bfs import bfs_supply_delivery
+from algorithms.uninformed.dfs import dfs_supply_delivery
+from algorithms.uninformed.iterative_deepening import ids_supply_delivery
+from algorithms.uninformed.uniform_cost import ucs_supply_delivery
+from benchmarks.synthetic import grid_graph, grid_size_for_edges, sunny_weather, synthetic_state
+from graph.compact_graph import CompactGraph
+from graph.graph import Graph
+from graph.position import Position
+
+algorithm_functions = {
+    "bfs": bfs_supply_delivery,
+    "dfs": dfs_supply_delivery,
+    "ids": ids_supply_delivery,
+    "ucs": ucs_supply_delivery,
+    "a_star": lambda state, start, end, terrain, weather, blocked_routes: a_star_supply_delivery(
+        state, start, end, heuristics.manhattan_heuristic, terrain, weather, blocked_routes
+    ),
+    "greedy": lambda state, start, end, terrain, weather, blocked_routes: greedy_supply_delivery(
+        state, start, end, heuristics.manhattan_heuristic, terrain, weather, blocked_routes
+    ),
+}
+
+def measure_memory(build):
+    """
+    Measures the memory retained by the object returned by a function.
+
+    :param build: Function that builds the object
+    :return: Tuple (object, bytes retained after building it)
+    """
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, retained
+
+def copy_graph(graph):
+    """
+    Rebuilds an object graph node by node, so its memory can be measured on its own.
+
+    :param graph: Graph to copy
+    :return: A new Graph with the same nodes and edges
+    """
+    copy = Graph()
+    for node in graph.nodes.values():
+        copy.add_node(Position(node.position.x, node.position.y), node.id)
+    for node in graph.nodes.values():
+        for neighbour, open in node.neighbours:
+            copy.nodes[node.position].neighbours.append((copy.nodes[neighbour.position], open))
+    return copy
+
+def time_query(function, make_state, repeat):
+    """
+    Runs a supply delivery function repeatedly and returns the best time of a single run.
+
+    :param function: Supply delivery function to run
+    :param make_state: Function that builds a fresh simulation state for each run
+    :param repeat: Number of runs
+    :return: Tuple (best time in seconds, distance of the path found)
+    """
+    best = float('inf')
+    distance = 0
+    for _ in range(repeat):
+        state = make_state()
+        start = time.perf_counter()
+        _, distance, _, _ = function(state, state.start_point, state.end_points[0], 0, state.weather, set())
+        best = min(best, time.perf_counter() - start)
+    return best, distance
+
+def graph_position(graph, id):
+    """
+    Returns the position of the node with the given ID in a synthetic graph.
+    """
+    return list(graph.nodes)[id]
+
+def compare(name, graph, weather, start_position, end_position, algorithms, repeat):
+    """
+    Prints the memory and query times of an object graph and its compact form.
+    """
+    print(f"== {name}: {len(graph.nodes)} nodes, {sum(len(n.neighbours) for n in graph.nodes.values()) // 2} edges")
+
+    _, object_bytes = measure_memory(lambda: copy_graph(graph))
+    compact, compact_bytes = measure_memory(lambda: CompactGraph.from_graph(graph))
+    print(f"memory      object graph {object_bytes / 2**20:9.1f} MiB | compact graph {compact_bytes / 2**20:9.1f} MiB"
+          f" ({compact.nbytes / 2**20:.1f} MiB of arrays) | {object_bytes / compact_bytes:.1f}x smaller")
+
+    for algorithm in algorithms:
+        function = algorithm_functions[algorithm]
+        object_time, object_distance = time_query(
+            function, lambda: synthetic_state(graph, weather, start_position, end_position), repeat)
+        compact_time, compact_distance = time_query(
+            function, lambda: synthetic_state(compact, weather, start_position, end_position), repeat)
+        print(f"{algorithm:<11} object graph {object_time * 1000:9.1f} ms  | compact graph {compact_time * 1000:9.1f} ms"
+              f" | distance {object_distance:.6f} / {compact_distance:.6f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares the object graph with its compact (CSR) form.")
+    parser.add_argument("--dataset", help="Dataset whose road network is also compared (e.g. data/dataset1.json)")
+    parser.add_argument("--edges", type=int, default=1_000_000, help="Number of edges of the synthetic grid")
+    parser.add_argument("--hops", type=int, default=40, help="Grid distance between the endpoints of the synthetic queries")
+    parser.add_argument("--algorithms", default=",".join(algorithm_functions), help="Comma separated algorithms to time")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    algorithms = args.algorithms.split(",")
+
+    if args.dataset:
+        from load_dataset import load_dataset
+        state = load_dataset(args.dataset)
+        compare(args.dataset, state.graph, state.weather, state.start_point.position,
+                state.end_points[0].position, algorithms, args.repeat)
+
+    side = grid_size_for_edges(args.edges)
+    graph = grid_graph(side, side)
+    middle = (side // 2) * side + side // 2
+    start = graph_position(graph, middle)
+    end = graph_position(graph, middle + args.hops // 2 * (side + 1))
+    compare(f"synthetic grid {side}x{side}", graph, sunny_weather(graph), start, end, algorithms, args.repeat)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+import argparse
+import random
+import tempfile
+import time
+
+from algorithms.search import best_first_search
+from algorithms.uninformed.ch_search import ch_shortest_path
+from benchmarks.bidirectional import random_blocked_routes, random_conditions
+from benchmarks.synthetic import grid_graph, sunny_weather
+from graph.blocked_routes import BlockedRoutes
+from graph.compact_graph import CompactGraph
+from graph.contraction_hierarchy import load_contraction_hierarchy
+
+def run_queries(graph, hierarchy, weather, blocked_routes, pairs):
+    """
+    Runs the same queries with UCS and with the contraction hierarchy, checking that both find
+    paths of the same length.
+
+    :return: Tuple (UCS seconds per query, hierarchy seconds per query, fraction of fallbacks)
+    """
+    ucs_time = ch_time = 0
+    fallbacks = 0
+    for start, goal in pairs:
+        begin = time.perf_counter()
+        path, distance = best_first_search(graph, start, goal, 0, weather, blocked_routes, lambda key, distance: distance)
+        ucs_time += time.perf_counter() - begin
+
+        begin = time.perf_counter()
+        ch_path, ch_distance, used = ch_shortest_path(graph, graph.position_of(start), graph.position_of(goal),
+                                                      0, weather, blocked_routes, hierarchy)
+        ch_time += time.perf_counter() - begin
+        fallbacks += not used
+
+        if (path is None) != (ch_path is None) or abs(distance - ch_distance) > 1e-9:
+            raise AssertionError(f"UCS found {distance}, the hierarchy found {ch_distance}")
+    return ucs_time / len(pairs), ch_time / len(pairs), fallbacks / len(pairs)
+
+def main():
+    parser = argparse.ArgumentParser(description="Measures Contraction Hierarchies preprocessing and queries against UCS.")
+    parser.add_argument("--size", type=int, default=60, help="Side of the synthetic grid")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    graph = CompactGraph.from_graph(grid_graph(args.size, args.size, seed=args.seed))
+    pairs = [tuple(rng.sample(range(len(graph)), 2)) for _ in range(args.queries)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        begin = time.perf_counter()
+        hierarchy = load_contraction_hierarchy(graph, directory)
+        build_time = time.perf_counter() - begin
+        begin = time.perf_counter()
+        load_contraction_hierarchy(graph, directory)
+        load_time = time.perf_counter() - begin
+
+    print(f"== synthetic grid {args.size}x{args.size}: {len(graph)} nodes, {graph.edge_count} directed edges")
+    print(f"build {build_time:.1f} s | load from disk {load_time * 1000:.1f} ms | {hierarchy.shortcut_count} shortcuts")
+
+    weather = sunny_weather(graph)
+    scenarios = [("all sunny, nothing blocked", weather, BlockedRoutes())]
+    for fraction in (0.01, 0.1):
+        weather = sunny_weather(graph)
+        random_conditions(graph, weather, rng, fraction)
+        scenarios.append((f"{fraction:.0%} bad weather, {fraction:.0%} blocked", weather,
+                          random_blocked_routes(graph, rng, int(len(graph) * fraction))))
+
+    for name, weather, blocked_routes in scenarios:
+        ucs_time, ch_time, fallbacks = run_queries(graph, hierarchy, weather, blocked_routes, pairs)
+        print(f"{name:<28} UCS {ucs_time * 1000:7.2f} ms/query | hierarchy {ch_time * 1000:7.2f} ms/query"
+              f" | {fallbacks:.0%} fell back to bidirectional UCS")
+
+if __name__ == '__main__':
+    main()
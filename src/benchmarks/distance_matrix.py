@@ -0,0 +1,79 @@
+import argparse
+import random
+import time
+
+import numpy as np
+
+from algorithms.distance_matrix import DistanceMatrix
+from algorithms.search import best_first_search
+from benchmarks.bidirectional import random_blocked_routes, random_conditions
+from benchmarks.synthetic import grid_graph, sunny_weather, synthetic_state
+from end_point import EndPoint
+from graph.compact_graph import CompactGraph
+from weather import WeatherCondition
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares building a distance matrix with one Dijkstra search per "
+                                                 "point to one UCS per pair, and refreshing it after weather "
+                                                 "changes to building it again.")
+    parser.add_argument("--size", type=int, default=150, help="Side of the synthetic grid")
+    parser.add_argument("--end-points", type=int, default=12)
+    parser.add_argument("--changes", type=int, default=20, help="Single-node weather changes")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    graph = CompactGraph.from_graph(grid_graph(args.size, args.size, seed=args.seed))
+    weather = sunny_weather(graph)
+    random_conditions(graph, weather, rng, 0.2)
+    blocked_routes = random_blocked_routes(graph, rng, len(graph) // 50)
+
+    start = len(graph) // 2 + args.size // 2
+    state = synthetic_state(graph, weather, graph.position_of(start), graph.position_of(0))
+    state.end_points = [EndPoint(graph.position_of(key), {"Water": 1}, 0)
+                        for key in rng.sample(range(len(graph)), args.end_points)]
+
+    begin = time.perf_counter()
+    matrix = DistanceMatrix.build(state, 0, weather, blocked_routes)
+    build_time = time.perf_counter() - begin
+
+    begin = time.perf_counter()
+    keys = [graph.key_of(position) for position in matrix.positions]
+    expected = np.full((len(keys), len(keys)), float('inf'))
+    for i, source in enumerate(keys):
+        for j, target in enumerate(keys):
+            path, distance = best_first_search(graph, source, target, 0, weather, blocked_routes,
+                                               priority=lambda key, distance: distance)
+            if path is not None:
+                expected[i, j] = distance
+    pairs_time = time.perf_counter() - begin
+
+    if not np.array_equal(matrix.distances, expected):
+        raise AssertionError("The matrix has different distances")
+    n = len(matrix)
+    print(f"== synthetic grid {args.size}x{args.size}, {n} points")
+    print(f"{n * n} UCS: {pairs_time * 1000:8.1f} ms | {n} trees: {build_time * 1000:7.1f} ms"
+          f" | speed-up {pairs_time / build_time:5.1f}x")
+
+    refresh_time, rebuild_time, refreshed = 0.0, 0.0, 0
+    conditions = list(WeatherCondition)
+    for _ in range(args.changes):
+        weather.set_node_condition(graph.node_id(rng.randrange(len(graph))), rng.choice(conditions))
+
+        begin = time.perf_counter()
+        refreshed += len(matrix.refresh(weather, blocked_routes))
+        refresh_time += time.perf_counter() - begin
+
+        begin = time.perf_counter()
+        rebuilt = DistanceMatrix.build(state, 0, weather, blocked_routes)
+        rebuild_time += time.perf_counter() - begin
+
+        if not np.array_equal(matrix.distances, rebuilt.distances) or not np.allclose(matrix.times, rebuilt.times):
+            raise AssertionError("The refreshed matrix differs from the rebuilt one")
+
+    print(f"{args.changes} changes | rebuild: {rebuild_time * 1000 / args.changes:7.1f} ms/change"
+          f" | refresh: {refresh_time * 1000 / args.changes:7.1f} ms/change,"
+          f" {refreshed / args.changes:4.1f} of {n} rows/change")
+
+if __name__ == '__main__':
+    main()
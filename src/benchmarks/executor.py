@@ -0,0 +1,56 @@
+import argparse
+import os
+import random
+import time
+
+from algorithms.registry import DEFAULT_HEURISTIC, find_route
+from benchmarks.bidirectional import random_blocked_routes, random_conditions
+from benchmarks.synthetic import grid_graph, sunny_weather, synthetic_state
+from end_point import EndPoint
+from executor import RoutingExecutor
+from graph.compact_graph import CompactGraph
+
+def main():
+    parser = argparse.ArgumentParser(description="Measures how the multiprocessing executor scales with the number of processes.")
+    parser.add_argument("--size", type=int, default=150, help="Side of the synthetic grid")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--algorithm", default="ucs")
+    parser.add_argument("--heuristic", default=DEFAULT_HEURISTIC, help="Heuristic of the informed algorithms")
+    parser.add_argument("--max-processes", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    graph = CompactGraph.from_graph(grid_graph(args.size, args.size, seed=args.seed))
+    weather = sunny_weather(graph)
+    random_conditions(graph, weather, rng, 0.2)
+    blocked_routes = random_blocked_routes(graph, rng, len(graph) // 50)
+
+    state = synthetic_state(graph, weather, graph.position_of(len(graph) // 2), graph.position_of(0))
+    state.end_points = [EndPoint(graph.position_of(key), {"Water": 1}, 1)
+                        for key in rng.sample(range(len(graph)), args.queries)]
+    queries = [{"end_point": i, "algorithm": args.algorithm, "heuristic": args.heuristic} for i in range(args.queries)]
+
+    print(f"== {args.queries} {args.algorithm} queries on a {args.size}x{args.size} grid, {os.cpu_count()} CPU(s) available")
+    begin = time.perf_counter()
+    expected = [find_route(state, state.start_point, state.end_points[query["end_point"]], args.algorithm,
+                           args.heuristic, 0, weather, blocked_routes)
+                for query in queries]
+    serial = time.perf_counter() - begin
+    print(f"serial       {serial:7.2f} s")
+
+    for processes in range(1, args.max_processes + 1):
+        begin = time.perf_counter()
+        with RoutingExecutor(state, processes) as executor:
+            started = time.perf_counter() - begin
+            begin = time.perf_counter()
+            routes = executor.find_routes(queries, blocked_routes)
+            elapsed = time.perf_counter() - begin
+
+        if [route and route.distance for route in routes] != [route and route.distance for route in expected]:
+            raise AssertionError("The executor found different distances")
+        print(f"{processes:2} processes {elapsed:7.2f} s | speed-up {serial / elapsed:5.2f}x"
+              f" | workers started in {started * 1000:.0f} ms")
+
+if __name__ == '__main__':
+    main()
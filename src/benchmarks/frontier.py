@@ -0,0 +1,120 @@
+import argparse
+import heapq
+import random
+import time
+from queue import PriorityQueue
+
+from algorithms.frontier import Frontier
+from algorithms.search import SearchStats, best_first_search, reconstruct_path
+from benchmarks.synthetic import grid_graph, sunny_weather
+from graph.compact_graph import CompactGraph
+from weather import WeatherCondition
+
+def priority_queue_search(graph, start, goal, terrain, weather, blocked_routes, stats):
+    """
+    Uniform cost search over queue.PriorityQueue, which takes a lock on every put and get and
+    keeps every duplicate entry, as the algorithms did before the shared frontier.
+    """
+    parents = {}
+    queue = PriorityQueue()
+    queue.put((0, start, None, 0))
+    while not queue.empty():
+        _, current, parent, total_distance = queue.get()
+        if current in parents:
+            stats.stale += 1
+            continue
+        parents[current] = parent
+        stats.expanded += 1
+        if current == goal:
+            return reconstruct_path(parents, goal), total_distance
+        for neighbor, distance in graph.successors(current, terrain, weather, blocked_routes):
+            if neighbor not in parents:
+                queue.put((total_distance + distance, neighbor, current, total_distance + distance))
+                stats.generated += 1
+    return None, 0
+
+def heapq_search(graph, start, goal, terrain, weather, blocked_routes, stats):
+    """
+    Uniform cost search over a plain heapq list that also keeps every duplicate entry.
+    """
+    parents = {}
+    heap = [(0, start, None, 0)]
+    while heap:
+        _, current, parent, total_distance = heapq.heappop(heap)
+        if current in parents:
+            stats.stale += 1
+            continue
+        parents[current] = parent
+        stats.expanded += 1
+        if current == goal:
+            return reconstruct_path(parents, goal), total_distance
+        for neighbor, distance in graph.successors(current, terrain, weather, blocked_routes):
+            if neighbor not in parents:
+                heapq.heappush(heap, (total_distance + distance, neighbor, current, total_distance + distance))
+                stats.generated += 1
+    return None, 0
+
+def frontier_search(graph, start, goal, terrain, weather, blocked_routes, stats):
+    """
+    Uniform cost search through the search core, backed by Frontier.
+    """
+    return best_first_search(graph, start, goal, terrain, weather, blocked_routes, lambda key, distance: distance, stats)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares frontier implementations on a large synthetic graph.")
+    parser.add_argument("--nodes", type=int, default=100_000)
+    parser.add_argument("--operations", type=int, default=1_000_000, help="Operations of the push/pop micro-benchmark")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    priorities = [rng.random() for _ in range(args.operations // 2)]
+    keys = [rng.randrange(args.nodes) for _ in range(args.operations // 2)]
+
+    print(f"== {args.operations} operations (half pushes, half pops) on {args.nodes} keys")
+    begin = time.perf_counter()
+    queue = PriorityQueue()
+    for priority, key in zip(priorities, keys):
+        queue.put((priority, key))
+    while not queue.empty():
+        queue.get()
+    print(f"queue.PriorityQueue {(time.perf_counter() - begin) * 1e9 / args.operations:8.0f} ns/operation")
+
+    begin = time.perf_counter()
+    heap = []
+    for priority, key in zip(priorities, keys):
+        heapq.heappush(heap, (priority, key))
+    while heap:
+        heapq.heappop(heap)
+    print(f"heapq               {(time.perf_counter() - begin) * 1e9 / args.operations:8.0f} ns/operation")
+
+    begin = time.perf_counter()
+    frontier = Frontier()
+    for priority, key in zip(priorities, keys):
+        frontier.push(key, priority)
+    while frontier:
+        frontier.pop()
+    print(f"Frontier            {(time.perf_counter() - begin) * 1e9 / args.operations:8.0f} ns/operation"
+          f" ({frontier.pushed} pushes kept, {frontier.stale} stale pops)")
+
+    side = int(args.nodes ** 0.5)
+    graph = CompactGraph.from_graph(grid_graph(side, side, seed=args.seed))
+    weather = sunny_weather(graph)
+    weather.set_nodes_condition(rng.sample(range(len(graph)), len(graph) // 3), WeatherCondition.SNOWY)
+    start, goal = 0, len(graph) - 1
+
+    print(f"== uniform cost search, {len(graph)}-node grid with 1/3 snowy nodes, corner to corner")
+    distances = set()
+    for name, search in (("queue.PriorityQueue", priority_queue_search), ("heapq", heapq_search), ("Frontier", frontier_search)):
+        stats = SearchStats()
+        begin = time.perf_counter()
+        _, distance = search(graph, start, goal, 0, weather, set(), stats)
+        elapsed = time.perf_counter() - begin
+        distances.add(round(distance, 12))
+        print(f"{name:<19} {elapsed * 1000:8.0f} ms | {stats.expanded} expanded, {stats.generated} pushed, {stats.stale} stale pops")
+
+    if len(distances) != 1:
+        raise AssertionError(f"Distances differ: {distances}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+import argparse
+import time
+
+from algorithms.informed.heuristic_context import HeuristicContext, closed_edge_counts
+from algorithms.informed.heuristics import final_combined_heuristic
+from algorithms.search import SearchStats, best_first_search
+from benchmarks.synthetic import grid_graph, sunny_weather, synthetic_state
+from graph.compact_graph import CompactGraph
+from vehicle import Vehicle, VehicleStatus
+
+def main():
+    parser = argparse.ArgumentParser(description="Measures final_combined_heuristic against its precomputed HeuristicContext version.")
+    parser.add_argument("--size", type=int, default=100, help="Side of the synthetic grid")
+    parser.add_argument("--vehicles", type=int, default=20, help="Number of vehicles in the state")
+    args = parser.parse_args()
+
+    graph = CompactGraph.from_graph(grid_graph(args.size, args.size, closed=0.1))
+    weather = sunny_weather(graph)
+    start, goal = 0, len(graph) - 1
+    state = synthetic_state(graph, weather, graph.position_of(start), graph.position_of(goal))
+    truck = state.vehicles[0]
+    for i in range(1, args.vehicles):
+        state.vehicles.append(Vehicle(i, truck.position, truck.type, float('inf'), 0, 0, VehicleStatus.IDLE))
+    end_point = state.end_points[0]
+    positions = [graph.position_of(key) for key in range(len(graph))]
+
+    print(f"== synthetic grid {args.size}x{args.size}, {len(state.vehicles)} vehicles")
+    begin = time.perf_counter()
+    for position in positions:
+        final_combined_heuristic(position, end_point.position, state, end_point)
+    per_call = (time.perf_counter() - begin) / len(positions)
+    print(f"final_combined_heuristic      {per_call * 1e6:8.2f} us/node")
+
+    begin = time.perf_counter()
+    context = HeuristicContext(state, end_point)
+    build = time.perf_counter() - begin
+    begin = time.perf_counter()
+    for position in positions:
+        context.final_combined(position, end_point.position)
+    per_node = (time.perf_counter() - begin) / len(positions)
+    print(f"context, first pass           {per_node * 1e6:8.2f} us/node (context built in {build * 1e6:.0f} us)")
+
+    begin = time.perf_counter()
+    for position in positions:
+        context.final_combined(position, end_point.position)
+    print(f"context, closed edges cached  {(time.perf_counter() - begin) / len(positions) * 1e6:8.2f} us/node")
+
+    closed_edges = closed_edge_counts(graph)
+    begin = time.perf_counter()
+    context.final_combined_batch(graph.xs, graph.ys, end_point.position, closed_edges)
+    print(f"final_combined_batch          {(time.perf_counter() - begin) / len(positions) * 1e6:8.3f} us/node")
+
+    for name, estimate in (("function", lambda p: final_combined_heuristic(p, end_point.position, state, end_point)),
+                           ("context", lambda p, bound=HeuristicContext(state, end_point).final_combined: bound(p, end_point.position))):
+        stats = SearchStats()
+        begin = time.perf_counter()
+        best_first_search(graph, start, goal, 0, weather, set(), lambda key, distance: estimate(graph.position_of(key)), stats)
+        print(f"greedy search, {name:<8} {(time.perf_counter() - begin) * 1000:8.1f} ms ({stats.generated} evaluations)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+import argparse
+import random
+import time
+
+from algorithms.informed.heuristics import landmark_heuristic, manhattan_heuristic
+from algorithms.informed.landmarks import get_landmarks
+from algorithms.search import SearchStats, best_first_search
+from benchmarks.bidirectional import random_blocked_routes, random_conditions
+from benchmarks.synthetic import grid_graph, sunny_weather, synthetic_state
+from graph.compact_graph import CompactGraph
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares the nodes A* expands with the ALT and Manhattan heuristics.")
+    parser.add_argument("--size", type=int, default=100, help="Side of the synthetic grid")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--closed", type=float, default=0.3, help="Fraction of closed edges, which force detours")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    graph = CompactGraph.from_graph(grid_graph(args.size, args.size, seed=args.seed, closed=args.closed))
+    weather = sunny_weather(graph)
+    random_conditions(graph, weather, rng, 0.2)
+    blocked_routes = random_blocked_routes(graph, rng, len(graph) // 20)
+
+    begin = time.perf_counter()
+    landmarks = get_landmarks(graph)
+    print(f"== synthetic grid {args.size}x{args.size}, {args.closed:.0%} closed edges, 20% bad weather,"
+          f" {len(blocked_routes)} blocked routes")
+    print(f"{len(landmarks.landmarks)} landmarks selected in {(time.perf_counter() - begin) * 1000:.0f} ms")
+
+    heuristics = {"ucs": None, "manhattan": manhattan_heuristic, "landmarks": landmark_heuristic}
+    totals = {name: [0, 0.0] for name in heuristics}
+    for _ in range(args.queries):
+        start, goal = rng.sample(range(len(graph)), 2)
+        state = synthetic_state(graph, weather, graph.position_of(start), graph.position_of(goal))
+        end_point = state.end_points[0]
+
+        distances = {}
+        for name, heuristic in heuristics.items():
+            if heuristic is None:
+                priority = lambda key, distance: distance
+            else:
+                priority = lambda key, distance, heuristic=heuristic: distance + heuristic(
+                    graph.position_of(key), end_point.position, state, end_point)
+
+            stats = SearchStats()
+            begin = time.perf_counter()
+            _, distances[name] = best_first_search(graph, start, goal, 0, weather, blocked_routes, priority, stats)
+            totals[name][0] += stats.expanded
+            totals[name][1] += time.perf_counter() - begin
+
+        if any(abs(distance - distances["ucs"]) > 1e-9 for distance in distances.values()):
+            raise AssertionError(f"Distances differ: {distances}")
+
+    for name, (expanded, elapsed) in totals.items():
+        print(f"{name:<10} {expanded / args.queries:>8.0f} expanded/query"
+              f" ({expanded / totals['ucs'][0]:6.1%} of UCS) | {elapsed * 1000 / args.queries:7.1f} ms/query")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+import argparse
+import random
+import time
+
+from algorithms.informed.heuristics import manhattan_heuristic
+from algorithms.informed.lpa_star import LifelongPlanner
+from algorithms.search import SearchStats, best_first_search
+from benchmarks.bidirectional import random_blocked_routes, random_conditions
+from benchmarks.synthetic import grid_graph, sunny_weather, synthetic_state
+from graph.compact_graph import CompactGraph
+from weather import WeatherCondition
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares repairing a path with LPA* to searching it again with A* "
+                                                 "after single-node weather changes.")
+    parser.add_argument("--size", type=int, default=150, help="Side of the synthetic grid")
+    parser.add_argument("--pairs", type=int, default=10, help="Number of start/end pairs")
+    parser.add_argument("--changes", type=int, default=20, help="Weather changes per pair")
+    parser.add_argument("--closed", type=float, default=0.2, help="Fraction of closed edges, which force detours")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    graph = CompactGraph.from_graph(grid_graph(args.size, args.size, seed=args.seed, closed=args.closed))
+    weather = sunny_weather(graph)
+    random_conditions(graph, weather, rng, 0.2)
+    blocked_routes = random_blocked_routes(graph, rng, len(graph) // 50)
+    conditions = list(WeatherCondition)
+
+    print(f"== synthetic grid {args.size}x{args.size}, {args.pairs} pairs x {args.changes} single-node changes")
+    # Changes on the current path always force a repair; changes anywhere else rarely do
+    for where in ("on the path", "anywhere"):
+        totals = {"A*": [0, 0.0], "LPA*": [0, 0.0]}
+        for _ in range(args.pairs):
+            start, goal = rng.sample(range(len(graph)), 2)
+            state = synthetic_state(graph, weather, graph.position_of(start), graph.position_of(goal))
+            end_point = state.end_points[0]
+            planner = LifelongPlanner(graph, start, goal, 0,
+                                      lambda p1, p2: manhattan_heuristic(p1, p2, state, end_point))
+            path, _ = planner.plan(weather, blocked_routes)
+
+            for _ in range(args.changes):
+                if where == "on the path" and path and len(path) > 2:
+                    key = rng.choice(path[1:-1])
+                else:
+                    key = rng.randrange(len(graph))
+                weather.set_node_condition(graph.node_id(key), rng.choice(conditions))
+
+                begin = time.perf_counter()
+                path, repaired = planner.plan(weather, blocked_routes)
+                totals["LPA*"][1] += time.perf_counter() - begin
+                totals["LPA*"][0] += planner.expanded
+
+                stats = SearchStats()
+                begin = time.perf_counter()
+                _, searched = best_first_search(
+                    graph, start, goal, 0, weather, blocked_routes,
+                    priority=lambda key, distance: distance + manhattan_heuristic(
+                        graph.position_of(key), end_point.position, state, end_point),
+                    stats=stats
+                )
+                totals["A*"][1] += time.perf_counter() - begin
+                totals["A*"][0] += stats.expanded
+
+                if abs(repaired - searched) > 1e-9:
+                    raise AssertionError(f"LPA* found {repaired}, A* found {searched}")
+
+        changes = args.pairs * args.changes
+        print(f"-- changes {where}")
+        for name, (expanded, elapsed) in totals.items():
+            print(f"{name:<5} {expanded / changes:>8.0f} expanded/change | {elapsed * 1000 / changes:7.2f} ms/change")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+import argparse
+import random
+import time
+
+from algorithms.search import SearchStats, best_first_search
+from algorithms.uninformed.one_to_many import ShortestPathTree
+from benchmarks.bidirectional import random_blocked_routes, random_conditions
+from benchmarks.synthetic import grid_graph, sunny_weather, synthetic_state
+from end_point import EndPoint
+from graph.compact_graph import CompactGraph
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares routing to every end point with one Dijkstra search "
+                                                 "to running one UCS per end point.")
+    parser.add_argument("--size", type=int, default=150, help="Side of the synthetic grid")
+    parser.add_argument("--end-points", type=int, nargs="+", default=[5, 20, 80])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    graph = CompactGraph.from_graph(grid_graph(args.size, args.size, seed=args.seed))
+    weather = sunny_weather(graph)
+    random_conditions(graph, weather, rng, 0.2)
+    blocked_routes = random_blocked_routes(graph, rng, len(graph) // 50)
+    start = len(graph) // 2 + args.size // 2
+
+    print(f"== synthetic grid {args.size}x{args.size}, start point in the middle")
+    for count in args.end_points:
+        state = synthetic_state(graph, weather, graph.position_of(start), graph.position_of(0))
+        state.end_points = [EndPoint(graph.position_of(key), {"Water": 1}, 0)
+                            for key in rng.sample(range(len(graph)), count)]
+
+        separate = SearchStats()
+        begin = time.perf_counter()
+        expected = []
+        for end_point in state.end_points:
+            _, distance = best_first_search(graph, start, graph.key_of(end_point.position), 0, weather,
+                                            blocked_routes, priority=lambda key, distance: distance, stats=separate)
+            expected.append(distance)
+        separate_time = time.perf_counter() - begin
+
+        single = SearchStats()
+        begin = time.perf_counter()
+        tree = ShortestPathTree.build(state, state.start_point, state.end_points, 0, weather, blocked_routes, single)
+        routes = [tree.route(end_point.position) for end_point in state.end_points]
+        single_time = time.perf_counter() - begin
+
+        if [route.distance if route else 0 for route in routes] != expected:
+            raise AssertionError("The tree found different distances")
+        print(f"{count:3} end points | {count} UCS: {separate.expanded:7} expanded {separate_time * 1000:8.1f} ms"
+              f" | one tree: {single.expanded:6} expanded {single_time * 1000:7.1f} ms"
+              f" | speed-up {separate_time / single_time:5.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+import argparse
+import heapq
+import time
+import tracemalloc
+from collections import deque
+
+from algorithms.search import SearchStats, best_first_search, breadth_first_search, depth_first_search
+from benchmarks.synthetic import grid_graph, sunny_weather
+from graph.compact_graph import CompactGraph
+
+def path_copy_search(graph, start, goal, terrain, weather, blocked_routes, kind, stats):
+    """
+    The search loop the algorithms used before the shared search core: every frontier entry
+    carries its own copy of the path, extended with path + [neighbor] on every push.
+
+    :param kind: "bfs", "dfs" or "ucs"
+    :return: Tuple (path, total distance)
+    """
+    visited = set()
+    if kind == "ucs":
+        frontier = [(0, start, [start])]
+        pop = lambda: heapq.heappop(frontier)
+        push = lambda entry: heapq.heappush(frontier, entry)
+    else:
+        frontier = deque([(0, start, [start])])
+        pop = frontier.popleft if kind == "bfs" else frontier.pop
+        push = frontier.append
+
+    while frontier:
+        total_distance, current, path = pop()
+        if current in visited:
+            continue
+        visited.add(current)
+        stats.expanded += 1
+
+        if current == goal:
+            return path, total_distance
+
+        successors = list(graph.successors(current, terrain, weather, blocked_routes))
+        if kind == "dfs":
+            successors.reverse()
+        for neighbor, distance in successors:
+            if neighbor not in visited:
+                push((total_distance + distance, neighbor, path + [neighbor]))
+
+    return None, 0
+
+def parent_pointer_search(graph, start, goal, terrain, weather, blocked_routes, kind, stats):
+    """
+    The same searches through the shared search core, which only records predecessors.
+    """
+    if kind == "bfs":
+        return breadth_first_search(graph, start, goal, terrain, weather, blocked_routes, stats)
+    if kind == "dfs":
+        return depth_first_search(graph, start, goal, terrain, weather, blocked_routes, stats)
+    return best_first_search(graph, start, goal, terrain, weather, blocked_routes,
+                             lambda key, distance: distance, stats)
+
+def measure(search, graph, start, goal, weather, kind):
+    """
+    Runs a search twice, once to measure its time and the nodes it expands, and once under
+    tracemalloc (which slows it down considerably) to measure its peak memory.
+
+    :return: Tuple (seconds, peak bytes, expanded nodes, path length)
+    """
+    stats = SearchStats()
+    begin = time.perf_counter()
+    path, _ = search(graph, start, goal, 0, weather, set(), kind, stats)
+    elapsed = time.perf_counter() - begin
+
+    tracemalloc.start()
+    search(graph, start, goal, 0, weather, set(), kind, SearchStats())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, stats.expanded, len(path) if path else 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares per-push path copies with parent-pointer path reconstruction.")
+    parser.add_argument("--size", type=int, default=80, help="Side of the synthetic grid (path copies run out of memory on DFS above ~150)")
+    parser.add_argument("--algorithms", default="bfs,ucs,dfs")
+    args = parser.parse_args()
+
+    graph = grid_graph(args.size, args.size)
+    weather = sunny_weather(graph)
+    compact = CompactGraph.from_graph(graph)
+    # Opposite corners of the grid, so every route is long
+    start, goal = 0, len(compact) - 1
+
+    print(f"== synthetic grid {args.size}x{args.size}, corner to corner")
+    for kind in args.algorithms.split(","):
+        for name, search in (("path copies", path_copy_search), ("parent pointers", parent_pointer_search)):
+            elapsed, peak, expanded, length = measure(search, compact, start, goal, weather, kind)
+            print(f"{kind:<4} {name:<16} {elapsed * 1000:9.1f} ms | peak {peak / 2**20:8.1f} MiB"
+                  f" | {expanded:>7} expanded | {expanded / elapsed:>9.0f} expansions/s | path of {length} nodes")
+
+if __name__ == '__main__':
+    main()
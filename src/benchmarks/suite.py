@@ -0,0 +1,322 @@
+import argparse
+import csv
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+
+from algorithms.informed import heuristics
+from algorithms.registry import HEURISTICS, INFORMED_ROUTES, UNINFORMED_ROUTES
+from algorithms.search import SearchStats
+from algorithms.uninformed.ch_search import get_contraction_hierarchy
+from algorithms.uninformed.uniform_cost import ucs_route
+from benchmarks.bidirectional import random_conditions
+from benchmarks.synthetic import geometric_graph, grid_graph, sunny_weather, synthetic_state
+from graph.compact_graph import CompactGraph
+
+# LPA* keeps its searches between queries and CH builds its index on the first query, so their
+# single-query numbers are not comparable with the others, and IDA* searches again for every
+# distinct path cost, which takes seconds per query on large graphs; they only run when asked for
+DEFAULT_ALGORITHMS = ("bfs", "dfs", "ids", "ucs", "bi_ucs", "a_star", "bi_a_star", "greedy")
+
+FIELDS = ("graph", "nodes", "edges", "algorithm", "heuristic", "pair", "start", "goal", "found", "cost",
+          "optimal_cost", "time_ms", "expanded", "peak_frontier", "peak_memory_kib")
+
+def load_graphs(args):
+    """
+    Builds the graphs selected on the command line.
+
+    The road network of the dataset is read from the graph cache only, never downloaded, and is
+    skipped (with a warning) if it is not cached yet.
+
+    Args:
+        args (argparse.Namespace): The parsed command line arguments.
+
+    Returns:
+        list: The (name, CompactGraph) pairs of the graphs.
+    """
+    graphs = []
+    for name in args.graphs.split(","):
+        if name == "dataset":
+            from geography.geography import graph_from_arrays
+            from geography.map_cache import load_map_arrays
+            with open(args.dataset) as file:
+                geography = json.load(file)["geography"]
+            arrays = load_map_arrays(geography, "drive")
+            if arrays is None:
+                print(f"warning: the road network of {args.dataset} is not cached, skipping it "
+                      f"(run bin/run once, or python3 -m geography.map_cache \"{geography}\")", file=sys.stderr)
+                continue
+            graphs.append((args.dataset, CompactGraph.from_graph(graph_from_arrays(arrays))))
+        elif name == "grid":
+            graphs.append((f"grid {args.grid}x{args.grid}",
+                           CompactGraph.from_graph(grid_graph(args.grid, args.grid, seed=args.seed))))
+        elif name == "geometric":
+            graphs.append((f"geometric {args.geometric}",
+                           CompactGraph.from_graph(geometric_graph(args.geometric, seed=args.seed))))
+        else:
+            raise ValueError(f"Unknown graph '{name}'.")
+    return graphs
+
+def combinations(algorithms, heuristic_names):
+    """
+    Returns every (algorithm, heuristic) pair to run, with None as the heuristic of the uninformed
+    algorithms.
+
+    Args:
+        algorithms (list): The names of the algorithms.
+        heuristic_names (list): The names of the heuristics the informed algorithms run with.
+
+    Returns:
+        list: The (algorithm, heuristic) pairs.
+
+    Raises:
+        ValueError: If an algorithm is unknown.
+    """
+    pairs = []
+    for algorithm in algorithms:
+        if algorithm in INFORMED_ROUTES:
+            pairs += [(algorithm, heuristic) for heuristic in heuristic_names]
+        elif algorithm in UNINFORMED_ROUTES:
+            pairs.append((algorithm, None))
+        else:
+            raise ValueError(f"Unknown algorithm '{algorithm}'.")
+    return pairs
+
+def run_query(state, algorithm, heuristic, stats):
+    """
+    Runs one algorithm between the start point and the end point of a state.
+
+    Args:
+        state (State): The simulation state, with a single end point.
+        algorithm (str): The name of the algorithm.
+        heuristic (str): The name of the heuristic, or None.
+        stats (SearchStats): The counters updated by the search.
+
+    Returns:
+        float: The distance of the path found, or None if there is none.
+    """
+    end_point = state.end_points[0]
+    if heuristic is None:
+        route = UNINFORMED_ROUTES[algorithm](state, state.start_point, end_point, 0, state.weather, set(), stats=stats)
+    else:
+        route = INFORMED_ROUTES[algorithm](state, state.start_point, end_point, getattr(heuristics, heuristic), 0,
+                                           state.weather, set(), stats=stats)
+    return route.distance if route else None
+
+def measure(graph, weather, start, goal, algorithm, heuristic, memory):
+    """
+    Times one query and collects its counters, then runs it again under tracemalloc for its peak
+    memory, since tracing slows the search down too much to time it at the same time.
+
+    Args:
+        graph (CompactGraph): The graph.
+        weather (Weather): The weather conditions.
+        start (int): The key of the start node.
+        goal (int): The key of the goal node.
+        algorithm (str): The name of the algorithm.
+        heuristic (str): The name of the heuristic, or None.
+        memory (bool): Whether to measure the peak memory.
+
+    Returns:
+        dict: The found, cost, time_ms, expanded, peak_frontier and peak_memory_kib fields.
+    """
+    make_state = lambda: synthetic_state(graph, weather, graph.position_of(start), graph.position_of(goal))
+    stats = SearchStats()
+    state = make_state()
+    begin = time.perf_counter()
+    cost = run_query(state, algorithm, heuristic, stats)
+    elapsed = time.perf_counter() - begin
+
+    peak_memory = None
+    if memory:
+        state = make_state()
+        tracemalloc.start()
+        try:
+            run_query(state, algorithm, heuristic, SearchStats())
+            peak_memory = tracemalloc.get_traced_memory()[1] / 1024
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "found": cost is not None,
+        "cost": cost,
+        "time_ms": elapsed * 1000,
+        "expanded": stats.expanded,
+        "peak_frontier": stats.peak_frontier,
+        "peak_memory_kib": peak_memory,
+    }
+
+def run_suite(graphs, runs, pairs, seed, conditions, memory, progress=None):
+    """
+    Runs every (algorithm, heuristic) pair over the same seeded random start/end pairs of every graph.
+
+    Args:
+        graphs (list): The (name, CompactGraph) pairs of the graphs.
+        runs (list): The (algorithm, heuristic) pairs.
+        pairs (int): The number of start/end pairs per graph.
+        seed (int): The seed of the pairs and of the weather.
+        conditions (float): The fraction of the nodes given a random RAINY, SNOWY or STORM condition.
+        memory (bool): Whether to measure the peak memory of each query.
+        progress (file, optional): The stream where a line is written per graph. Defaults to None.
+
+    Returns:
+        list: The records, one per query, with the keys in FIELDS.
+    """
+    records = []
+    for name, graph in graphs:
+        rng = random.Random(seed)
+        weather = sunny_weather(graph)
+        random_conditions(graph, weather, rng, conditions)
+        edges = len(graph.targets) // 2
+        if any(algorithm == "ch" for algorithm, _ in runs):
+            get_contraction_hierarchy(graph)
+        if progress:
+            print(f"== {name}: {len(graph)} nodes, {edges} edges", file=progress)
+
+        for pair in range(pairs):
+            start, goal = rng.sample(range(len(graph)), 2)
+            state = synthetic_state(graph, weather, graph.position_of(start), graph.position_of(goal))
+            optimal = ucs_route(state, state.start_point, state.end_points[0], 0, weather, set())
+            for algorithm, heuristic in runs:
+                record = {
+                    "graph": name, "nodes": len(graph), "edges": edges, "algorithm": algorithm,
+                    "heuristic": heuristic, "pair": pair, "start": int(graph.node_id(start)),
+                    "goal": int(graph.node_id(goal)), "optimal_cost": optimal.distance if optimal else None,
+                }
+                record.update(measure(graph, weather, start, goal, algorithm, heuristic, memory))
+                records.append(record)
+    return records
+
+def summarise(records):
+    """
+    Averages the records of each graph, algorithm and heuristic.
+
+    Args:
+        records (list): The records.
+
+    Returns:
+        list: The summary dictionaries, in the order the groups first appear.
+    """
+    groups = defaultdict(list)
+    for record in records:
+        groups[(record["graph"], record["algorithm"], record["heuristic"])].append(record)
+
+    def mean(values):
+        values = [value for value in values if value is not None]
+        return sum(values) / len(values) if values else None
+
+    summary = []
+    for (graph, algorithm, heuristic), group in groups.items():
+        both = [record for record in group if record["found"] and record["optimal_cost"]]
+        summary.append({
+            "graph": graph, "algorithm": algorithm, "heuristic": heuristic,
+            "found": sum(record["found"] for record in group), "queries": len(group),
+            "time_ms": mean(record["time_ms"] for record in group),
+            "expanded": mean(record["expanded"] for record in group),
+            "peak_frontier": max((record["peak_frontier"] or 0 for record in group), default=0),
+            "peak_memory_kib": mean(record["peak_memory_kib"] for record in group),
+            "cost_ratio": mean(record["cost"] / record["optimal_cost"] for record in both),
+        })
+    return summary
+
+def print_summary(summary, output):
+    """
+    Prints the summary as a table.
+    """
+    def number(value, digits):
+        return "-" if value is None else f"{value:.{digits}f}"
+
+    print(f"{'graph':<22} {'algorithm':<10} {'heuristic':<40} {'found':>7} {'ms':>9} {'expanded':>9} "
+          f"{'frontier':>8} {'KiB':>8} {'cost/opt':>8}", file=output)
+    for row in summary:
+        print(f"{row['graph']:<22} {row['algorithm']:<10} {row['heuristic'] or '-':<40} "
+              f"{row['found']:>3}/{row['queries']:<3} {number(row['time_ms'], 2):>9} {number(row['expanded'], 0):>9} "
+              f"{row['peak_frontier']:>8} {number(row['peak_memory_kib'], 0):>8} {number(row['cost_ratio'], 3):>8}",
+              file=output)
+
+def compare_with_baseline(records, baseline_file, output, tolerance=0.1):
+    """
+    Compares the records with the ones of an earlier JSON report: a query whose cost changed is
+    listed, as is any group whose mean time or expanded nodes grew by more than the tolerance.
+
+    Args:
+        records (list): The records.
+        baseline_file (str): The path of the JSON report to compare with.
+        output (file): The stream where the differences are written.
+        tolerance (float, optional): The relative growth reported as a regression. Defaults to 0.1.
+
+    Returns:
+        int: The number of differences found.
+    """
+    with open(baseline_file) as file:
+        baseline = json.load(file)["records"]
+    key = lambda record: (record["graph"], record["algorithm"], record["heuristic"], record["pair"])
+    previous = {key(record): record for record in baseline}
+
+    differences = 0
+    for record in records:
+        old = previous.get(key(record))
+        if old is not None and old["cost"] != record["cost"] and (
+                old["cost"] is None or record["cost"] is None or abs(old["cost"] - record["cost"]) > 1e-9):
+            print(f"cost changed: {key(record)} {old['cost']} -> {record['cost']}", file=output)
+            differences += 1
+
+    old_summary = {(row["graph"], row["algorithm"], row["heuristic"]): row
+                   for row in summarise([record for record in baseline if key(record) in {key(r) for r in records}])}
+    for row in summarise(records):
+        old = old_summary.get((row["graph"], row["algorithm"], row["heuristic"]))
+        if old is None:
+            continue
+        for field in ("time_ms", "expanded"):
+            if old[field] and row[field] is not None and row[field] > old[field] * (1 + tolerance):
+                print(f"{field} regressed: {row['graph']} {row['algorithm']} {row['heuristic'] or '-'} "
+                      f"{old[field]:.2f} -> {row[field]:.2f}", file=output)
+                differences += 1
+    return differences
+
+def main():
+    parser = argparse.ArgumentParser(description="Runs every algorithm and heuristic over seeded random queries on "
+                                                 "the dataset's road network and on synthetic graphs.")
+    parser.add_argument("--graphs", default="dataset,grid,geometric",
+                        help="Comma separated graphs: dataset, grid and/or geometric")
+    parser.add_argument("--dataset", default="data/dataset1.json", help="Dataset whose cached road network is used")
+    parser.add_argument("--grid", type=int, default=60, help="Side of the synthetic grid")
+    parser.add_argument("--geometric", type=int, default=3600, help="Nodes of the random geometric graph")
+    parser.add_argument("--algorithms", default=",".join(DEFAULT_ALGORITHMS),
+                        help="Comma separated algorithms (ch, ida_star and lpa_star can also be given)")
+    parser.add_argument("--heuristics", default=",".join(HEURISTICS), help="Comma separated heuristics")
+    parser.add_argument("--pairs", type=int, default=10, help="Random start/end pairs per graph")
+    parser.add_argument("--conditions", type=float, default=0.1, help="Fraction of nodes with bad weather")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the peak memory measurement")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--csv", help="File the records are written to, as CSV")
+    parser.add_argument("--json", help="File the report is written to, as JSON")
+    parser.add_argument("--baseline", help="JSON report to compare the results with")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Relative growth of the mean time or expanded nodes reported as a regression")
+    args = parser.parse_args()
+
+    runs = combinations(args.algorithms.split(","), args.heuristics.split(","))
+    graphs = load_graphs(args)
+    records = run_suite(graphs, runs, args.pairs, args.seed, args.conditions, not args.no_memory, sys.stdout)
+    print_summary(summarise(records), sys.stdout)
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(records)
+    if args.json:
+        metadata = {key: value for key, value in vars(args).items() if key not in ("csv", "json", "baseline", "tolerance")}
+        metadata.update(python=platform.python_version(), platform=platform.platform(), date=time.strftime("%Y-%m-%d"))
+        with open(args.json, "w") as file:
+            json.dump({"metadata": metadata, "records": records}, file, indent=1)
+    if args.baseline and compare_with_baseline(records, args.baseline, sys.stdout, args.tolerance):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
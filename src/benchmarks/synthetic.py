@@ -0,0 +1,136 @@
+import random
+
+from end_point import EndPoint
+from graph.graph import Graph
+from graph.position import Position
+from load_dataset import State
+from start_point import StartPoint
+from supply import Supply, SupplyType
+from vehicle import Vehicle, VehicleStatus, VehicleType
+from weather import Weather
+
+def grid_graph(rows, cols, spacing=0.0005, seed=0, closed=0.0):
+    """
+    Builds a synthetic road network shaped like a grid, with slightly jittered coordinates.
+
+    Each node is connected to its right and bottom neighbours, so the graph has roughly
+    2 * rows * cols edges. Node IDs are assigned in row-major order, like the IDs of the
+    OSM nodes in load_map_data_to_graph.
+
+    Args:
+        rows (int): The number of rows of the grid.
+        cols (int): The number of columns of the grid.
+        spacing (float, optional): The distance between two adjacent nodes. Defaults to 0.0005.
+        seed (int, optional): The seed of the coordinate jitter. Defaults to 0.
+        closed (float, optional): The fraction of edges that are closed, forcing detours. Defaults to 0.
+
+    Returns:
+        Graph: The grid graph.
+    """
+    rng = random.Random(seed)
+    graph = Graph()
+    positions = []
+    for row in range(rows):
+        for col in range(cols):
+            position = Position(-8.4 + col * spacing + rng.uniform(-0.2, 0.2) * spacing,
+                                41.55 + row * spacing + rng.uniform(-0.2, 0.2) * spacing)
+            graph.add_node(position, len(positions))
+            positions.append(position)
+
+    for row in range(rows):
+        for col in range(cols):
+            i = row * cols + col
+            if col + 1 < cols:
+                graph.add_edge(positions[i], positions[i + 1], closed == 0 or rng.random() >= closed)
+            if row + 1 < rows:
+                graph.add_edge(positions[i], positions[i + cols], closed == 0 or rng.random() >= closed)
+
+    return graph
+
+def geometric_graph(nodes, spacing=0.0005, radius=1.5, seed=0):
+    """
+    Builds a synthetic road network as a random geometric graph: nodes scattered uniformly over a
+    square, each one connected to every node closer to it than a given radius.
+
+    Unlike a grid, the degree of the nodes varies and the graph may have several components.
+
+    Args:
+        nodes (int): The number of nodes.
+        spacing (float, optional): The average distance between neighbouring nodes, as in grid_graph.
+                                   Defaults to 0.0005.
+        radius (float, optional): The connection radius, as a multiple of the spacing. Defaults to
+                                  1.5, for about 7 neighbours per node.
+        seed (int, optional): The seed of the node positions. Defaults to 0.
+
+    Returns:
+        Graph: The geometric graph.
+    """
+    rng = random.Random(seed)
+    side = nodes ** 0.5 * spacing
+    radius *= spacing
+    graph = Graph()
+    positions = []
+    cells = {}  # (column, row) of a square of side radius -> indices of the nodes in it
+    for i in range(nodes):
+        position = Position(-8.4 + rng.uniform(0, side), 41.55 + rng.uniform(0, side))
+        graph.add_node(position, i)
+        positions.append(position)
+        cells.setdefault((int((position.x + 8.4) // radius), int((position.y - 41.55) // radius)), []).append(i)
+
+    for (column, row), members in cells.items():
+        for i in members:
+            a = positions[i]
+            for neighbour_cell in ((column + dc, row + dr) for dc in (-1, 0, 1) for dr in (-1, 0, 1)):
+                for j in cells.get(neighbour_cell, ()):
+                    b = positions[j]
+                    if i < j and (a.x - b.x) ** 2 + (a.y - b.y) ** 2 <= radius ** 2:
+                        graph.add_edge(a, b)
+
+    return graph
+
+def grid_size_for_edges(edges):
+    """
+    Returns the side of the square grid with approximately the given number of edges.
+
+    Args:
+        edges (int): The desired number of (undirected) edges.
+
+    Returns:
+        int: The number of rows and columns of the grid.
+    """
+    return max(2, int((edges / 2) ** 0.5))
+
+def sunny_weather(graph):
+    """
+    Returns a Weather object with every node of the graph set to SUNNY.
+
+    Args:
+        graph (Graph): The graph to build the weather for.
+
+    Returns:
+        Weather: The weather conditions.
+    """
+    return Weather(graph)
+
+def synthetic_state(graph, weather, start_position, end_position):
+    """
+    Builds a simulation state around a synthetic graph, with a single endpoint and a single
+    land vehicle with enough fuel to cross the whole graph.
+
+    The supply delivery functions change the state they run against, so a new state should be
+    built for every run.
+
+    Args:
+        graph (Graph or CompactGraph): The graph of the simulation.
+        weather (Weather): The weather conditions.
+        start_position (Position): The position of the start point.
+        end_position (Position): The position of the endpoint.
+
+    Returns:
+        State: The simulation state.
+    """
+    start_point = StartPoint(start_position, [Supply(100, SupplyType.Water)])
+    end_point = EndPoint(end_position, {"Water": 10}, 0)
+    vehicle_type = VehicleType("Camião", 0, float('inf'), 100, 100, 60)
+    vehicle = Vehicle(1, start_position, vehicle_type, float('inf'), 0, 0, VehicleStatus.IDLE)
+    return State(0, [vehicle], start_point, [end_point], graph, weather)
@@ -0,0 +1,99 @@
+import argparse
+import random
+import time
+
+from algorithms.uninformed.uniform_cost import ucs_supply_delivery
+from algorithms.vehicle_routing import dispatch_tours, plan_tours
+from benchmarks.bidirectional import random_blocked_routes, random_conditions
+from benchmarks.synthetic import grid_graph, sunny_weather
+from end_point import EndPoint
+from graph.compact_graph import CompactGraph
+from load_dataset import State
+from start_point import StartPoint
+from supply import Supply, SupplyType
+from vehicle import Vehicle, VehicleStatus, VehicleType
+
+def random_state(graph, weather, start, rng, end_points, vehicles, fuel=float('inf')):
+    """
+    Builds a simulation state with end points needing random supplies, and a fleet of trucks and
+    vans parked at the start point.
+
+    Args:
+        graph (CompactGraph): The graph of the simulation.
+        weather (Weather): The weather conditions.
+        start (int): The key of the start point.
+        rng (random.Random): The random number generator, seeded so every state built is the same.
+        end_points (int): The number of end points.
+        vehicles (int): The number of vehicles.
+        fuel (float, optional): The distance each vehicle can drive. Defaults to no limit.
+
+    Returns:
+        State: The simulation state.
+    """
+    start_position = graph.position_of(start)
+    start_point = StartPoint(start_position, [Supply(10000, supply_type) for supply_type in SupplyType])
+    points = [EndPoint(graph.position_of(key), {supply_type.name: rng.randint(0, 15) for supply_type in SupplyType},
+                       rng.randint(0, 3))
+              for key in rng.sample(range(len(graph)), end_points)]
+    types = (VehicleType("Camião", 0, float('inf'), 120, 120, 60), VehicleType("Carrinha", 0, float('inf'), 60, 60, 80))
+    fleet = [Vehicle(i, start_position, types[i % 2], fuel, 0, 0, VehicleStatus.IDLE) for i in range(vehicles)]
+    return State(0, fleet, start_point, points, graph, weather)
+
+def delivered(state):
+    """
+    Returns the number of end points whose needs are fully met, and the units of supplies still needed.
+    """
+    served = sum(1 for end_point in state.end_points if not end_point.get_supplies_needed())
+    return served, sum(sum(end_point.supplies_needed.values()) for end_point in state.end_points)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares planning multi-stop tours for every end point to sending "
+                                                 "the idle vehicles to one end point per run.")
+    parser.add_argument("--size", type=int, default=100, help="Side of the synthetic grid")
+    parser.add_argument("--end-points", type=int, nargs="+", default=[10, 30])
+    parser.add_argument("--vehicles", type=int, default=8)
+    parser.add_argument("--fuel", type=float, nargs="+", default=[float('inf'), 0.03],
+                        help="Distance each vehicle can drive (inf for no limit)")
+    parser.add_argument("--time-budget", type=float, default=1.0, help="Seconds of local search")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    graph = CompactGraph.from_graph(grid_graph(args.size, args.size, seed=args.seed))
+    weather = sunny_weather(graph)
+    random_conditions(graph, weather, rng, 0.2)
+    blocked_routes = random_blocked_routes(graph, rng, len(graph) // 50)
+    start = len(graph) // 2 + args.size // 2
+
+    print(f"== synthetic grid {args.size}x{args.size}, {args.vehicles} vehicles at the start point")
+    for count in args.end_points:
+        seed = rng.random()
+        for fuel in args.fuel:
+            # One end point per run, by priority, as the UI and the CLI do
+            state = random_state(graph, weather, start, random.Random(seed), count, args.vehicles, fuel)
+            begin = time.perf_counter()
+            loop_distance, vehicles_sent = 0, 0
+            for end_point in sorted(state.end_points, key=lambda end_point: -end_point.priority):
+                _, distance, _, supplies = ucs_supply_delivery(state, state.start_point, end_point, 0, weather,
+                                                               blocked_routes)
+                if isinstance(supplies, dict):
+                    used = sum(1 for delivered_supplies in supplies.values() if delivered_supplies)
+                    loop_distance += distance * used
+                    vehicles_sent += used
+            loop_time = time.perf_counter() - begin
+            loop_served, loop_left = delivered(state)
+
+            state = random_state(graph, weather, start, random.Random(seed), count, args.vehicles, fuel)
+            begin = time.perf_counter()
+            plan = plan_tours(state, 0, weather, blocked_routes, time_budget=args.time_budget)
+            dispatch_tours(state, plan)
+            tours_time = time.perf_counter() - begin
+            tours_served, tours_left = delivered(state)
+
+            print(f"{count:3} end points, fuel {fuel:6.3f} | one per run: {loop_served:3} served, "
+                  f"{loop_left:4} units left, {vehicles_sent:2} vehicles, {loop_distance:8.4f} distance, {loop_time * 1000:7.1f} ms"
+                  f" | tours: {tours_served:3} served, {tours_left:4} units left, {len(plan.tours):2} vehicles, "
+                  f"{plan.distance:8.4f} distance, {tours_time * 1000:7.1f} ms")
+
+if __name__ == '__main__':
+    main()
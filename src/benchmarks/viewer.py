@@ -0,0 +1,100 @@
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+from tkinter import Tk, TclError
+
+from benchmarks.synthetic import grid_graph, sunny_weather
+from benchmarks.vehicle_routing import random_state
+from graph.blocked_routes import BlockedRoutes
+from graph.compact_graph import CompactGraph
+from ui.graph_canvas import GraphCanvas
+from ui.scene import Scene, SpriteCache
+
+RENDERERS = ("vector", "raster")
+
+def resident_memory():
+    """
+    Returns the resident memory of the process, in MiB (Linux only).
+    """
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+
+def measure(renderer, size, seed, steps):
+    """
+    Draws a synthetic grid on a canvas, then zooms in and drags it.
+
+    Args:
+        renderer (str): "vector" to draw the graph as items, or "raster" to draw it on a base layer.
+        size (int): The side of the grid.
+        seed (int): The seed of the grid and of the simulation state.
+        steps (int): The number of zoom and drag steps.
+
+    Returns:
+        dict: The first paint time, memory and canvas items after it, and the mean time of each
+              zoom and drag step, in milliseconds and MiB.
+    """
+    root = Tk()
+    canvas = GraphCanvas(root, width=1200, height=600, bg="white")
+    canvas.pack()
+    root.update()
+    scene = Scene(canvas, SpriteCache(), lambda event, text: None, lambda event: None, raster=renderer == "raster")
+
+    graph = grid_graph(size, size, seed=seed)
+    weather = sunny_weather(graph)
+    state = random_state(CompactGraph.from_graph(graph), weather, 0, random.Random(seed), 5, 4)
+    memory = resident_memory()
+
+    start = time.perf_counter()
+    scene.update(graph, state.start_point, state.end_points, state.vehicles, weather, BlockedRoutes())
+    root.update()
+    first_paint = time.perf_counter() - start
+    result = {"renderer": renderer, "first_paint_ms": first_paint * 1000, "memory_mib": resident_memory() - memory,
+              "items": len(canvas.find_all())}
+
+    canvas.start_drag(SimpleNamespace(x=0, y=0))
+    for name, action in (("zoom_ms", lambda step: canvas.rescale(600, 300, 1.25)),
+                         ("drag_ms", lambda step: canvas.drag(SimpleNamespace(x=40 * step, y=20 * step)))):
+        start = time.perf_counter()
+        for step in range(1, steps + 1):
+            action(step)
+            root.update()
+        result[name] = (time.perf_counter() - start) * 1000 / steps
+    root.destroy()
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares drawing the graph as canvas items to drawing it on a "
+                                                 "raster base layer: first paint time, memory and items after it, "
+                                                 "and time per zoom and drag step. Needs a display.")
+    parser.add_argument("--size", type=int, default=100, help="Side of the synthetic grid")
+    parser.add_argument("--steps", type=int, default=10, help="Zoom and drag steps")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--renderer", choices=RENDERERS, help="Measure one renderer in this process")
+    args = parser.parse_args()
+
+    if args.renderer:
+        try:
+            print(json.dumps(measure(args.renderer, args.size, args.seed, args.steps)))
+        except TclError as error:
+            sys.exit(f"No display to draw on: {error}")
+        return
+
+    # Each renderer in its own process, so the memory of one is not counted in the other
+    print(f"{'renderer':10} {'first paint':>12} {'memory':>10} {'items':>8} {'zoom':>10} {'drag':>10}")
+    for renderer in RENDERERS:
+        process = subprocess.run([sys.executable, "-m", "benchmarks.viewer", "--renderer", renderer,
+                                  "--size", str(args.size), "--steps", str(args.steps), "--seed", str(args.seed)],
+                                 capture_output=True, text=True)
+        if process.returncode:
+            sys.exit(process.stderr.strip())
+        result = json.loads(process.stdout)
+        print(f"{renderer:10} {result['first_paint_ms']:9.1f} ms {result['memory_mib']:6.1f} MiB {result['items']:8} "
+              f"{result['zoom_ms']:7.1f} ms {result['drag_ms']:7.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+import argparse
+import json
+import sys
+from contextlib import redirect_stdout
+
+from algorithms.delivery import dispatch
+from algorithms.registry import DEFAULT_HEURISTIC, INFORMED_ROUTES, UNINFORMED_ROUTES, get_algorithm
+from algorithms.route_cache import RouteCache
+from algorithms.supplies_per_vehicles import vehicle_utilisation
+from graph.blocked_routes import BlockedRoutes
+from graph.position import Position
+from load_dataset import load_dataset
+from start_point import StartPoint
+from vehicle import VehicleStatus
+from weather import WeatherCondition
+
+def snap_position(state, coordinates):
+    """
+    Returns the position of the node nearest to some coordinates, as load_dataset does for the points
+    of the dataset, so they can be given as in the dataset instead of as the node they snapped to.
+
+    :param state: Simulation state
+    :param coordinates: [x, y] coordinates
+    :return: The Position of the nearest node, or of the coordinates if the state has no node index
+    """
+    position = Position(*coordinates)
+    if state.node_index is None:
+        return position
+    return state.node_index.nearest(position) or position
+
+def resolve_end_point(state, end_point):
+    """
+    Finds the end point a query refers to.
+
+    :param state: Simulation state
+    :param end_point: Index of the end point in the dataset, or its [x, y] position
+    :return: The EndPoint
+    :raises ValueError: If there is no such end point
+    """
+    if isinstance(end_point, int):
+        if not 0 <= end_point < len(state.end_points):
+            raise ValueError(f"There is no end point {end_point}.")
+        return state.end_points[end_point]
+
+    position = snap_position(state, end_point)
+    for candidate in state.end_points:
+        if candidate.position == position:
+            return candidate
+    raise ValueError(f"There is no end point at {position}.")
+
+def reposition_vehicles(state):
+    """
+    Moves every vehicle back to the start point and marks it as idle and empty.
+
+    :param state: Simulation state
+    """
+    for vehicle in state.vehicles:
+        vehicle.position = state.start_point.position
+        vehicle.vehicle_status = VehicleStatus.IDLE
+        vehicle.current_weight = 0
+        vehicle.current_volume = 0
+
+def run_query(state, query, blocked_routes, route_cache=None):
+    """
+    Runs one routing query against the simulation state.
+
+    A query is a dictionary with the keys:
+        - "algorithm": name of the algorithm (required, e.g. "a_star")
+        - "heuristic": name of the heuristic, for the informed algorithms (default "manhattan_heuristic")
+        - "end_point": index of the end point in the dataset, or its [x, y] position, snapped to the
+          nearest node (default 0)
+        - "start": [x, y] position of the start point, snapped to the nearest node (default the one of
+          the dataset)
+        - "terrain": terrain of the vehicles (default 0)
+        - "blocked_routes": routes to block before the query, as "node1,node2" strings or ID pairs
+        - "unblocked_routes": routes to unblock before the query
+        - "weather": {node ID: condition name} changes to apply before the query
+        - "id": any value, copied to the result
+
+    Besides the path, distance, time and supplies of each vehicle, the result holds the fractions
+    of the weight and volume capacity in use by each vehicle that was loaded ("utilisation").
+
+    Blocked routes and weather changes persist for the following queries, and so do the
+    deliveries, as they would in the Viewer.
+
+    :param state: Simulation state
+    :param query: Query dictionary
+    :param blocked_routes: BlockedRoutes shared by all the queries
+    :param route_cache: RouteCache the routes are looked up in and stored, or None to always search
+    :return: Result dictionary
+    :raises ValueError: If the query refers to a node or end point that does not exist
+    """
+    function = get_algorithm(query["algorithm"], query.get("heuristic", DEFAULT_HEURISTIC))
+    end_point = resolve_end_point(state, query.get("end_point", 0))
+    start_point = state.start_point
+    if "start" in query:
+        start_point = StartPoint(snap_position(state, query["start"]), state.start_point.supplies)
+
+    # The weather changes are checked before any change is made, so an invalid query leaves the
+    # conditions as they were instead of applying part of them
+    weather_changes = [(int(node_id), WeatherCondition[condition])
+                       for node_id, condition in query.get("weather", {}).items()]
+    for node_id, _ in weather_changes:
+        if not 0 <= node_id < len(state.weather.codes):
+            raise ValueError(f"There is no node {node_id}.")
+
+    unblocked_routes = list(query.get("unblocked_routes", ()))
+    for route in unblocked_routes:
+        blocked_routes.discard(route)
+    if unblocked_routes and route_cache is not None:
+        route_cache.invalidate_routes(unblocked_routes, state.weather, blocked_routes, unblocked=True)
+
+    new_blocked_routes = list(query.get("blocked_routes", ()))
+    for route in new_blocked_routes:
+        blocked_routes.add(route)
+    if new_blocked_routes and route_cache is not None:
+        route_cache.invalidate_routes(new_blocked_routes, state.weather, blocked_routes)
+
+    node_ids, previous = [], []
+    for node_id, condition in weather_changes:
+        node_ids.append(node_id)
+        previous.append(state.weather.node_condition(node_id))
+        state.weather.set_node_condition(node_id, condition)
+    if node_ids and route_cache is not None:
+        route_cache.invalidate_nodes(node_ids, state.weather, blocked_routes, previous)
+
+    algorithm, terrain = query["algorithm"], query.get("terrain", 0)
+    # The algorithms print their progress, which must not end up mixed with the results
+    with redirect_stdout(sys.stderr):
+        if route_cache is not None and (algorithm in UNINFORMED_ROUTES or algorithm in INFORMED_ROUTES):
+            route = route_cache.find_route(state, start_point, end_point, algorithm,
+                                           query.get("heuristic", DEFAULT_HEURISTIC), terrain, state.weather,
+                                           blocked_routes)
+            path, total_distance, total_time, supplies = dispatch(state, start_point, end_point, route, terrain)
+        else:
+            path, total_distance, total_time, supplies = function(
+                state, start_point, end_point, terrain, state.weather, blocked_routes
+            )
+    result = {
+        "path": [[position.x, position.y] for position in path] if path else None,
+        "distance": total_distance,
+        "time": total_time,
+    }
+    if isinstance(supplies, dict):
+        result["supplies"] = supplies
+        loaded = [vehicle for vehicle in state.vehicles if supplies.get(vehicle.id)]
+        result["utilisation"] = {vehicle_id: list(fractions)
+                                 for vehicle_id, fractions in vehicle_utilisation(loaded).items()}
+    elif supplies is not None:
+        result["message"] = supplies
+    return result
+
+def run_queries(state, lines, output, reposition=False):
+    """
+    Answers a stream of JSONL queries, writing one JSONL result per query as soon as it is ready.
+
+    Invalid queries produce a result with an "error" key instead of stopping the batch. The routes
+    found are cached, so repeated queries do not search again unless the conditions changed.
+
+    :param state: Simulation state
+    :param lines: Iterable of JSON lines, one query each (blank lines are skipped)
+    :param output: Writable text stream
+    :param reposition: Whether to move every vehicle back to the start point before each query
+    :return: Number of queries answered
+    """
+    blocked_routes = BlockedRoutes()
+    route_cache = RouteCache()
+    answered = 0
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+
+        query_id = None
+        try:
+            query = json.loads(line)
+            query_id = query.get("id", number)
+            if reposition:
+                reposition_vehicles(state)
+            result = run_query(state, query, blocked_routes, route_cache)
+        except (ValueError, KeyError, TypeError, AttributeError) as error:
+            result = {"error": f"{type(error).__name__}: {error}"}
+
+        output.write(json.dumps({"id": query_id if query_id is not None else number, **result}) + "\n")
+        output.flush()
+        answered += 1
+    return answered
+
+def main():
+    parser = argparse.ArgumentParser(description="Answers supply delivery queries read as JSONL, without a UI.")
+    parser.add_argument("--dataset", default="data/dataset1.json", help="Dataset to load (default data/dataset1.json)")
+    parser.add_argument("--input", help="File with one JSON query per line (default standard input)")
+    parser.add_argument("--output", help="File to write one JSON result per line to (default standard output)")
+    parser.add_argument("--reposition", action="store_true",
+                        help="Move every vehicle back to the start point before each query")
+    args = parser.parse_args()
+
+    state = load_dataset(args.dataset)
+    input_file = open(args.input) if args.input else sys.stdin
+    output_file = open(args.output, "w") if args.output else sys.stdout
+    try:
+        run_queries(state, input_file, output_file, args.reposition)
+    finally:
+        if args.input:
+            input_file.close()
+        if args.output:
+            output_file.close()
+
+if __name__ == '__main__':
+    main()
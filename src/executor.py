@@ -0,0 +1,217 @@
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from algorithms.delivery import dispatch
+from algorithms.distance_matrix import matrix_row
+from algorithms.registry import DEFAULT_HEURISTIC, find_route
+from graph.blocked_routes import BlockedRoutes
+from graph.compact_graph import CompactGraph
+from graph.contraction_hierarchy import load_contraction_hierarchy
+from load_dataset import State
+from weather import Weather
+
+GRAPH_ARRAYS = ("ids", "xs", "ys", "offsets", "targets", "open_mask", "terrain_mask")
+
+# Graph and weather of a worker process, attached to the shared memory by _attach
+_worker = {}
+
+class _AttachedMemory(shared_memory.SharedMemory):
+    """
+    A block of shared memory attached to by a worker process.
+
+    The arrays of the worker keep pointing into the block until the process ends, so it is never
+    closed explicitly: closing it from the destructor, at interpreter shutdown, would only fail
+    because of those arrays. The block is unmapped when the process exits.
+    """
+    def __del__(self):
+        pass
+
+def _share(array):
+    """
+    Copies an array into a new block of shared memory.
+
+    :param array: NumPy array
+    :return: Tuple (SharedMemory, (block name, dtype, shape)) describing where the copy lives
+    """
+    memory = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    copy = np.ndarray(array.shape, dtype=array.dtype, buffer=memory.buf)
+    copy[...] = array
+    return memory, (memory.name, array.dtype.str, array.shape)
+
+def _attach(graph_specs, weather_spec):
+    """
+    Initializes a worker process: attaches to the shared arrays of the graph and the weather
+    without copying them.
+
+    :param graph_specs: Dictionary of array name -> (block name, dtype, shape)
+    :param weather_spec: (block name, dtype, shape) of the weather codes
+    """
+    memories = []
+    arrays = {}
+    for name, (block, dtype, shape) in graph_specs.items():
+        memory = _AttachedMemory(name=block)
+        memories.append(memory)
+        arrays[name] = np.ndarray(shape, dtype=dtype, buffer=memory.buf)
+
+    block, _, shape = weather_spec
+    memory = _AttachedMemory(name=block)
+    memories.append(memory)
+
+    graph = CompactGraph(*(arrays[name] for name in GRAPH_ARRAYS))
+    _worker["memories"] = memories  # Keeps the blocks mapped while the worker lives
+    _worker["graph"] = graph
+    _worker["weather"] = Weather.from_codes(graph, memory.buf[:shape[0]])
+
+def _find_routes(payload):
+    """
+    Runs a chunk of searches in a worker process.
+
+    :param payload: Tuple (vehicles, start point, end points, blocked route pairs, tasks), where each
+                    task is a tuple (end point index, algorithm, heuristic, terrain)
+    :return: List with the Route found (or None) for each task
+    """
+    vehicles, start_point, end_points, blocked_routes, tasks = payload
+    graph, weather = _worker["graph"], _worker["weather"]
+    state = State(0, vehicles, start_point, end_points, graph, weather)
+    blocked_routes = BlockedRoutes(blocked_routes)
+
+    return [find_route(state, start_point, end_points[end_point_index], algorithm, heuristic, terrain, weather,
+                       blocked_routes)
+            for end_point_index, algorithm, heuristic, terrain in tasks]
+
+def _matrix_rows(payload):
+    """
+    Computes a chunk of rows of a distance matrix in a worker process.
+
+    :param payload: Tuple (positions of the points, blocked route pairs, terrain, indices of the rows)
+    :return: List with the result of matrix_row for each row
+    """
+    positions, blocked_routes, terrain, rows = payload
+    graph, weather = _worker["graph"], _worker["weather"]
+    keys = [graph.key_of(position) for position in positions]
+    blocked_routes = BlockedRoutes(blocked_routes)
+    return [matrix_row(graph, weather, keys[i], keys, terrain, blocked_routes) for i in rows]
+
+class RoutingExecutor:
+    """
+    Runs the searches of many supply delivery queries in parallel, in a pool of worker processes.
+
+    The graph is converted into a CompactGraph whose arrays, along with the weather codes, are
+    placed in shared memory once; the workers map them instead of receiving a copy of the graph,
+    so starting a worker and sending it a query are cheap, whatever the size of the road network.
+
+    Workers only search, which never changes the state. The deliveries (vehicles leaving, supplies
+    moving from the start point to the end points) are then applied by the parent process, in the
+    order the queries were given, so the outcome does not depend on which worker finishes first.
+    Every search of a batch sees the vehicles, supplies, weather and blocked routes as they were
+    when the batch started.
+
+    A query is a dictionary with the keys "end_point" (index of the end point, required),
+    "algorithm" (required), "heuristic" (default "manhattan_heuristic") and "terrain" (default 0),
+    as in the CLI.
+
+    The executor must be closed (or used in a with statement) to free the shared memory.
+    """
+    def __init__(self, state, processes=None, chunk_size=8, context=None):
+        """
+        Starts the worker processes.
+
+        :param state: Simulation state whose graph and weather the workers use
+        :param processes: Number of worker processes (default: number of CPUs)
+        :param chunk_size: Number of queries sent to a worker at a time
+        :param context: multiprocessing context used to start the workers (default: the platform's)
+        """
+        self.state = state
+        self.graph = state.graph if isinstance(state.graph, CompactGraph) else CompactGraph.from_graph(state.graph)
+        self.processes = processes or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+
+        self._memories = []
+        graph_specs = {}
+        for name in GRAPH_ARRAYS:
+            memory, graph_specs[name] = _share(getattr(self.graph, name))
+            self._memories.append(memory)
+        memory, weather_spec = _share(state.weather.codes)
+        self._memories.append(memory)
+        self._weather_codes = np.ndarray(state.weather.codes.shape, dtype=np.uint8, buffer=memory.buf)
+
+        context = context or multiprocessing.get_context()
+        self._pool = context.Pool(self.processes, initializer=_attach, initargs=(graph_specs, weather_spec))
+
+    def find_routes(self, queries, blocked_routes=()):
+        """
+        Searches the route of every query, without delivering anything.
+
+        :param queries: List of query dictionaries
+        :param blocked_routes: BlockedRoutes (or set of "node1,node2" strings) that cannot be used
+        :return: List with the Route found (or None) for each query, in the order of the queries
+        :raises ValueError: If a query refers to an unknown end point, algorithm or heuristic
+        """
+        tasks = []
+        for query in queries:
+            end_point = query["end_point"]
+            if not 0 <= end_point < len(self.state.end_points):
+                raise ValueError(f"There is no end point {end_point}.")
+            tasks.append((end_point, query["algorithm"], query.get("heuristic", DEFAULT_HEURISTIC), query.get("terrain", 0)))
+
+        # Built once by the parent, so the workers load it from disk instead of each building it
+        if any(task[1] == "ch" for task in tasks):
+            load_contraction_hierarchy(self.graph)
+
+        self._weather_codes[:] = self.state.weather.codes
+        blocked_routes = list(BlockedRoutes.coerce(blocked_routes))
+        snapshot = (self.state.vehicles, self.state.start_point, self.state.end_points, blocked_routes)
+        payloads = [snapshot + (tasks[i:i + self.chunk_size],) for i in range(0, len(tasks), self.chunk_size)]
+
+        return [route for chunk in self._pool.map(_find_routes, payloads) for route in chunk]
+
+    def matrix_rows(self, positions, rows, terrain=0, blocked_routes=()):
+        """
+        Computes rows of a distance matrix (see algorithms/distance_matrix.py), one search per row.
+
+        :param positions: Positions of the points of the matrix, every one of them a node of the graph
+        :param rows: Indices of the points whose rows are computed
+        :param terrain: Type of terrain being traversed
+        :param blocked_routes: BlockedRoutes (or set of "node1,node2" strings) that cannot be used
+        :return: List with the result of matrix_row for each row, in the order of the rows
+        """
+        self._weather_codes[:] = self.state.weather.codes
+        snapshot = (list(positions), list(BlockedRoutes.coerce(blocked_routes)), terrain)
+        rows = list(rows)
+        payloads = [snapshot + (rows[i:i + self.chunk_size],) for i in range(0, len(rows), self.chunk_size)]
+
+        return [row for chunk in self._pool.map(_matrix_rows, payloads) for row in chunk]
+
+    def run(self, queries, blocked_routes=()):
+        """
+        Answers every query: searches the paths in parallel, then delivers the supplies of each query
+        in order.
+
+        :param queries: List of query dictionaries
+        :param blocked_routes: BlockedRoutes (or set of "node1,node2" strings) that cannot be used
+        :return: List with the result of the supply delivery function for each query
+        """
+        return [dispatch(self.state, self.state.start_point, self.state.end_points[query["end_point"]], route,
+                         query.get("terrain", 0))
+                for query, route in zip(queries, self.find_routes(queries, blocked_routes))]
+
+    def close(self):
+        """
+        Stops the worker processes and frees the shared memory.
+        """
+        self._pool.close()
+        self._pool.join()
+        del self._weather_codes
+        for memory in self._memories:
+            memory.close()
+            memory.unlink()
+        self._memories = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
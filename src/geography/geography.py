@@ -1,28 +1,80 @@
+import numpy as np
+
+from geography.map_cache import load_map_arrays, save_map_arrays
 from graph.graph import Graph
 from graph.position import Position
-import osmnx as ox
 
-def load_map_data_to_graph(geography):
+def load_map_data_to_graph(geography, network_type="drive", use_cache=True):
     """
     Loads map data from a given geographical location and converts it into a graph representation.
 
+    The converted road network is cached on disk, so only the first load of a geography goes
+    through OSMnx; later loads (including simulation restarts) only read the cached arrays.
+
     Args:
         geography (str): The geographical location to load the map data for.
+        network_type (str, optional): The OSMnx network type. Defaults to "drive".
+        use_cache (bool, optional): Whether to read and write the on-disk cache. Defaults to True.
 
     Returns:
         Graph: A graph object containing nodes and edges representing the road network of the given geography.
     """
-    G = ox.graph_from_place(geography, network_type="drive")
+    arrays = load_map_arrays(geography, network_type) if use_cache else None
+    if arrays is None:
+        arrays = download_map_arrays(geography, network_type)
+        if use_cache:
+            save_map_arrays(geography, network_type, arrays)
 
-    graph = Graph()
-    id = 0
+    return graph_from_arrays(arrays)
+
+def download_map_arrays(geography, network_type="drive"):
+    """
+    Downloads the road network of a geographical location with OSMnx and converts it into arrays.
+
+    Args:
+        geography (str): The geographical location to load the map data for.
+        network_type (str, optional): The OSMnx network type. Defaults to "drive".
+
+    Returns:
+        dict: The "xs" and "ys" coordinates of the nodes, and the "sources" and "targets" node
+              indices of the edges.
+    """
+    import osmnx as ox
+
+    G = ox.graph_from_place(geography, network_type=network_type)
+
+    index = {}
+    xs, ys = [], []
     for node, data in G.nodes(data=True):
-        position = Position(data['x'], data['y'])
-        graph.add_node(position, id)
-        id += 1
+        index[node] = len(xs)
+        xs.append(data['x'])
+        ys.append(data['y'])
+
+    sources, targets = [], []
     for u, v in G.edges():
-        pos1 = Position(G.nodes[u]['x'], G.nodes[u]['y'])
-        pos2 = Position(G.nodes[v]['x'], G.nodes[v]['y'])
-        graph.add_edge(pos1, pos2)
+        sources.append(index[u])
+        targets.append(index[v])
+
+    return {"xs": xs, "ys": ys, "sources": sources, "targets": targets}
+
+def graph_from_arrays(arrays):
+    """
+    Builds a graph from the arrays of a road network.
+
+    Args:
+        arrays (dict): The "xs", "ys", "sources" and "targets" arrays of the road network.
+
+    Returns:
+        Graph: The graph of the road network, with node IDs following the order of the arrays.
+    """
+    xs, ys, sources, targets = (np.asarray(arrays[name]).tolist() for name in ("xs", "ys", "sources", "targets"))
+    positions = [Position(x, y) for x, y in zip(xs, ys)]
+
+    graph = Graph()
+    for id, position in enumerate(positions):
+        graph.add_node(position, id)
+
+    for u, v in zip(sources, targets):
+        graph.add_edge(positions[u], positions[v])
 
-    return graph
\ No newline at end of file
+    return graph
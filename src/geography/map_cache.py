@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+import shutil
+import sys
+from os import path
+
+import numpy as np
+
+CACHE_VERSION = 1
+CACHE_DIRECTORY = os.environ.get(
+    "IA_CACHE_DIR", path.join(path.dirname(__file__), "..", "..", "cache", "graphs")
+)
+ARRAY_NAMES = ("xs", "ys", "sources", "targets")
+
+def cache_key(geography, network_type):
+    """
+    Returns the key of the cache entry of a road network.
+
+    The key is a hash of the geography, the network type and the version of the cache format,
+    so entries written by an older format are never read back.
+
+    Args:
+        geography (str): The geographical location of the road network.
+        network_type (str): The OSMnx network type (e.g. "drive").
+
+    Returns:
+        str: The hexadecimal key of the entry.
+    """
+    content = json.dumps([CACHE_VERSION, geography, network_type])
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+def cache_entry_path(geography, network_type, directory=None):
+    """
+    Returns the directory where the arrays of a road network are cached.
+
+    Args:
+        geography (str): The geographical location of the road network.
+        network_type (str): The OSMnx network type.
+        directory (str, optional): The cache directory. Defaults to CACHE_DIRECTORY.
+
+    Returns:
+        str: The path of the cache entry.
+    """
+    return path.join(directory or CACHE_DIRECTORY, cache_key(geography, network_type))
+
+def save_map_arrays(geography, network_type, arrays, directory=None):
+    """
+    Stores the arrays of a road network in the cache.
+
+    The node coordinates are stored as float64 arrays and the edges as int32 arrays of node
+    indices, each in its own .npy file so they can be memory-mapped when loaded. The entry is
+    written to a temporary directory first and then renamed, so a partially written entry is
+    never read.
+
+    Args:
+        geography (str): The geographical location of the road network.
+        network_type (str): The OSMnx network type.
+        arrays (dict): The "xs", "ys", "sources" and "targets" arrays of the network.
+        directory (str, optional): The cache directory. Defaults to CACHE_DIRECTORY.
+    """
+    entry_path = cache_entry_path(geography, network_type, directory)
+    temporary_path = f"{entry_path}.tmp-{os.getpid()}"
+    os.makedirs(temporary_path, exist_ok=True)
+
+    np.save(path.join(temporary_path, "xs.npy"), np.asarray(arrays["xs"], dtype=np.float64))
+    np.save(path.join(temporary_path, "ys.npy"), np.asarray(arrays["ys"], dtype=np.float64))
+    np.save(path.join(temporary_path, "sources.npy"), np.asarray(arrays["sources"], dtype=np.int32))
+    np.save(path.join(temporary_path, "targets.npy"), np.asarray(arrays["targets"], dtype=np.int32))
+    with open(path.join(temporary_path, "metadata.json"), "w") as file:
+        json.dump({
+            "version": CACHE_VERSION,
+            "geography": geography,
+            "network_type": network_type,
+            "nodes": len(arrays["xs"]),
+            "edges": len(arrays["sources"]),
+        }, file)
+
+    if path.isdir(entry_path):
+        shutil.rmtree(entry_path)
+    os.replace(temporary_path, entry_path)
+
+def load_map_arrays(geography, network_type, directory=None):
+    """
+    Loads the cached arrays of a road network.
+
+    Args:
+        geography (str): The geographical location of the road network.
+        network_type (str): The OSMnx network type.
+        directory (str, optional): The cache directory. Defaults to CACHE_DIRECTORY.
+
+    Returns:
+        dict: The memory-mapped "xs", "ys", "sources" and "targets" arrays, or None if the road
+              network is not cached or its entry is unreadable.
+    """
+    entry_path = cache_entry_path(geography, network_type, directory)
+    try:
+        with open(path.join(entry_path, "metadata.json")) as file:
+            metadata = json.load(file)
+        arrays = {name: np.load(path.join(entry_path, f"{name}.npy"), mmap_mode="r") for name in ARRAY_NAMES}
+    except (OSError, ValueError):
+        return None
+
+    if (metadata.get("version") != CACHE_VERSION
+            or len(arrays["xs"]) != metadata["nodes"] or len(arrays["ys"]) != metadata["nodes"]
+            or len(arrays["sources"]) != metadata["edges"] or len(arrays["targets"]) != metadata["edges"]):
+        return None
+    return arrays
+
+def invalidate_map_cache(geography=None, network_type="drive", directory=None):
+    """
+    Removes road networks from the cache, so they are downloaded again the next time they are loaded.
+
+    Args:
+        geography (str, optional): The geographical location to remove. If None, every cached
+                                   road network is removed.
+        network_type (str, optional): The OSMnx network type. Defaults to "drive".
+        directory (str, optional): The cache directory. Defaults to CACHE_DIRECTORY.
+
+    Returns:
+        int: The number of entries removed.
+    """
+    directory = directory or CACHE_DIRECTORY
+    if geography is not None:
+        entry_paths = [cache_entry_path(geography, network_type, directory)]
+    elif path.isdir(directory):
+        entry_paths = [path.join(directory, name) for name in os.listdir(directory)]
+    else:
+        entry_paths = []
+
+    removed = 0
+    for entry_path in entry_paths:
+        if path.isdir(entry_path):
+            shutil.rmtree(entry_path)
+            removed += 1
+    return removed
+
+if __name__ == '__main__':
+    # Usage: python -m geography.map_cache [geography] [network_type]
+    removed = invalidate_map_cache(*sys.argv[1:3])
+    print(f"Removed {removed} cached road network(s).")
@@ -0,0 +1,130 @@
+class BlockedRoutes:
+    """
+    A set of blocked routes, each one connecting two nodes identified by their IDs.
+
+    Routes are undirected, so blocking "1,2" also blocks "2,1". Internally each blocked route is
+    stored under both of its node IDs, so checking whether an edge is blocked takes two dictionary
+    lookups on integers and allocates nothing, which matters since every search checks it for
+    every edge it relaxes.
+
+    Routes can be given in the "node1,node2" format used by the UI, or as pairs of node IDs.
+
+    Attributes:
+        version (int): Number increased every time a route is blocked or unblocked, so caches
+                       can tell whether the routes changed since they last looked at them.
+    """
+    def __init__(self, routes=()):
+        """
+        Initializes the set of blocked routes.
+
+        Args:
+            routes (iterable, optional): Routes to block, as "node1,node2" strings or ID pairs.
+        """
+        self._blocked = {}  # Node ID -> set of IDs of the nodes it has a blocked route to
+        self._routes = set()  # Canonical (min_id, max_id) pairs
+        self.version = 0
+        for route in routes:
+            self.add(route)
+
+    @staticmethod
+    def parse(route):
+        """
+        Converts a route into its canonical (min_id, max_id) pair.
+
+        Args:
+            route (str or tuple): The route, as a "node1,node2" string or a pair of node IDs.
+
+        Returns:
+            tuple: The IDs of both nodes of the route, smallest first.
+
+        Raises:
+            ValueError: If the route is not in the "node1,node2" format.
+        """
+        if isinstance(route, str):
+            parts = route.split(",")
+            if len(parts) != 2:
+                raise ValueError(f"Invalid route '{route}'. Please use 'node1,node2'.")
+            a, b = int(parts[0]), int(parts[1])
+        else:
+            a, b = route
+        return (a, b) if a <= b else (b, a)
+
+    @classmethod
+    def coerce(cls, blocked_routes):
+        """
+        Returns the given blocked routes as a BlockedRoutes object.
+
+        Args:
+            blocked_routes (BlockedRoutes or iterable): The blocked routes, possibly a set of
+                                                        "node1,node2" strings.
+
+        Returns:
+            BlockedRoutes: The same object if it already is one, otherwise a new one.
+        """
+        if isinstance(blocked_routes, cls):
+            return blocked_routes
+        return cls(blocked_routes or ())
+
+    def add(self, route):
+        """
+        Blocks a route.
+
+        Args:
+            route (str or tuple): The route, as a "node1,node2" string or a pair of node IDs.
+        """
+        a, b = self.parse(route)
+        self._routes.add((a, b))
+        self._blocked.setdefault(a, set()).add(b)
+        self._blocked.setdefault(b, set()).add(a)
+        self.version += 1
+
+    def discard(self, route):
+        """
+        Unblocks a route, if it is blocked.
+
+        Args:
+            route (str or tuple): The route, as a "node1,node2" string or a pair of node IDs.
+        """
+        a, b = self.parse(route)
+        if (a, b) in self._routes:
+            self._routes.discard((a, b))
+            self._blocked[a].discard(b)
+            self._blocked[b].discard(a)
+            self.version += 1
+
+    def clear(self):
+        """
+        Unblocks every route.
+        """
+        self._blocked.clear()
+        self._routes.clear()
+        self.version += 1
+
+    def is_blocked(self, a, b):
+        """
+        Checks whether the route between two nodes is blocked.
+
+        Args:
+            a (int): The ID of one of the nodes.
+            b (int): The ID of the other node.
+
+        Returns:
+            bool: True if the route is blocked, otherwise False.
+        """
+        blocked = self._blocked.get(a)
+        return blocked is not None and b in blocked
+
+    def __contains__(self, route):
+        try:
+            return self.parse(route) in self._routes
+        except (TypeError, ValueError):
+            return False
+
+    def __iter__(self):
+        return iter(sorted(self._routes))
+
+    def __len__(self):
+        return len(self._routes)
+
+    def __str__(self):
+        return "{" + ", ".join(f"'{a},{b}'" for a, b in self) + "}"
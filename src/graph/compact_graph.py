@@ -0,0 +1,275 @@
+import numpy as np
+
+from graph.position import Position
+from weather import DISTANCE_FACTORS, STORM_CODE
+
+class CompactGraph:
+    """
+    A frozen, array-backed representation of a graph.
+
+    Nodes are referred to by their index in the arrays, and edges are stored in compressed sparse
+    row (CSR) form: the edges leaving node i are the entries offsets[i] to offsets[i + 1] of the
+    targets array. Since the graph never changes after being built, this form takes a fraction of
+    the memory of the object graph and lets searches walk plain integer arrays instead of pointers.
+
+    Attributes:
+        ids (numpy.ndarray): int32 array with the ID each node had in the original graph.
+        xs (numpy.ndarray): float64 array with the x-coordinate of each node.
+        ys (numpy.ndarray): float64 array with the y-coordinate of each node.
+        offsets (numpy.ndarray): int32 array of size n + 1 delimiting the edges of each node.
+        targets (numpy.ndarray): int32 array with the index of the node each edge leads to.
+        open_mask (numpy.ndarray): Packed bitmask (little-endian bit order) of the open edges.
+        terrain_mask (numpy.ndarray): uint8 bitmask of the terrains each node can be accessed from.
+        order (numpy.ndarray): int32 array with the node indices sorted by (x, y), used to look up
+            positions without keeping a dictionary of Position objects.
+    """
+    def __init__(self, ids, xs, ys, offsets, targets, open_mask, terrain_mask):
+        """
+        Initializes a compact graph from its arrays.
+
+        Args:
+            ids (numpy.ndarray): The IDs of the nodes.
+            xs (numpy.ndarray): The x-coordinates of the nodes.
+            ys (numpy.ndarray): The y-coordinates of the nodes.
+            offsets (numpy.ndarray): The CSR offsets of the edges of each node.
+            targets (numpy.ndarray): The node each edge leads to.
+            open_mask (numpy.ndarray): The packed bitmask of open edges.
+            terrain_mask (numpy.ndarray): The bitmask of accessible terrains per node.
+        """
+        self.ids = np.asarray(ids, dtype=np.int32)
+        self.xs = np.asarray(xs, dtype=np.float64)
+        self.ys = np.asarray(ys, dtype=np.float64)
+        self.offsets = np.asarray(offsets, dtype=np.int32)
+        self.targets = np.asarray(targets, dtype=np.int32)
+        self.open_mask = np.asarray(open_mask, dtype=np.uint8)
+        self.terrain_mask = np.asarray(terrain_mask, dtype=np.uint8)
+        self.order = np.lexsort((self.ys, self.xs)).astype(np.int32)
+        self._sorted_xs = self.xs[self.order]
+
+        for array in (self.ids, self.xs, self.ys, self.offsets, self.targets, self.open_mask, self.terrain_mask):
+            array.flags.writeable = False
+
+        # Indexing a memoryview yields plain Python numbers, which is much faster than indexing
+        # the NumPy arrays one element at a time in the search loops.
+        self._ids = memoryview(self.ids)
+        self._xs = memoryview(self.xs)
+        self._ys = memoryview(self.ys)
+        self._offsets = memoryview(self.offsets)
+        self._targets = memoryview(self.targets)
+        self._open_mask = memoryview(self.open_mask)
+        self._terrain_mask = memoryview(self.terrain_mask)
+
+    @classmethod
+    def from_graph(cls, graph):
+        """
+        Builds the compact form of an object graph.
+
+        Args:
+            graph (Graph): The graph to convert.
+
+        Returns:
+            CompactGraph: A compact graph with the same nodes and edges, in the same order.
+        """
+        nodes = list(graph.nodes.values())
+        index = {node.position: i for i, node in enumerate(nodes)}
+        edge_count = sum(len(node.neighbours) for node in nodes)
+
+        offsets = np.zeros(len(nodes) + 1, dtype=np.int32)
+        offsets[1:] = np.cumsum([len(node.neighbours) for node in nodes])
+        targets = np.fromiter(
+            (index[neighbour.position] for node in nodes for neighbour, _ in node.neighbours),
+            dtype=np.int32, count=edge_count
+        )
+        open_edges = np.fromiter(
+            (open for node in nodes for _, open in node.neighbours),
+            dtype=bool, count=edge_count
+        )
+
+        return cls(
+            np.fromiter((node.id for node in nodes), dtype=np.int32, count=len(nodes)),
+            np.fromiter((node.position.x for node in nodes), dtype=np.float64, count=len(nodes)),
+            np.fromiter((node.position.y for node in nodes), dtype=np.float64, count=len(nodes)),
+            offsets,
+            targets,
+            np.packbits(open_edges, bitorder='little'),
+            np.fromiter((sum(1 << t for t in node.accessible_terrains) for node in nodes), dtype=np.uint8, count=len(nodes))
+        )
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def edge_count(self):
+        """
+        int: The number of directed edges stored in the graph.
+        """
+        return len(self.targets)
+
+    @property
+    def nbytes(self):
+        """
+        int: The number of bytes taken by the arrays of the graph.
+        """
+        return sum(array.nbytes for array in (self.ids, self.xs, self.ys, self.offsets, self.targets,
+                                              self.open_mask, self.terrain_mask, self.order, self._sorted_xs))
+
+    def is_open(self, edge):
+        """
+        Checks whether an edge is open.
+
+        Args:
+            edge (int): The index of the edge in the targets array.
+
+        Returns:
+            bool: True if the edge is open, otherwise False.
+        """
+        return bool((self._open_mask[edge >> 3] >> (edge & 7)) & 1)
+
+    def key_of(self, position):
+        """
+        Returns the index of the node at a given position.
+
+        Args:
+            position (Position): The position of the node.
+
+        Returns:
+            int: The index of the node, or None if there is no node at that position.
+        """
+        start = np.searchsorted(self._sorted_xs, position.x, side='left')
+        end = np.searchsorted(self._sorted_xs, position.x, side='right')
+        for i in range(start, end):
+            index = int(self.order[i])
+            if self._ys[index] == position.y:
+                return index
+        return None
+
+    def position_of(self, key):
+        """
+        Returns the position of the node at a given index.
+
+        Args:
+            key (int): The index of the node.
+
+        Returns:
+            Position: The position of the node.
+        """
+        return Position(self._xs[key], self._ys[key])
+
+    def node_id(self, key):
+        """
+        Returns the ID the node at a given index had in the original graph.
+
+        Args:
+            key (int): The index of the node.
+
+        Returns:
+            int: The ID of the node.
+        """
+        return self._ids[key]
+
+    def coordinates(self):
+        """
+        Returns the IDs and coordinates of every node, as arrays.
+
+        Returns:
+            tuple: The int32 array of node IDs and the float64 arrays of x and y coordinates.
+        """
+        return self.ids, self.xs, self.ys
+
+    def edges(self, key):
+        """
+        Yields every edge of a node, regardless of terrain, weather or blocked routes.
+
+        Args:
+            key (int): The index of the node.
+
+        Yields:
+            tuple: The index of the neighbouring node and whether the edge is open.
+        """
+        if key is None:
+            return
+
+        for edge in range(self._offsets[key], self._offsets[key + 1]):
+            yield self._targets[edge], self.is_open(edge)
+
+    def successors(self, key, terrain, weather, blocked_routes):
+        """
+        Yields the nodes that can be reached directly from a node, along with the cost of each edge.
+
+        Follows the same rules as Graph.successors: the edge must be open and not blocked, and the
+        node it leads to must be accessible under the given terrain and weather.
+
+        Args:
+            key (int): The index of the node being expanded.
+            terrain (int): The type of terrain being traversed.
+            weather (Weather): The current weather conditions.
+            blocked_routes (BlockedRoutes): The routes that cannot be used.
+
+        Yields:
+            tuple: The index of the neighbouring node and the cost of reaching it.
+        """
+        if key is None:
+            return
+
+        ids, xs, ys = self._ids, self._xs, self._ys
+        targets, open_mask, terrain_mask = self._targets, self._open_mask, self._terrain_mask
+        codes = weather.code_bytes
+        x, y = xs[key], ys[key]
+        is_blocked = blocked_routes.is_blocked if blocked_routes else None
+
+        for edge in range(self._offsets[key], self._offsets[key + 1]):
+            if not (open_mask[edge >> 3] >> (edge & 7)) & 1:
+                continue
+            neighbour = targets[edge]
+            if not (terrain_mask[neighbour] >> terrain) & 1:
+                continue
+            code = codes[ids[neighbour]]
+            if code == STORM_CODE:
+                continue
+            if is_blocked is not None and is_blocked(ids[key], ids[neighbour]):
+                continue
+
+            distance = abs(x - xs[neighbour]) + abs(y - ys[neighbour])
+            yield neighbour, distance * DISTANCE_FACTORS[code]
+
+    def predecessors(self, key, terrain, weather, blocked_routes, source=None):
+        """
+        Yields the nodes from which a node can be reached directly, along with the cost of each edge.
+
+        Follows the same rules as Graph.predecessors.
+
+        Args:
+            key (int): The index of the node being expanded.
+            terrain (int): The type of terrain being traversed.
+            weather (Weather): The current weather conditions.
+            blocked_routes (BlockedRoutes): The routes that cannot be used.
+            source (int, optional): The index of the node the forward search starts from.
+
+        Yields:
+            tuple: The index of the neighbouring node and the cost of the edge leading from it.
+        """
+        if key is None:
+            return
+
+        ids, xs, ys = self._ids, self._xs, self._ys
+        targets, open_mask, terrain_mask = self._targets, self._open_mask, self._terrain_mask
+        codes = weather.code_bytes
+        code = codes[ids[key]]
+        if code == STORM_CODE or not (terrain_mask[key] >> terrain) & 1:
+            return
+
+        factor = DISTANCE_FACTORS[code]
+        x, y = xs[key], ys[key]
+        is_blocked = blocked_routes.is_blocked if blocked_routes else None
+
+        for edge in range(self._offsets[key], self._offsets[key + 1]):
+            if not (open_mask[edge >> 3] >> (edge & 7)) & 1:
+                continue
+            neighbour = targets[edge]
+            if neighbour != source and (codes[ids[neighbour]] == STORM_CODE or not (terrain_mask[neighbour] >> terrain) & 1):
+                continue
+            if is_blocked is not None and is_blocked(ids[key], ids[neighbour]):
+                continue
+
+            distance = abs(x - xs[neighbour]) + abs(y - ys[neighbour])
+            yield neighbour, distance * factor
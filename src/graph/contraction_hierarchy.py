@@ -0,0 +1,385 @@
+import hashlib
+import heapq
+import os
+from os import path
+
+import numpy as np
+
+from graph.compact_graph import CompactGraph
+from weather import WeatherCondition
+
+HIERARCHY_VERSION = 1
+HIERARCHY_DIRECTORY = os.environ.get(
+    "IA_HIERARCHY_DIR", path.join(path.dirname(__file__), "..", "..", "cache", "hierarchies")
+)
+SUNNY_CODE = WeatherCondition.SUNNY.value
+
+# Witness searches stop after settling this many nodes. Stopping early only adds shortcuts that
+# may not be needed, it never loses a shortest path.
+WITNESS_SETTLE_LIMIT = 60
+
+class ContractionHierarchy:
+    """
+    A Contraction Hierarchies index of a road network, answering shortest path queries by only
+    searching upwards in a precomputed node order.
+
+    The hierarchy is built once per graph on its base metric: every open edge costs the Manhattan
+    distance it covers, as it does when every node is SUNNY. Nodes are contracted one at a time,
+    in order of importance, adding a shortcut between two of their neighbours whenever the
+    contracted node was on the only shortest path between them. A query then runs two small
+    Dijkstra searches, from the start and from the goal, that only follow edges leading to more
+    important nodes, and unpacks the shortcuts of the best meeting path.
+
+    Weather and blocked routes only ever make a route longer or unusable, so the base distance is
+    a lower bound of the real one. When the path found crosses no node with bad weather and no
+    blocked route, and every node on it can be accessed, it costs the same under the current
+    conditions and is still the shortest one. Otherwise (see is_usable), the caller has to fall
+    back to a plain search.
+
+    The upward edges are stored in compressed sparse row form, like the edges of CompactGraph.
+
+    Attributes:
+        graph (CompactGraph): The graph the hierarchy was built for.
+        rank (numpy.ndarray): int32 array with the position of each node in the contraction order.
+        offsets (numpy.ndarray): int32 array of size n + 1 delimiting the upward edges of each node.
+        targets (numpy.ndarray): int32 array with the node each upward edge leads to.
+        costs (numpy.ndarray): float64 array with the base cost of each upward edge.
+        middles (numpy.ndarray): int32 array with the node each shortcut skips, or -1 for the
+                                 edges of the original graph.
+    """
+    def __init__(self, graph, rank, offsets, targets, costs, middles):
+        """
+        Initializes a contraction hierarchy from its arrays.
+
+        Args:
+            graph (CompactGraph): The graph the hierarchy was built for.
+            rank (numpy.ndarray): The contraction order of each node.
+            offsets (numpy.ndarray): The CSR offsets of the upward edges of each node.
+            targets (numpy.ndarray): The node each upward edge leads to.
+            costs (numpy.ndarray): The base cost of each upward edge.
+            middles (numpy.ndarray): The node each shortcut skips, or -1.
+        """
+        self.graph = graph
+        self.rank = np.asarray(rank, dtype=np.int32)
+        self.offsets = np.asarray(offsets, dtype=np.int32)
+        self.targets = np.asarray(targets, dtype=np.int32)
+        self.costs = np.asarray(costs, dtype=np.float64)
+        self.middles = np.asarray(middles, dtype=np.int32)
+
+        self._offsets = memoryview(self.offsets)
+        self._targets = memoryview(self.targets)
+        self._costs = memoryview(self.costs)
+        # (lower ranked end, higher ranked end) of every edge -> node it skips, used to unpack shortcuts
+        self._middles = {}
+        for node in range(len(graph)):
+            for edge in range(self._offsets[node], self._offsets[node + 1]):
+                self._middles[(node, self._targets[edge])] = int(self.middles[edge])
+
+    @classmethod
+    def build(cls, graph):
+        """
+        Builds the contraction hierarchy of a graph.
+
+        Args:
+            graph (Graph or CompactGraph): The graph to build the hierarchy for.
+
+        Returns:
+            ContractionHierarchy: The hierarchy of the graph.
+        """
+        if not isinstance(graph, CompactGraph):
+            graph = CompactGraph.from_graph(graph)
+
+        # Remaining graph, as node -> {neighbour: (cost, middle)}; the base metric is symmetric
+        adjacency = [{} for _ in range(len(graph))]
+        for node in range(len(graph)):
+            x, y = graph.xs[node], graph.ys[node]
+            for neighbour, open in graph.edges(node):
+                if open and neighbour != node:
+                    cost = abs(x - graph.xs[neighbour]) + abs(y - graph.ys[neighbour])
+                    _add_edge(adjacency, node, neighbour, float(cost), -1)
+
+        contracted_neighbours = [0] * len(graph)
+        queue = [(_importance(adjacency, node, contracted_neighbours), node) for node in range(len(graph))]
+        heapq.heapify(queue)
+
+        rank = np.zeros(len(graph), dtype=np.int32)
+        upward = [None] * len(graph)  # Node -> its edges to the nodes contracted after it
+        next_rank = 0
+        while queue:
+            _, node = heapq.heappop(queue)
+            # Lazy updates: the importance may have grown since it was pushed
+            importance = _importance(adjacency, node, contracted_neighbours)
+            if queue and importance > queue[0][0]:
+                heapq.heappush(queue, (importance, node))
+                continue
+
+            rank[node] = next_rank
+            next_rank += 1
+            neighbours = adjacency[node]
+            upward[node] = [(neighbour, cost, middle) for neighbour, (cost, middle) in neighbours.items()]
+
+            for source, target, cost in _shortcuts(adjacency, node):
+                _add_edge(adjacency, source, target, cost, node)
+            for neighbour in neighbours:
+                del adjacency[neighbour][node]
+                contracted_neighbours[neighbour] += 1
+            adjacency[node] = {}
+
+        offsets = np.zeros(len(graph) + 1, dtype=np.int32)
+        offsets[1:] = np.cumsum([len(edges) for edges in upward])
+        targets = np.fromiter((edge[0] for edges in upward for edge in edges), dtype=np.int32, count=offsets[-1])
+        costs = np.fromiter((edge[1] for edges in upward for edge in edges), dtype=np.float64, count=offsets[-1])
+        middles = np.fromiter((edge[2] for edges in upward for edge in edges), dtype=np.int32, count=offsets[-1])
+        return cls(graph, rank, offsets, targets, costs, middles)
+
+    @property
+    def shortcut_count(self):
+        """
+        int: The number of shortcuts added to the graph.
+        """
+        return int(np.count_nonzero(self.middles >= 0))
+
+    def query(self, start, goal, stats=None):
+        """
+        Finds the shortest path between two nodes on the base metric.
+
+        Args:
+            start (int): The index of the start node.
+            goal (int): The index of the goal node.
+            stats (SearchStats, optional): Counters to update while searching.
+
+        Returns:
+            tuple: The indices of the nodes of the path (including start and goal) and its base
+                   distance, or (None, 0) if the nodes are not connected.
+        """
+        if start is None or goal is None:
+            return None, 0
+        if start == goal:
+            return [start], 0
+
+        offsets, targets, costs = self._offsets, self._targets, self._costs
+        distances = ({start: 0}, {goal: 0})
+        parents = ({start: None}, {goal: None})
+        frontiers = ([(0, start)], [(0, goal)])
+        best, meeting = float('inf'), None
+
+        # Both searches only go upwards, so neither can stop when it meets the other one; each
+        # stops once its smallest distance can no longer improve the best meeting path
+        while frontiers[0] or frontiers[1]:
+            for side in (0, 1):
+                frontier = frontiers[side]
+                if not frontier:
+                    continue
+                distance, node = heapq.heappop(frontier)
+                if distance >= best:
+                    frontier.clear()
+                    continue
+                own_distances = distances[side]
+                if distance > own_distances[node]:
+                    continue
+                if stats:
+                    stats.expanded += 1
+                    stats.peak_frontier = max(stats.peak_frontier, len(frontiers[0]) + len(frontiers[1]) + 1)
+
+                other_distance = distances[1 - side].get(node)
+                if other_distance is not None and distance + other_distance < best:
+                    best, meeting = distance + other_distance, node
+
+                for edge in range(offsets[node], offsets[node + 1]):
+                    neighbour = targets[edge]
+                    new_distance = distance + costs[edge]
+                    if new_distance < own_distances.get(neighbour, float('inf')):
+                        own_distances[neighbour] = new_distance
+                        parents[side][neighbour] = node
+                        heapq.heappush(frontier, (new_distance, neighbour))
+
+        if meeting is None:
+            return None, 0
+
+        upward_path = []
+        node = meeting
+        while node is not None:
+            upward_path.append(node)
+            node = parents[0][node]
+        upward_path.reverse()
+        node = parents[1][meeting]
+        while node is not None:
+            upward_path.append(node)
+            node = parents[1][node]
+
+        path = [start]
+        for a, b in zip(upward_path, upward_path[1:]):
+            self._unpack(a, b, path)
+        return path, best
+
+    def _unpack(self, a, b, path):
+        """
+        Appends the nodes of the original graph an edge of the hierarchy stands for (excluding a).
+        """
+        stack = [(a, b)]
+        while stack:
+            a, b = stack.pop()
+            middle = self._middles.get((a, b))
+            if middle is None:
+                middle = self._middles[(b, a)]
+            if middle < 0:
+                path.append(b)
+            else:
+                stack.append((middle, b))
+                stack.append((a, middle))
+
+    def is_usable(self, path, terrain, weather, blocked_routes):
+        """
+        Checks whether a path found by query is still the shortest one under the current conditions.
+
+        That is the case when every node entered along the path is SUNNY and can be accessed from
+        the terrain, and none of its edges is blocked: the path then costs its base distance,
+        which no other path can beat.
+
+        Args:
+            path (list): The indices of the nodes of the path.
+            terrain (int): The type of terrain being traversed.
+            weather (Weather): The current weather conditions.
+            blocked_routes (BlockedRoutes): The routes that cannot be used.
+
+        Returns:
+            bool: True if the path can be used as is, otherwise False.
+        """
+        ids, terrain_mask = self.graph._ids, self.graph._terrain_mask
+        codes = weather.code_bytes
+        is_blocked = blocked_routes.is_blocked if blocked_routes else None
+        for previous, node in zip(path, path[1:]):
+            if codes[ids[node]] != SUNNY_CODE or not (terrain_mask[node] >> terrain) & 1:
+                return False
+            if is_blocked is not None and is_blocked(ids[previous], ids[node]):
+                return False
+        return True
+
+    def save(self, file):
+        """
+        Writes the hierarchy to a .npz file.
+
+        Args:
+            file (str): The path of the file.
+        """
+        np.savez(file, version=HIERARCHY_VERSION, fingerprint=graph_fingerprint(self.graph), rank=self.rank,
+                 offsets=self.offsets, targets=self.targets, costs=self.costs, middles=self.middles)
+
+    @classmethod
+    def load(cls, file, graph):
+        """
+        Reads a hierarchy written by save.
+
+        Args:
+            file (str): The path of the file.
+            graph (CompactGraph): The graph the hierarchy was built for.
+
+        Returns:
+            ContractionHierarchy: The hierarchy, or None if the file cannot be read or was built for
+                                  another graph or by another version.
+        """
+        try:
+            with np.load(file) as arrays:
+                if int(arrays["version"]) != HIERARCHY_VERSION or str(arrays["fingerprint"]) != graph_fingerprint(graph):
+                    return None
+                return cls(graph, arrays["rank"], arrays["offsets"], arrays["targets"], arrays["costs"], arrays["middles"])
+        except (OSError, ValueError, KeyError):
+            return None
+
+def _add_edge(adjacency, a, b, cost, middle):
+    """
+    Adds an undirected edge to the remaining graph, unless a cheaper one already joins its nodes.
+    """
+    existing = adjacency[a].get(b)
+    if existing is None or cost < existing[0]:
+        adjacency[a][b] = (cost, middle)
+        adjacency[b][a] = (cost, middle)
+
+def _witness_distances(adjacency, source, excluded, limit):
+    """
+    Runs a Dijkstra search from a node of the remaining graph, avoiding the node being contracted,
+    up to a distance limit.
+    """
+    distances = {source: 0}
+    queue = [(0, source)]
+    settled = 0
+    while queue:
+        distance, node = heapq.heappop(queue)
+        if distance > distances[node]:
+            continue
+        if distance > limit or settled >= WITNESS_SETTLE_LIMIT:
+            break
+        settled += 1
+        for neighbour, (cost, _) in adjacency[node].items():
+            if neighbour == excluded:
+                continue
+            new_distance = distance + cost
+            if new_distance < distances.get(neighbour, float('inf')):
+                distances[neighbour] = new_distance
+                heapq.heappush(queue, (new_distance, neighbour))
+    return distances
+
+def _shortcuts(adjacency, node):
+    """
+    Returns the shortcuts needed to contract a node, as (source, target, cost) tuples.
+    """
+    neighbours = list(adjacency[node].items())
+    shortcuts = []
+    for i, (source, (source_cost, _)) in enumerate(neighbours[:-1]):
+        others = neighbours[i + 1:]
+        limit = source_cost + max(cost for _, (cost, _) in others)
+        witnesses = _witness_distances(adjacency, source, node, limit)
+        for target, (target_cost, _) in others:
+            cost = source_cost + target_cost
+            if witnesses.get(target, float('inf')) > cost:
+                shortcuts.append((source, target, cost))
+    return shortcuts
+
+def _importance(adjacency, node, contracted_neighbours):
+    """
+    Returns the priority of a node in the contraction order: the number of shortcuts contracting it
+    would add minus the edges it would remove, plus the number of neighbours already contracted,
+    which spreads the contraction evenly over the graph.
+    """
+    return len(_shortcuts(adjacency, node)) - len(adjacency[node]) + contracted_neighbours[node]
+
+def graph_fingerprint(graph):
+    """
+    Returns a hash of the nodes and edges of a compact graph, identifying the hierarchy built for it.
+
+    Args:
+        graph (CompactGraph): The graph.
+
+    Returns:
+        str: The hexadecimal fingerprint.
+    """
+    digest = hashlib.sha256()
+    for array in (graph.ids, graph.xs, graph.ys, graph.offsets, graph.targets, graph.open_mask):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()
+
+def load_contraction_hierarchy(graph, directory=None):
+    """
+    Returns the contraction hierarchy of a graph, reading it from disk if it was already built
+    and building and storing it otherwise.
+
+    Args:
+        graph (Graph or CompactGraph): The graph.
+        directory (str, optional): The directory the hierarchies are stored in. Defaults to
+                                   HIERARCHY_DIRECTORY.
+
+    Returns:
+        ContractionHierarchy: The hierarchy of the graph.
+    """
+    compact = graph if isinstance(graph, CompactGraph) else CompactGraph.from_graph(graph)
+    directory = directory or HIERARCHY_DIRECTORY
+    file = path.join(directory, f"{graph_fingerprint(compact)}.npz")
+
+    hierarchy = ContractionHierarchy.load(file, compact)
+    if hierarchy is None:
+        hierarchy = ContractionHierarchy.build(compact)
+        os.makedirs(directory, exist_ok=True)
+        temporary_file = f"{file}.tmp-{os.getpid()}.npz"
+        hierarchy.save(temporary_file)
+        os.replace(temporary_file, file)
+    return hierarchy
@@ -1,4 +1,6 @@
 from graph.node import Node
+import numpy as np
+
 from graph.position import Position
 
 class Graph:
@@ -39,4 +41,139 @@ class Graph:
         """
         if pos1 in self.nodes and pos2 in self.nodes:
             self.nodes[pos1].neighbours.append((self.nodes[pos2], open))
-            self.nodes[pos2].neighbours.append((self.nodes[pos1], open))
\ No newline at end of file
+            self.nodes[pos2].neighbours.append((self.nodes[pos1], open))
+
+    def key_of(self, position):
+        """
+        Returns the key used by the search algorithms to refer to the node at a given position.
+
+        Nodes of this graph are keyed by their position, so the position itself is returned.
+
+        Args:
+            position (Position): The position of the node.
+
+        Returns:
+            Position: The key of the node.
+        """
+        return position
+
+    def position_of(self, key):
+        """
+        Returns the position of the node referred to by a search key.
+
+        Args:
+            key (Position): The key of the node.
+
+        Returns:
+            Position: The position of the node.
+        """
+        return key
+
+    def node_id(self, key):
+        """
+        Returns the ID of the node referred to by a search key.
+
+        Args:
+            key (Position): The key of the node.
+
+        Returns:
+            int: The ID of the node, or None if there is no node with that key.
+        """
+        node = self.nodes.get(key)
+        return node.id if node is not None else None
+
+    def coordinates(self):
+        """
+        Returns the IDs and coordinates of every node, as arrays.
+
+        Returns:
+            tuple: The int32 array of node IDs and the float64 arrays of x and y coordinates.
+        """
+        nodes = self.nodes.values()
+        return (np.fromiter((node.id for node in nodes), dtype=np.int32, count=len(nodes)),
+                np.fromiter((node.position.x for node in nodes), dtype=np.float64, count=len(nodes)),
+                np.fromiter((node.position.y for node in nodes), dtype=np.float64, count=len(nodes)))
+
+    def edges(self, key):
+        """
+        Yields every edge of a node, regardless of terrain, weather or blocked routes.
+
+        Args:
+            key (Position): The key of the node.
+
+        Yields:
+            tuple: The key of the neighbouring node and whether the edge is open.
+        """
+        node = self.nodes.get(key)
+        if node is None:
+            return
+
+        for neighbour, open in node.neighbours:
+            yield neighbour.position, open
+
+    def successors(self, key, terrain, weather, blocked_routes):
+        """
+        Yields the nodes that can be reached directly from a node, along with the cost of each edge.
+
+        An edge is only followed if it is open, is not one of the blocked routes and leads to a node
+        that can be accessed under the given terrain and weather. Its cost is the Manhattan distance
+        between both nodes, adjusted by the weather condition of the node it leads to.
+
+        Args:
+            key (Position): The key of the node being expanded.
+            terrain (int): The type of terrain being traversed.
+            weather (Weather): The current weather conditions.
+            blocked_routes (BlockedRoutes): The routes that cannot be used.
+
+        Yields:
+            tuple: The key of the neighbouring node and the cost of reaching it.
+        """
+        node = self.nodes.get(key)
+        if node is None:
+            return
+
+        is_blocked = blocked_routes.is_blocked if blocked_routes else None
+        for neighbour, open in node.neighbours:
+            if not open or not neighbour.can_access_terrain(terrain, weather):
+                continue
+            if is_blocked is not None and is_blocked(node.id, neighbour.id):
+                continue
+
+            distance = abs(key.x - neighbour.position.x) + abs(key.y - neighbour.position.y)
+            yield neighbour.position, distance * weather.node_distance_factor(neighbour.id)
+
+    def predecessors(self, key, terrain, weather, blocked_routes, source=None):
+        """
+        Yields the nodes from which a node can be reached directly, along with the cost of each edge.
+
+        This is the reverse of successors, used by searches that run backwards from the goal: an
+        edge from a neighbour is only followed if successors would follow it from that neighbour,
+        and its cost is the one successors would report. A neighbour that cannot be accessed is
+        skipped, unless it is the source of the search, which is never entered.
+
+        Args:
+            key (Position): The key of the node being expanded.
+            terrain (int): The type of terrain being traversed.
+            weather (Weather): The current weather conditions.
+            blocked_routes (BlockedRoutes): The routes that cannot be used.
+            source (Position, optional): The key of the node the forward search starts from.
+
+        Yields:
+            tuple: The key of the neighbouring node and the cost of the edge leading from it.
+        """
+        node = self.nodes.get(key)
+        if node is None or not node.can_access_terrain(terrain, weather):
+            return
+
+        factor = weather.node_distance_factor(node.id)
+        is_blocked = blocked_routes.is_blocked if blocked_routes else None
+        for neighbour, open in node.neighbours:
+            if not open:
+                continue
+            if neighbour.position != source and not neighbour.can_access_terrain(terrain, weather):
+                continue
+            if is_blocked is not None and is_blocked(node.id, neighbour.id):
+                continue
+
+            distance = abs(key.x - neighbour.position.x) + abs(key.y - neighbour.position.y)
+            yield neighbour.position, distance * factor
@@ -1,5 +1,3 @@
-from graph.position import Position
-
 class Node:
     """
     A class representing a node in a graph.
@@ -39,4 +37,4 @@ class Node:
             bool: True if the node is accessible under the given terrain and weather conditions, 
                   otherwise False.
         """
-        return terrain in self.accessible_terrains and not weather.blocked_position(Position(self.position.x, self.position.y))
\ No newline at end of file
+        return terrain in self.accessible_terrains and not weather.node_blocked(self.id)
\ No newline at end of file
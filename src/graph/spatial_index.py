@@ -0,0 +1,340 @@
+from itertools import count
+from math import hypot
+
+import numpy as np
+
+from graph.position import Position
+
+# Average number of items per cell the grid is sized for
+ITEMS_PER_CELL = 4
+
+class SpatialIndex:
+    """
+    A uniform grid over the bounding boxes of a set of items (nodes, edges, ...), to find the items
+    in a region without going through all of them.
+
+    The bounding box of the items is divided into square cells, and every item is listed in each
+    cell its own bounding box overlaps. The lists are stored in compressed sparse row (CSR) form,
+    like the edges of a CompactGraph: the items of cell c are the entries offsets[c] to
+    offsets[c + 1] of the items array. Since cells are numbered row by row, the cells of a region
+    on one row are contiguous, and a query takes one slice per row of cells.
+
+    Nearest neighbour queries go through rings of cells around the point (or around the nearest
+    cell, for a point outside the grid), from the inside out, and stop once no cell beyond the
+    ones seen can hold an item as near as the ones found. Distances are measured to the bounding
+    box of each item, which for points is the point itself.
+
+    Attributes:
+        min_xs (numpy.ndarray): float64 array with the smallest x-coordinate of each item.
+        min_ys (numpy.ndarray): float64 array with the smallest y-coordinate of each item.
+        max_xs (numpy.ndarray): float64 array with the largest x-coordinate of each item.
+        max_ys (numpy.ndarray): float64 array with the largest y-coordinate of each item.
+        origin (tuple): The smallest x and y coordinates of the items, where the grid starts.
+        cell_size (float): The side of each cell.
+        columns (int): The number of columns of cells.
+        rows (int): The number of rows of cells.
+        offsets (numpy.ndarray): int64 array of size rows * columns + 1 delimiting the items of each cell.
+        items (numpy.ndarray): int32 array with the index of the items of each cell.
+    """
+    def __init__(self, min_xs, min_ys, max_xs, max_ys, cell_size=None):
+        """
+        Builds the grid over the bounding boxes of the items.
+
+        Args:
+            min_xs (numpy.ndarray): The smallest x-coordinate of each item.
+            min_ys (numpy.ndarray): The smallest y-coordinate of each item.
+            max_xs (numpy.ndarray): The largest x-coordinate of each item.
+            max_ys (numpy.ndarray): The largest y-coordinate of each item.
+            cell_size (float, optional): The side of each cell. Defaults to None (a size giving
+                                         about ITEMS_PER_CELL items per cell).
+        """
+        self.min_xs = np.asarray(min_xs, dtype=np.float64)
+        self.min_ys = np.asarray(min_ys, dtype=np.float64)
+        self.max_xs = np.asarray(max_xs, dtype=np.float64)
+        self.max_ys = np.asarray(max_ys, dtype=np.float64)
+
+        count = len(self.min_xs)
+        if count:
+            self.origin = (float(self.min_xs.min()), float(self.min_ys.min()))
+            width = float(self.max_xs.max()) - self.origin[0]
+            height = float(self.max_ys.max()) - self.origin[1]
+        else:
+            self.origin, width, height = (0.0, 0.0), 0.0, 0.0
+        if cell_size is None:
+            cell_size = (width * height * ITEMS_PER_CELL / count) ** 0.5 if count else 0
+            cell_size = cell_size or max(width, height) or 1.0
+        self.cell_size = float(cell_size)
+        self.columns = int(width / self.cell_size) + 1
+        self.rows = int(height / self.cell_size) + 1
+
+        # Range of cells covered by each item, and one (item, cell) entry per cell
+        first_columns, first_rows = self._cell(self.min_xs, self.min_ys)
+        last_columns, last_rows = self._cell(self.max_xs, self.max_ys)
+        spans = last_columns - first_columns + 1
+        sizes = spans * (last_rows - first_rows + 1)
+        items = np.repeat(np.arange(count, dtype=np.int32), sizes)
+        within = np.arange(len(items)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        span = np.repeat(spans, sizes)
+        cells = ((np.repeat(first_rows, sizes) + within // span) * self.columns
+                 + np.repeat(first_columns, sizes) + within % span)
+
+        order = np.argsort(cells, kind="stable")
+        self.items = items[order]
+        self.offsets = np.zeros(self.rows * self.columns + 1, dtype=np.int64)
+        np.cumsum(np.bincount(cells, minlength=self.rows * self.columns), out=self.offsets[1:])
+
+    @classmethod
+    def from_points(cls, xs, ys, cell_size=None):
+        """
+        Builds the grid over a set of points.
+
+        Args:
+            xs (numpy.ndarray): The x-coordinate of each point.
+            ys (numpy.ndarray): The y-coordinate of each point.
+            cell_size (float, optional): The side of each cell. Defaults to None.
+
+        Returns:
+            SpatialIndex: The index of the points.
+        """
+        return cls(xs, ys, xs, ys, cell_size)
+
+    @classmethod
+    def from_segments(cls, x1s, y1s, x2s, y2s, cell_size=None):
+        """
+        Builds the grid over a set of line segments, such as the edges of a graph.
+
+        Args:
+            x1s (numpy.ndarray): The x-coordinate of the first end of each segment.
+            y1s (numpy.ndarray): The y-coordinate of the first end of each segment.
+            x2s (numpy.ndarray): The x-coordinate of the second end of each segment.
+            y2s (numpy.ndarray): The y-coordinate of the second end of each segment.
+            cell_size (float, optional): The side of each cell. Defaults to None.
+
+        Returns:
+            SpatialIndex: The index of the segments.
+        """
+        return cls(np.minimum(x1s, x2s), np.minimum(y1s, y2s), np.maximum(x1s, x2s), np.maximum(y1s, y2s),
+                   cell_size)
+
+    def __len__(self):
+        return len(self.min_xs)
+
+    def query(self, min_x, min_y, max_x, max_y):
+        """
+        Finds the items whose bounding box overlaps a rectangle.
+
+        Args:
+            min_x (float): The smallest x-coordinate of the rectangle.
+            min_y (float): The smallest y-coordinate of the rectangle.
+            max_x (float): The largest x-coordinate of the rectangle.
+            max_y (float): The largest y-coordinate of the rectangle.
+
+        Returns:
+            numpy.ndarray: The sorted indices of the items.
+        """
+        if not len(self) or min_x > max_x or min_y > max_y:
+            return np.zeros(0, dtype=np.int32)
+
+        (first_column, last_column), (first_row, last_row) = (
+            np.clip(self._cell(np.array([min_x, max_x]), np.array([min_y, max_y])), 0,
+                    [[self.columns - 1], [self.rows - 1]])
+        )
+        slices = [self.items[self.offsets[row * self.columns + first_column]:
+                             self.offsets[row * self.columns + last_column + 1]]
+                  for row in range(first_row, last_row + 1)]
+        candidates = np.unique(np.concatenate(slices))
+
+        # Items spanning several cells may only overlap the cells, not the rectangle
+        inside = ((self.min_xs[candidates] <= max_x) & (self.max_xs[candidates] >= min_x) &
+                  (self.min_ys[candidates] <= max_y) & (self.max_ys[candidates] >= min_y))
+        return candidates[inside]
+
+    def within_radius(self, x, y, radius):
+        """
+        Finds the items within a distance of a point.
+
+        Args:
+            x (float): The x-coordinate of the point.
+            y (float): The y-coordinate of the point.
+            radius (float): The largest distance.
+
+        Returns:
+            numpy.ndarray: The sorted indices of the items.
+        """
+        candidates = self.query(x - radius, y - radius, x + radius, y + radius)
+        return candidates[self._distances(candidates, x, y) <= radius]
+
+    def nearest(self, x, y):
+        """
+        Finds the item nearest to a point.
+
+        Args:
+            x (float): The x-coordinate of the point.
+            y (float): The y-coordinate of the point.
+
+        Returns:
+            int: The index of the item, or None if there are no items.
+        """
+        nearest = self.k_nearest(x, y, 1)
+        return int(nearest[0]) if len(nearest) else None
+
+    def k_nearest(self, x, y, k):
+        """
+        Finds the k items nearest to a point, ties broken by index.
+
+        Args:
+            x (float): The x-coordinate of the point.
+            y (float): The y-coordinate of the point.
+            k (int): The number of items.
+
+        Returns:
+            numpy.ndarray: The indices of the items, nearest first (fewer than k if there are fewer items).
+        """
+        k = min(k, len(self))
+        if k <= 0:
+            return np.zeros(0, dtype=np.int32)
+
+        (column,), (row,) = self._cell(np.array([x]), np.array([y]))
+        column, row = min(max(int(column), 0), self.columns - 1), min(max(int(row), 0), self.rows - 1)
+        best, best_distances = np.zeros(0, dtype=np.int32), np.zeros(0)
+        for ring in count():
+            first_column, last_column = max(column - ring, 0), min(column + ring, self.columns - 1)
+            first_row, last_row = max(row - ring, 0), min(row + ring, self.rows - 1)
+            slices = []
+            for ring_row in range(first_row, last_row + 1):
+                if ring_row in (row - ring, row + ring):
+                    spans = ((first_column, last_column),)
+                else:
+                    spans = tuple((c, c) for c in {column - ring, column + ring} if 0 <= c < self.columns)
+                slices.extend(self.items[self.offsets[ring_row * self.columns + first]:
+                                         self.offsets[ring_row * self.columns + last + 1]]
+                              for first, last in spans)
+
+            # Only the k nearest items seen so far are kept, merged with the items of the new ring
+            if any(len(items) for items in slices):
+                candidates = np.unique(np.concatenate((best, *slices)))
+                distances = self._distances(candidates, x, y)
+                order = np.lexsort((candidates, distances))[:k]
+                best, best_distances = candidates[order], distances[order]
+            if len(best) == k and best_distances[-1] < self._unseen_distance(x, y, first_column, last_column,
+                                                                              first_row, last_row):
+                return best
+
+    def _unseen_distance(self, x, y, first_column, last_column, first_row, last_row):
+        """
+        Returns the distance from a point to the nearest cell of the grid outside a rectangle of
+        cells, which no item outside the rectangle can be nearer than (inf if it covers the grid).
+        """
+        size = self.cell_size
+        min_x, min_y = self.origin
+        max_x, max_y = min_x + self.columns * size, min_y + self.rows * size
+        left, right = min_x + first_column * size, min_x + (last_column + 1) * size
+        bottom, top = min_y + first_row * size, min_y + (last_row + 1) * size
+
+        boxes = []
+        if first_column > 0:
+            boxes.append((min_x, min_y, left, max_y))
+        if last_column < self.columns - 1:
+            boxes.append((right, min_y, max_x, max_y))
+        if first_row > 0:
+            boxes.append((left, min_y, right, bottom))
+        if last_row < self.rows - 1:
+            boxes.append((left, top, right, max_y))
+        return min((hypot(max(box[0] - x, x - box[2], 0), max(box[1] - y, y - box[3], 0)) for box in boxes),
+                   default=float('inf'))
+
+    def _distances(self, items, x, y):
+        """
+        Returns the distance from a point to the bounding box of some items.
+        """
+        dx = np.maximum(np.maximum(self.min_xs[items] - x, x - self.max_xs[items]), 0)
+        dy = np.maximum(np.maximum(self.min_ys[items] - y, y - self.max_ys[items]), 0)
+        return np.hypot(dx, dy)
+
+    def _cell(self, xs, ys):
+        """
+        Returns the column and row of the cells containing some points, which may lie outside the grid.
+        """
+        return (np.floor((xs - self.origin[0]) / self.cell_size).astype(np.int64),
+                np.floor((ys - self.origin[1]) / self.cell_size).astype(np.int64))
+
+class NodeIndex:
+    """
+    Finds the nodes of a graph nearest to arbitrary positions.
+
+    Searches key on exact node positions, so a position that is off by even a rounding error is not
+    a node of the graph. Snapping it to the nearest node makes it one.
+
+    Attributes:
+        graph (Graph or CompactGraph): The graph whose nodes are indexed.
+        xs (numpy.ndarray): float64 array with the x-coordinate of each node.
+        ys (numpy.ndarray): float64 array with the y-coordinate of each node.
+        index (SpatialIndex): The index of the nodes, in the order of graph.coordinates().
+    """
+    def __init__(self, graph):
+        """
+        Indexes the nodes of a graph.
+
+        Args:
+            graph (Graph or CompactGraph): The graph.
+        """
+        self.graph = graph
+        _, self.xs, self.ys = graph.coordinates()
+        self.index = SpatialIndex.from_points(self.xs, self.ys)
+
+    def nearest(self, position):
+        """
+        Finds the node nearest to a position.
+
+        Args:
+            position (Position): The position.
+
+        Returns:
+            Position: The position of the node, or None if the graph has no nodes.
+        """
+        node = self.index.nearest(position.x, position.y)
+        return self._position(node) if node is not None else None
+
+    def within_radius(self, position, radius):
+        """
+        Finds the nodes within a distance of a position.
+
+        Args:
+            position (Position): The position.
+            radius (float): The largest distance, in the units of the coordinates.
+
+        Returns:
+            list: The positions of the nodes.
+        """
+        return [self._position(node) for node in self.index.within_radius(position.x, position.y, radius)]
+
+    def k_nearest(self, position, k):
+        """
+        Finds the k nodes nearest to a position.
+
+        Args:
+            position (Position): The position.
+            k (int): The number of nodes.
+
+        Returns:
+            list: The positions of the nodes, nearest first.
+        """
+        return [self._position(node) for node in self.index.k_nearest(position.x, position.y, k)]
+
+    def snap(self, positions):
+        """
+        Moves positions onto the nodes nearest to them.
+
+        Args:
+            positions (list): The positions.
+
+        Returns:
+            list: The positions of the nodes, in the same order.
+        """
+        return [self.nearest(position) for position in positions]
+
+    def _position(self, node):
+        """
+        Returns the position of a node, equal to the key of the node in a Graph.
+        """
+        return Position(float(self.xs[node]), float(self.ys[node]))
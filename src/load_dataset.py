@@ -1,28 +1,41 @@
 import json
+import sys
+from math import hypot
+
 from end_point import EndPoint
 from geography.geography import load_map_data_to_graph
 from graph.position import Position
+from graph.spatial_index import NodeIndex
 from start_point import StartPoint
 from supply import Supply, SupplyType
 from vehicle import Vehicle, VehicleStatus, VehicleType
-from weather import Weather, WeatherCondition
+from weather import Weather
+
+# Distance (in degrees, about 100 m) beyond which snapping a point to a node is reported, as the
+# coordinates of the point are probably wrong
+SNAP_WARNING_DISTANCE = 0.001
 
 class State:
     """
     Represents the current state of the simulation, including time, vehicles, start point, end points, 
-    geographical graph, and weather conditions.
+    geographical graph, weather conditions and, when loaded from a dataset, the index of the
+    nodes of the graph.
     """
-    def __init__(self, time, vehicles, start_point, end_points, graph, weather):
+    def __init__(self, time, vehicles, start_point, end_points, graph, weather, node_index=None):
         self.time = time
         self.vehicles = vehicles
         self.start_point = start_point
         self.end_points = end_points
         self.graph = graph
         self.weather = weather
+        self.node_index = node_index
 
 def load_dataset(dataset_path):
     """
     Loads and processes the dataset to initialize the state of the simulation.
+
+    The positions of the start point, the end points and the vehicles are snapped to the nearest
+    node of the graph, since searches only reach positions exactly equal to a node's.
     
     :param dataset_path: Path to the JSON dataset file
     :return: An instance of the State class representing the simulation state
@@ -32,20 +45,29 @@ def load_dataset(dataset_path):
 
     geography = dataset['geography']
     graph = load_map_data_to_graph(geography)
-    weather = Weather()
-
-    for node in graph.nodes.values():    
-        weather.set_condition(Position(node.position.x, node.position.y), WeatherCondition.SUNNY)
+    weather = Weather(graph)  # Every node starts SUNNY
+    node_index = NodeIndex(graph)
 
-    start_position = Position(*dataset['start_point']['position'])
+    # Every point of interest snapped at once: start point, end points, then vehicles
+    names = ["Start point"] + [f"End point {i + 1}" for i in range(len(dataset['end_points']))]
+    names += [f"Vehicle {vehicle['id']}" for vehicle in dataset['vehicles']]
+    given = [Position(*point['position'])
+             for point in [dataset['start_point'], *dataset['end_points'], *dataset['vehicles']]]
+    positions = node_index.snap(given)
+    for name, position, snapped in zip(names, given, positions):
+        distance = hypot(position.x - snapped.x, position.y - snapped.y)
+        if distance > SNAP_WARNING_DISTANCE:
+            print(f"Warning: {name} at {position} is {distance:.5f} away from the nearest node, {snapped}.",
+                  file=sys.stderr)
+    start_position = positions[0]
     supplies = [Supply(s['quantity'], SupplyType[s['type']]) for s in dataset['start_point']['supplies']]
     start_point = StartPoint(start_position, supplies)
 
-    end_points = [EndPoint(Position(*ep['position']), ep['needs_supplies'], ep['priority']) for ep in dataset['end_points']]
+    end_points = [EndPoint(position, ep['needs_supplies'], ep['priority'])
+                  for position, ep in zip(positions[1:], dataset['end_points'])]
 
     vehicles = []
-    for vehicle in dataset['vehicles']:
-        vehicle_position = Position(*vehicle['position'])
+    for vehicle_position, vehicle in zip(positions[1 + len(end_points):], dataset['vehicles']):
         vehicle_type = VehicleType(
             vehicle['type']['name'],
             vehicle['type']['transportation'],
@@ -60,5 +82,5 @@ def load_dataset(dataset_path):
         )
         vehicles.append(vehicle)
 
-    return State(0, vehicles, start_point, end_points, graph, weather)
+    return State(0, vehicles, start_point, end_points, graph, weather, node_index)
 
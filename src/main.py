@@ -1,13 +1,12 @@
-from algorithms.informed import heuristics
-from graph.position import Position
 from ui.viewer import Viewer
 import tkinter as tk
-from algorithms.uninformed.bfs import bfs_supply_delivery
-from algorithms.uninformed.dfs import dfs_supply_delivery
-from algorithms.uninformed.iterative_deepening import ids_supply_delivery
-from algorithms.uninformed.uniform_cost import ucs_supply_delivery
-from algorithms.informed.greedy import greedy_supply_delivery
-from algorithms.informed.a_star import a_star_supply_delivery
+from algorithms.delivery import dispatch
+from algorithms.informed.landmarks import clear_landmarks
+from algorithms.informed.lpa_star import clear_planners
+from algorithms.registry import DEFAULT_HEURISTIC, HEURISTICS, INFORMED_ROUTES, UNINFORMED_ROUTES
+from algorithms.route_cache import RouteCache
+from algorithms.uninformed.ch_search import clear_contraction_hierarchies
+from algorithms.uninformed.one_to_many import serve_all_end_points
 from load_dataset import load_dataset
 
 from vehicle import VehicleStatus
@@ -16,8 +15,9 @@ from weather import Weather, WeatherCondition
 algorithm = "bfs"  # Default algorithm
 app = None
 state = None
-heuristic = "manhattan_heuristic"  # Default heuristic
+heuristic = DEFAULT_HEURISTIC  # Default heuristic
 terrain = 0  # Default terrain
+route_cache = RouteCache()  # Routes found so far, reused when the same end point is chosen again
 
 def main():
     """
@@ -38,7 +38,9 @@ def main():
         restart_simulation_callback=lambda: restart_simulation(),
         endpoints_callback=lambda: get_endpoints(),
         reposition_vehicles_callback=lambda: reposition_vehicles_to_start(),
-        change_weather_callback=lambda node_id, weather_id: change_weather(node_id, weather_id)
+        change_weather_callback=lambda node_id, weather_id: change_weather(node_id, weather_id),
+        serve_all_callback=lambda: serve_all(state),
+        block_route_callback=lambda route: block_route(route)
     )
     app.display_graph(state.graph, state.start_point, state.end_points, state.vehicles, state.weather)
     app.run()
@@ -64,53 +66,89 @@ def get_endpoints():
 
 def run_algorithm(state):
     global algorithm, heuristic, terrain
-    algorithm_functions = {
-        "bfs": bfs_supply_delivery,
-        "dfs": dfs_supply_delivery,
-        "ids": ids_supply_delivery,
-        "ucs": ucs_supply_delivery,
-        "a_star": lambda state, start, end, terrain, weather, blocked_routes: a_star_supply_delivery(
-            state, start, end, getattr(heuristics, heuristic), terrain, weather, blocked_routes
-        ),
-        "greedy": lambda state, start, end, terrain, weather, blocked_routes: greedy_supply_delivery(
-            state, start, end, getattr(heuristics, heuristic), terrain, weather, blocked_routes
-        ),
-    }
-    selected_function = algorithm_functions.get(algorithm)
-
-    if selected_function:
-
-        selected_end_point = state.end_points[app.selected_end_point_index]
-
-        # Pass blocked_routes as an additional argument
-        path, total_distance, total_time, supplies_info = selected_function(
-            state, 
-            state.start_point, 
-            selected_end_point, 
-            terrain, 
-            state.weather,
-            app.blocked_routes  # Pass blocked routes here
-        )
-        if path:
-            print("Path found.")
-        else:
-            print("No available path.")
+    if algorithm not in UNINFORMED_ROUTES and algorithm not in INFORMED_ROUTES:
+        print(f"Unknown algorithm '{algorithm}'.")
+        return
+    if algorithm in INFORMED_ROUTES and heuristic not in HEURISTICS:
+        print(f"Unknown heuristic '{heuristic}'.")
+        return
+
+    selected_end_point = state.end_points[app.selected_end_point_index]
+    route = route_cache.find_route(state, state.start_point, selected_end_point, algorithm, heuristic,
+                                   terrain, state.weather, app.blocked_routes)
+    print(f"Route cache: {route_cache.hits} hits, {route_cache.misses} misses.")
+    path, total_distance, total_time, supplies_info = dispatch(
+        state, state.start_point, selected_end_point, route, terrain
+    )
+    if path:
+        print("Path found.")
+    else:
+        print("No available path.")
 
-        app.show_info_box(total_distance*100, total_time*60)
+    app.show_info_box(total_distance*100, total_time*60)
     app.draw_path(state.graph, path, on_complete=lambda: app.display_graph(state.graph, state.start_point, state.end_points, state.vehicles, state.weather))
 
 
+def serve_all(state):
+    """
+    Sends supplies to every end point, routing all of them with a single search from the start point.
+
+    :param state: Simulation state
+    """
+    results = serve_all_end_points(state, terrain, state.weather, app.blocked_routes)
+    total_distance = total_time = 0
+    for end_point, (path, distance, time, supplies_info) in results:
+        if path:
+            print(f"End point {state.end_points.index(end_point) + 1}: delivered {supplies_info}")
+            total_distance += distance
+            total_time += time
+        else:
+            print(f"End point {state.end_points.index(end_point) + 1}: {supplies_info}")
+
+    app.show_info_box(total_distance*100, total_time*60)
+    app.display_graph(state.graph, state.start_point, state.end_points, state.vehicles, state.weather)
+
 def restart_simulation():
     global state
     state = load_dataset("data/dataset1.json")
+    route_cache.clear()
+    clear_planners()
+    clear_landmarks()
+    clear_contraction_hierarchies()
     print("Simulation restarted.")
     app.display_graph(state.graph, state.start_point, state.end_points, state.vehicles, state.weather)
 
+def block_route(route):
+    """
+    Drops the cached routes that use a route that was just blocked, and shows it blocked.
+
+    Unlike a restart, the rest of the simulation (vehicles, weather and the other cached routes) is
+    kept as it is.
+
+    :param route: Route just added to the blocked routes of the Viewer, as a "node1,node2" string
+    """
+    route_cache.invalidate_routes([route], state.weather, app.blocked_routes)
+    print(f"Route cache: {len(route_cache)} routes kept.")
+    app.display_graph(state.graph, state.start_point, state.end_points, state.vehicles, state.weather)
+
 def change_weather(node_id, weather_id):
     global state
-    for node in state.graph.nodes.values():
-        if node.id == int(node_id):
-            state.weather.set_condition(Position(node.position.x, node.position.y), list(WeatherCondition)[int(weather_id)])
+    try:
+        node_id, weather_id = int(node_id), int(weather_id)
+    except ValueError:
+        print("Invalid input. Please enter a node ID and a weather number.")
+        return
+    if not 0 <= weather_id < len(WeatherCondition):
+        print(f"Invalid weather number. Please use 0 to {len(WeatherCondition) - 1}.")
+        return
+    if not 0 <= node_id < len(state.weather.codes):
+        print(f"Unknown node {node_id}.")
+        return
+    condition = list(WeatherCondition)[weather_id]
+
+    previous = state.weather.node_condition(node_id)
+    state.weather.set_node_condition(node_id, condition)
+    route_cache.invalidate_nodes([node_id], state.weather, app.blocked_routes, [previous])
     app.display_graph(state.graph, state.start_point, state.end_points, state.vehicles, state.weather)
 
 def reposition_vehicles_to_start():
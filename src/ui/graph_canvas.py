@@ -6,6 +6,9 @@ class GraphCanvas(tk.Canvas):
 
     Attributes:
         scale_factor (float): The current zoom level of the canvas.
+        offset (list): Where the origin of the canvas has been moved to by zooming and dragging.
+        on_view_change (function): Called without arguments once the canvas is idle after being
+            zoomed or dragged, or None.
         drag_data (dict): A dictionary to store the starting coordinates for dragging.
 
     Methods:
@@ -15,15 +18,36 @@ class GraphCanvas(tk.Canvas):
         zoom_linux(event):
             Handles zooming for Linux using the mouse button 4 and 5 events.
         
+        rescale(x, y, scale):
+            Scales every item around a point.
+
         start_drag(event):
             Initiates dragging by storing the initial mouse position.
         
         drag(event):
             Drags the canvas by calculating the distance moved since the last event.
+
+        to_view(x, y):
+            Returns where a point drawn before any zooming or dragging is now.
+
+        from_view(x, y):
+            Returns where a point of the canvas was before any zooming or dragging.
+
+        visible_area():
+            Returns the part of the canvas in the window.
+
+        view_changed():
+            Calls on_view_change once the canvas is idle.
+
+        reset_view():
+            Forgets the zooming and dragging, once everything has been deleted.
     """
     def __init__(self, master, **kwargs):
         super().__init__(master, **kwargs)
         self.scale_factor = 1.0  # Initial scale factor
+        self.offset = [0.0, 0.0]
+        self.on_view_change = None
+        self._view_change_pending = False
         self.bind_all("<MouseWheel>", self.zoom)  # Bind mouse wheel event (cross-platform)
         self.bind_all("<Button-4>", self.zoom_linux)  # For Linux scrolling
         self.bind_all("<Button-5>", self.zoom_linux)
@@ -36,16 +60,49 @@ class GraphCanvas(tk.Canvas):
     def zoom(self, event):
         if event.delta:  # For Windows and macOS
             scale = 1.1 if event.delta > 0 else 0.9
-            self.scale_factor *= scale
-            self.scale("all", event.x, event.y, scale, scale)
+            self.rescale(event.x, event.y, scale)
             self.configure(scrollregion=self.bbox("all"))  # Adjust scroll region
 
     def zoom_linux(self, event):
         scale = 1.1 if event.num == 4 else 0.9  # For Linux
-        self.scale_factor *= scale
-        self.scale("all", event.x, event.y, scale, scale)
+        self.rescale(event.x, event.y, scale)
         self.configure(scrollregion=self.bbox("all"))  # Adjust scroll region
 
+    def rescale(self, x, y, scale):
+        # Scale every item around the point, keeping track of where the origin ends up
+        self.scale_factor *= scale
+        self.offset[0] = x + (self.offset[0] - x) * scale
+        self.offset[1] = y + (self.offset[1] - y) * scale
+        self.scale("all", x, y, scale, scale)
+        self.view_changed()
+
+    def to_view(self, x, y):
+        # Items created now must be zoomed and moved like the ones created before
+        return x * self.scale_factor + self.offset[0], y * self.scale_factor + self.offset[1]
+
+    def from_view(self, x, y):
+        return (x - self.offset[0]) / self.scale_factor, (y - self.offset[1]) / self.scale_factor
+
+    def visible_area(self):
+        # Before the window is mapped, its size is the one it was created with
+        width = self.winfo_width() if self.winfo_width() > 1 else int(self.cget("width"))
+        height = self.winfo_height() if self.winfo_height() > 1 else int(self.cget("height"))
+        return self.canvasx(0), self.canvasy(0), self.canvasx(width), self.canvasy(height)
+
+    def view_changed(self):
+        # Many zoom and drag events can arrive before the window is redrawn: only the last one counts
+        if self.on_view_change is not None and not self._view_change_pending:
+            self._view_change_pending = True
+            self.after_idle(self._notify_view_change)
+
+    def _notify_view_change(self):
+        self._view_change_pending = False
+        self.on_view_change()
+
+    def reset_view(self):
+        self.scale_factor = 1.0
+        self.offset = [0.0, 0.0]
+
     def start_drag(self, event):
         self.drag_data["x"] = event.x
         self.drag_data["y"] = event.y
@@ -56,6 +113,9 @@ class GraphCanvas(tk.Canvas):
         dy = event.y - self.drag_data["y"]
         # Move all items on the canvas
         self.move("all", dx, dy)
+        self.offset[0] += dx
+        self.offset[1] += dy
+        self.view_changed()
         # Update drag data
         self.drag_data["x"] = event.x
         self.drag_data["y"] = event.y
@@ -0,0 +1,699 @@
+from math import ceil
+from os import path
+from tkinter import CENTER, NW
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageTk
+
+from graph.position import Position
+from graph.spatial_index import SpatialIndex
+from weather import WeatherCondition
+
+IMAGES_DIRECTORY = path.join(path.dirname(__file__), "..", "assets", "images")
+
+# Fill of the weather oval of a node, by WeatherCondition value
+WEATHER_COLOURS = {
+    WeatherCondition.SUNNY.value: "gold",
+    WeatherCondition.RAINY.value: "navy",
+    WeatherCondition.SNOWY.value: "light sky blue",
+    WeatherCondition.STORM.value: "dark violet",
+}
+
+# Sprite name and size of each vehicle, by the transportation of its type
+VEHICLE_SPRITES = {0: ("truck", (20, 20)), 1: ("drone", (25, 25)), 2: ("boat", (20, 20))}
+
+# Horizontal gap between the vehicles parked at the same position, in map units
+VEHICLE_SPACING = 0.0006
+
+# Largest number of edges in view drawn in full detail, with their markers, nodes and tooltips
+DETAIL_EDGE_LIMIT = 2000
+
+# Fraction of the width and height of the view beyond each side whose items are also kept, so
+# small drags do not create and delete items
+VIEW_MARGIN = 0.25
+
+# Side of the cells of the canvas the ends of the edges are snapped to when the graph is drawn in
+# less detail, in pixels: only one edge is drawn between the same two cells, and none within one
+SIMPLIFY_PIXELS = 6
+
+class SpriteCache:
+    """
+    The images of assets/images, each one read once and resized once per size.
+
+    The canvas only keeps the images it shows alive while something else holds a reference to
+    them, so the cache also serves as that reference.
+    """
+    def __init__(self):
+        self._originals = {}
+        self._images = {}
+        self._sprites = {}
+
+    def get(self, name, size):
+        """
+        Returns an image of assets/images at a given size, ready to be shown on a canvas.
+
+        Args:
+            name (str): The name of the image file, without the .png extension.
+            size (tuple): The width and height of the image, in pixels.
+
+        Returns:
+            ImageTk.PhotoImage: The resized image.
+        """
+        sprite = self._sprites.get((name, size))
+        if sprite is None:
+            sprite = self._sprites[(name, size)] = ImageTk.PhotoImage(self.image(name, size))
+        return sprite
+
+    def image(self, name, size):
+        """
+        Returns an image of assets/images at a given size, to be drawn on other images.
+
+        Args:
+            name (str): The name of the image file, without the .png extension.
+            size (tuple): The width and height of the image, in pixels.
+
+        Returns:
+            Image.Image: The resized image.
+        """
+        image = self._images.get((name, size))
+        if image is None:
+            if name not in self._originals:
+                self._originals[name] = Image.open(path.join(IMAGES_DIRECTORY, f"{name}.png"))
+            image = self._images[(name, size)] = self._originals[name].resize(size, Image.BILINEAR)
+        return image
+
+class Scene:
+    """
+    The items of the graph, the start point, the end points and the vehicles on a GraphCanvas,
+    kept in step with the simulation and with the part of the map in view.
+
+    Items are only changed once created: a weather change refills the weather ovals of the nodes
+    that changed, a blocked route recolours its edge, and a vehicle that moved is moved. Each item
+    has a stable tag ("node:<id>", "weather:<id>", "edge:<id1>,<id2>", "end_point:<index>",
+    "vehicle:<id>", ...), but the scene keeps the item IDs themselves, since finding an item by any
+    other tag makes Tk go through every item.
+
+    The nodes and edges only have items while they are in view (or within VIEW_MARGIN of it): a
+    SpatialIndex of each finds the ones in view whenever the canvas is zoomed or dragged, and the
+    items of the ones that left it are deleted. With more than DETAIL_EDGE_LIMIT edges in view the
+    graph is drawn in less detail, so the number of items depends on the size of the canvas rather
+    than on the size of the graph: the ends of the edges are snapped to cells of SIMPLIFY_PIXELS
+    pixels and a single edge is drawn between each pair of cells, and the edge markers, the nodes,
+    the weather ovals of the sunny nodes and their tooltips are left out.
+
+    With a raster base layer, the parts of the graph that hardly ever change (the edges, their
+    markers and the nodes, as if sunny) are not items at all: they are drawn on a single image of
+    the part of the map in view, which is only drawn again when the zoom or the level of detail
+    changes, or the canvas is dragged beyond VIEW_MARGIN. Only the blocked edges and the weather
+    of the nodes that are not sunny are drawn over it as items, and the tooltips of the nodes and
+    edges are found with the SpatialIndex of each.
+
+    The scene is only built again when it is given a graph with different nodes or edges, so
+    reloading the same dataset reuses every item (and keeps the zoom and position of the canvas).
+
+    Attributes:
+        canvas (GraphCanvas): The canvas the scene is drawn on.
+        sprites (SpriteCache): The images of the start point, the end points and the vehicles.
+        raster (bool): Whether the graph is drawn on a raster base layer.
+        graph (Graph): The graph drawn, or None before the first update.
+        detail (bool): Whether the graph in view is drawn in full detail.
+    """
+    def __init__(self, canvas, sprites, show_tooltip, hide_tooltip, raster=True):
+        """
+        Initializes an empty scene.
+
+        Args:
+            canvas (GraphCanvas): The canvas to draw on.
+            sprites (SpriteCache): The images of the start point, the end points and the vehicles.
+            show_tooltip (function): A function receiving an event and a text, showing the text.
+            hide_tooltip (function): A function receiving an event, hiding the tooltip.
+            raster (bool, optional): Whether to draw the graph on a raster base layer rather than
+                                     as items. Defaults to True.
+        """
+        self.canvas = canvas
+        self.sprites = sprites
+        self.raster = raster
+        self.graph = None
+        self.detail = None
+        self._path_items = []
+        self._tooltips = {}  # Item ID -> function returning its tooltip text
+        self._show_tooltip, self._hide_tooltip = show_tooltip, hide_tooltip
+        self._base_item = None
+        self._base_image = None
+        self._base_view = None  # Zoom, level of detail and region of the map of the base layer
+        self._rgb = {}
+
+        # One binding for every item with a tooltip, instead of one per item
+        canvas.tag_bind("tooltip", "<Enter>", lambda event: show_tooltip(event, self._tooltip_text()))
+        canvas.tag_bind("tooltip", "<Leave>", hide_tooltip)
+        canvas.tag_bind("base", "<Motion>", self._base_motion)
+        canvas.tag_bind("base", "<Leave>", hide_tooltip)
+        canvas.on_view_change = self.refresh
+
+    def update(self, graph, start_point, end_points, vehicles, weather, blocked_routes):
+        """
+        Brings the scene up to date with the simulation, building it first if the graph changed.
+
+        Args:
+            graph (Graph): The graph of the simulation.
+            start_point (StartPoint): The start point.
+            end_points (list): The end points.
+            vehicles (list): The vehicles.
+            weather (Weather): The weather conditions.
+            blocked_routes (BlockedRoutes): The blocked routes.
+        """
+        for item in self._path_items:
+            self.canvas.delete(item)
+        self._path_items.clear()
+        self.start_point, self.end_points, self.vehicles = start_point, end_points, vehicles
+        self._vehicles = {vehicle.id: vehicle for vehicle in vehicles}
+
+        refresh = False
+        if graph is not self.graph:
+            ids, xs, ys = graph.coordinates()
+            edges = self._edges(graph)
+            if self.graph is None or not (np.array_equal(ids, self._node_ids) and np.array_equal(xs, self._xs)
+                                          and np.array_equal(ys, self._ys) and edges.keys() == self._edge_index.keys()):
+                self._build(ids, xs, ys, edges, start_point, end_points)
+                refresh = True
+            self.graph = graph
+            refresh |= self._update_edges(np.fromiter((open for _, _, open in edges.values()), dtype=bool,
+                                                      count=len(edges)))
+
+        self._update_weather(weather)
+        self._update_blocked(blocked_routes)
+        self._update_points(start_point, end_points)
+        self._update_vehicles(vehicles)
+        if refresh:
+            self.refresh()
+
+    def refresh(self):
+        """
+        Creates the items of the nodes and edges that came into view, and deletes the ones of the
+        nodes and edges that left it, switching the level of detail if needed.
+        """
+        if self.graph is None:
+            return
+        self._last_region = region = self._region()
+        edges = self._edges_grid.query(*region)
+        nodes = self._nodes_grid.query(*region)
+
+        detail = len(edges) <= DETAIL_EDGE_LIMIT
+        if detail != self.detail:
+            self.canvas.delete("graph")
+            for item in [item for items in (*self._edge_items.values(), *self._node_items.values()) for item in items]:
+                self._tooltips.pop(item, None)
+            self._edge_items.clear()
+            self._node_items.clear()
+            self.detail = detail
+        if self.raster:
+            self._refresh_base(edges, nodes)
+            edges = edges[self._blocked_mask[edges]]
+        elif not detail:
+            edges = self._simplify(edges)
+        if self.raster or not detail:
+            nodes = nodes[self._codes[nodes] != WeatherCondition.SUNNY.value]
+
+        created = self._materialise(self._edge_items, edges, self._create_edge)
+        created |= self._materialise(self._node_items, nodes, self._create_node)
+        if created:
+            # Keep the graph under the points and the vehicles, and the edges under the nodes
+            for tag in ("node", "weather", "edge_marker", "edge", "base"):
+                self.canvas.tag_lower(tag)
+
+    def draw_path_segment(self, start, end):
+        """
+        Draws a segment of a path found, removed by the next update.
+
+        Args:
+            start (Position): The position where the segment starts.
+            end (Position): The position where the segment ends.
+        """
+        self._path_items.append(self.canvas.create_line(*self.to_canvas(start), *self.to_canvas(end), fill="green",
+                                                        width=4, tags="path"))
+
+    def to_canvas(self, position):
+        """
+        Returns the point of the canvas where a position of the map is drawn.
+
+        Args:
+            position (Position): The position on the map.
+
+        Returns:
+            tuple: The x and y coordinates on the canvas.
+        """
+        return self._to_canvas(position.x, position.y)
+
+    def _to_canvas(self, x, y):
+        """
+        Returns the point of the canvas where the coordinates of the map are drawn.
+        """
+        min_x, min_y = self._bounds[0], self._bounds[2]
+        return self.canvas.to_view(50 + (x - min_x) * self._pixels[0], 50 + (y - min_y) * self._pixels[1])
+
+    def _to_map(self, x, y):
+        """
+        Returns the coordinates of the map drawn at a point of the canvas.
+        """
+        x, y = self.canvas.from_view(x, y)
+        return self._bounds[0] + (x - 50) / self._pixels[0], self._bounds[2] + (y - 50) / self._pixels[1]
+
+    def _area(self):
+        """
+        Returns the part of the canvas in view, widened by VIEW_MARGIN on every side, as the
+        smallest and largest x and y coordinates.
+        """
+        x0, y0, x1, y1 = self.canvas.visible_area()
+        margin_x, margin_y = (x1 - x0) * VIEW_MARGIN, (y1 - y0) * VIEW_MARGIN
+        return x0 - margin_x, y0 - margin_y, x1 + margin_x, y1 + margin_y
+
+    def _region(self):
+        """
+        Returns the part of the map in view, widened by VIEW_MARGIN on every side, as the smallest
+        and largest x and y coordinates.
+        """
+        x0, y0, x1, y1 = self._area()
+        return (*self._to_map(x0, y0), *self._to_map(x1, y1))
+
+    def _refresh_base(self, edges, nodes):
+        """
+        Draws the base layer again, unless the one drawn last still covers the view at the current
+        zoom and level of detail.
+
+        Args:
+            edges (numpy.ndarray): The indices of the edges in view.
+            nodes (numpy.ndarray): The indices of the nodes in view.
+        """
+        x0, y0, x1, y1 = self.canvas.visible_area()
+        view = (*self._to_map(x0, y0), *self._to_map(x1, y1))
+        if self._base_view is not None:
+            scale, detail, (min_x, min_y, max_x, max_y) = self._base_view
+            if (scale == self.canvas.scale_factor and detail == self.detail and min_x <= view[0] and min_y <= view[1]
+                    and view[2] <= max_x and view[3] <= max_y):
+                return
+
+        area = self._area()
+        if not self.detail:
+            edges = self._simplify(edges)
+        self._base_image = ImageTk.PhotoImage(self._render_base(edges, nodes, area))
+        if self._base_item is None:
+            self._base_item = self.canvas.create_image(area[0], area[1], image=self._base_image, anchor=NW,
+                                                       tags="base")
+            self.canvas.tag_lower(self._base_item)
+        else:
+            self.canvas.itemconfigure(self._base_item, image=self._base_image)
+            self.canvas.coords(self._base_item, area[0], area[1])
+        self._base_view = (self.canvas.scale_factor, self.detail, self._region())
+
+    def _render_base(self, edges, nodes, area):
+        """
+        Draws edges and nodes on an image, as they would be drawn as items on the canvas.
+
+        Args:
+            edges (numpy.ndarray): The indices of the edges to draw.
+            nodes (numpy.ndarray): The indices of the nodes to draw, in full detail.
+            area (tuple): The smallest and largest x and y coordinates of the canvas the image covers.
+
+        Returns:
+            Image.Image: The image.
+        """
+        image = Image.new("RGB", (ceil(area[2] - area[0]), ceil(area[3] - area[1])), "white")
+        draw = ImageDraw.Draw(image)
+        x1s, y1s = self._to_canvas(self._x1s[edges], self._y1s[edges])
+        x2s, y2s = self._to_canvas(self._x2s[edges], self._y2s[edges])
+        x1s, x2s, y1s, y2s = x1s - area[0], x2s - area[0], y1s - area[1], y2s - area[1]
+        colours = (self._colour("green"), self._colour("black"))
+        for line, open in zip(np.stack((x1s, y1s, x2s, y2s), axis=1).tolist(), self._open[edges].tolist()):
+            draw.line(line, fill=colours[open])
+        if not self.detail:
+            return image
+
+        marker = self.sprites.image("square", (5, 5))
+        mask = marker if marker.mode in ("RGBA", "LA", "P") else None
+        for x, y in zip(((x1s + x2s) / 2 - 2).astype(int).tolist(), ((y1s + y2s) / 2 - 2).astype(int).tolist()):
+            image.paste(marker, (x, y), mask)
+
+        xs, ys = self._to_canvas(self._xs[nodes], self._ys[nodes])
+        xs, ys = (xs - area[0]).tolist(), (ys - area[1]).tolist()
+        scale = self.canvas.scale_factor
+        black = self._colour("black")
+        for radius, fill in ((5 * scale, self._colour(WEATHER_COLOURS[WeatherCondition.SUNNY.value])),
+                             (3 * scale, self._colour("blue"))):
+            for x, y in zip(xs, ys):
+                draw.ellipse((x - radius, y - radius, x + radius, y + radius), fill=fill, outline=black)
+        return image
+
+    def _colour(self, name):
+        """
+        Returns a colour name of Tk as the hexadecimal colour PIL draws it with, since both name
+        some colours differently (Tk's "green" is PIL's "lime").
+        """
+        if name not in self._rgb:
+            self._rgb[name] = "#" + "".join(f"{value >> 8:02x}" for value in self.canvas.winfo_rgb(name))
+        return self._rgb[name]
+
+    def _base_motion(self, event):
+        """
+        Shows the tooltip of the node or edge marker of the base layer under the mouse.
+        """
+        text = self._hit(self.canvas.canvasx(event.x), self.canvas.canvasy(event.y)) if self.detail else None
+        if text:
+            self._show_tooltip(event, text)
+        else:
+            self._hide_tooltip(event)
+
+    def _hit(self, x, y):
+        """
+        Returns the tooltip text of the node or edge marker drawn at a point of the canvas, or None.
+        """
+        radius = max(3 * self.canvas.scale_factor, 2.5)
+        box = (*self._to_map(x - radius, y - radius), *self._to_map(x + radius, y + radius))
+
+        nodes = self._nodes_grid.query(*box)
+        if len(nodes):
+            xs, ys = self._to_canvas(self._xs[nodes], self._ys[nodes])
+            distances = (xs - x) ** 2 + (ys - y) ** 2
+            if distances.min() <= radius ** 2:
+                return f"Node: {self._node_ids[nodes[np.argmin(distances)]]}"
+
+        edges = self._edges_grid.query(*box)
+        if len(edges):
+            x1s, y1s = self._to_canvas(self._x1s[edges], self._y1s[edges])
+            x2s, y2s = self._to_canvas(self._x2s[edges], self._y2s[edges])
+            distances = np.maximum(np.abs((x1s + x2s) / 2 - x), np.abs((y1s + y2s) / 2 - y))
+            if distances.min() <= 2.5:
+                a, b = self._routes[edges[np.argmin(distances)]]
+                return f"Edge: {a},{b}"
+        return None
+
+    def _simplify(self, edges):
+        """
+        Keeps one of the edges between each pair of cells of SIMPLIFY_PIXELS pixels of the canvas,
+        leaving out the edges within a single cell.
+
+        Args:
+            edges (numpy.ndarray): The indices of the edges in view.
+
+        Returns:
+            numpy.ndarray: The indices of the edges to draw.
+        """
+        # Cells are counted from the corner of the map, so dragging the canvas does not change them
+        scale = self.canvas.scale_factor / SIMPLIFY_PIXELS
+        columns = np.floor((np.concatenate((self._x1s[edges], self._x2s[edges])) - self._bounds[0]) * self._pixels[0] * scale)
+        rows = np.floor((np.concatenate((self._y1s[edges], self._y2s[edges])) - self._bounds[2]) * self._pixels[1] * scale)
+        first, second = np.split(rows * (columns.max(initial=0) + 1) + columns, 2)
+        between = first != second
+        pairs = np.stack((np.minimum(first, second), np.maximum(first, second)), axis=1)[between]
+        _, kept = np.unique(pairs, axis=0, return_index=True)
+        return edges[between][np.sort(kept)]
+
+    def _build(self, ids, xs, ys, edges, start_point, end_points):
+        """
+        Clears the canvas, indexes the nodes and edges of the graph and creates the items of the
+        start point and the end points. The items of the graph are created by refresh.
+        """
+        canvas = self.canvas
+        canvas.delete("all")
+        canvas.reset_view()
+        self._tooltips.clear()
+        self.detail = None
+        self._base_item = self._base_image = self._base_view = None
+
+        # Nodes, in the order of graph.nodes
+        self._node_ids, self._xs, self._ys = ids, xs, ys
+        self._bounds = (float(xs.min()), float(xs.max()), float(ys.min()), float(ys.max()))
+        self._pixels = (700 / ((self._bounds[1] - self._bounds[0]) or 1),
+                        500 / ((self._bounds[3] - self._bounds[2]) or 1))
+        self._nodes_grid = SpatialIndex.from_points(xs, ys)
+        self._node_items = {}  # Node index -> (weather oval, node oval or nothing)
+        self._codes = np.full(len(ids), WeatherCondition.SUNNY.value, dtype=np.uint8)
+
+        # Edges, once per pair of nodes
+        self._routes = list(edges)
+        self._edge_index = {route: i for i, route in enumerate(self._routes)}
+        coordinates = np.array([(a.x, a.y, b.x, b.y) for a, b, _ in edges.values()], dtype=np.float64).reshape(-1, 4)
+        self._x1s, self._y1s, self._x2s, self._y2s = coordinates.T
+        self._edges_grid = SpatialIndex.from_segments(self._x1s, self._y1s, self._x2s, self._y2s)
+        self._edge_items = {}  # Edge index -> (line, marker or nothing)
+        self._open = np.ones(len(self._routes), dtype=bool)
+        self._blocked = set()
+        self._blocked_mask = np.zeros(len(self._routes), dtype=bool)
+
+        # Start point
+        x, y = self.to_canvas(start_point.position)
+        self._start_item = canvas.create_image(x, y, image=self.sprites.get("start_position", (30, 30)),
+                                               anchor=CENTER, tags=("start_point", "tooltip"))
+        self._tooltips[self._start_item] = lambda: "Contains: \n" + "\n".join(
+            f"{supply.type.name}: {supply.quantity}" for supply in self.start_point.supplies)
+
+        # End points, each one with its number
+        self._end_point_items = []  # (image item, label item, sprite)
+        for index, end_point in enumerate(end_points):
+            x, y = self.to_canvas(end_point.position)
+            sprite = self._end_point_sprite(end_point)
+            item = canvas.create_image(x, y, image=self.sprites.get(*sprite), anchor=CENTER,
+                                       tags=("end_point", f"end_point:{index}", "tooltip"))
+            label = canvas.create_text(x + 15, y - 15, text=str(index + 1), fill="black", font=("Arial", 12, "bold"),
+                                       tags=("end_point_label", f"end_point_label:{index}"))
+            self._end_point_items.append((item, label, sprite))
+            self._tooltips[item] = lambda index=index: "Needed supplies: \n" + "\n".join(
+                f"{supply_type}: {quantity}"
+                for supply_type, quantity in self.end_points[index].get_supplies_needed().items())
+
+        self._vehicle_items = {}  # Vehicle ID -> (item, sprite, position drawn)
+
+    def _materialise(self, items, wanted, create):
+        """
+        Deletes the items of the nodes or edges that are not wanted any more, and creates the ones
+        of the wanted nodes or edges that have none.
+
+        Args:
+            items (dict): The items of each node or edge with items.
+            wanted (numpy.ndarray): The indices of the nodes or edges that must have items.
+            create (function): A function receiving the index of a node or edge and returning its items.
+
+        Returns:
+            bool: Whether any item was created.
+        """
+        wanted = set(wanted.tolist())
+        for index in items.keys() - wanted:
+            for item in items.pop(index):
+                self.canvas.delete(item)
+                self._tooltips.pop(item, None)
+        missing = wanted - items.keys()
+        for index in missing:
+            items[index] = create(index)
+        return bool(missing)
+
+    def _create_edge(self, index):
+        """
+        Creates the line of an edge and, in full detail, the marker at its midpoint.
+        """
+        a, b = self._routes[index]
+        x1, y1 = self._to_canvas(self._x1s[index], self._y1s[index])
+        x2, y2 = self._to_canvas(self._x2s[index], self._y2s[index])
+        line = self.canvas.create_line(x1, y1, x2, y2, fill=self._edge_colour(index),
+                                       tags=("graph", "edge", f"edge:{a},{b}"))
+        if self.raster or not self.detail:
+            return (line,)
+        marker = self.canvas.create_image((x1 + x2) / 2, (y1 + y2) / 2, image=self.sprites.get("square", (5, 5)),
+                                          anchor=CENTER, tags=("graph", "edge_marker", f"edge_marker:{a},{b}", "tooltip"))
+        self._tooltips[marker] = lambda text=f"Edge: {a},{b}": text
+        return line, marker
+
+    def _create_node(self, index):
+        """
+        Creates the weather oval of a node and, in full detail, the node itself.
+        """
+        node_id = int(self._node_ids[index])
+        x, y = self._to_canvas(self._xs[index], self._ys[index])
+        scale = self.canvas.scale_factor
+        weather = self.canvas.create_oval(x - 5 * scale, y - 5 * scale, x + 5 * scale, y + 5 * scale,
+                                          fill=WEATHER_COLOURS[int(self._codes[index])],
+                                          tags=("graph", "weather", f"weather:{node_id}"))
+        if not self.detail:
+            return (weather,)
+        node = self.canvas.create_oval(x - 3 * scale, y - 3 * scale, x + 3 * scale, y + 3 * scale, fill="blue",
+                                       tags=("graph", "node", f"node:{node_id}", "tooltip"))
+        self._tooltips[node] = lambda text=f"Node: {node_id}": text
+        return weather, node
+
+    @staticmethod
+    def _edges(graph):
+        """
+        Returns the positions of the nodes of each edge of the graph, once per pair of nodes, along
+        with whether the first edge found between them is open.
+        """
+        edges = {}
+        for node in graph.nodes.values():
+            for neighbour, open in node.neighbours:
+                route = (node.id, neighbour.id) if node.id <= neighbour.id else (neighbour.id, node.id)
+                if route not in edges:
+                    edges[route] = (node.position, neighbour.position, open)
+        return edges
+
+    def _edge_colour(self, index):
+        """
+        Returns the colour of an edge: red if blocked, otherwise black if open and green if closed.
+        """
+        if self._blocked_mask[index]:
+            return "red"
+        return "black" if self._open[index] else "green"
+
+    def _recolour(self, index):
+        """
+        Changes the colour of an edge, if it has an item.
+        """
+        items = self._edge_items.get(index)
+        if items is not None:
+            self.canvas.itemconfigure(items[0], fill=self._edge_colour(index))
+
+    def _update_edges(self, open_edges):
+        """
+        Recolours the edges that were opened or closed.
+
+        Returns:
+            bool: Whether the base layer must be drawn again.
+        """
+        changed = np.flatnonzero(open_edges != self._open)
+        self._open = open_edges
+        if self.raster and len(changed):
+            self._base_view = None
+            return True
+        for index in changed:
+            self._recolour(int(index))
+        return False
+
+    def _update_blocked(self, blocked_routes):
+        """
+        Recolours the edges that were blocked or unblocked since the last update.
+        """
+        blocked = {route for route in blocked_routes if route in self._edge_index}
+        changed = blocked ^ self._blocked
+        self._blocked = blocked
+        for route in changed:
+            index = self._edge_index[route]
+            self._blocked_mask[index] = route in blocked
+            if self.raster and self.detail is not None:
+                # Only the blocked edges are items over the base layer
+                self._toggle(self._edge_items, index, route in blocked)
+            else:
+                self._recolour(index)
+
+    def _update_weather(self, weather):
+        """
+        Refills the weather ovals of the nodes whose condition changed since the last update.
+        """
+        codes = weather.codes[self._node_ids]
+        changed = np.flatnonzero(codes != self._codes)
+        self._codes = codes
+        for i in changed.tolist():
+            items = self._node_items.get(i)
+            if ((self.raster and self.detail is not None) or self.detail is False) and \
+                    (items is None) != (codes[i] == WeatherCondition.SUNNY.value):
+                # Sunny nodes have no items on the base layer or when the graph is drawn in less detail
+                self._toggle(self._node_items, i, items is None)
+            elif items is not None:
+                self.canvas.itemconfigure(items[0], fill=WEATHER_COLOURS[int(codes[i])])
+
+    def _toggle(self, items, index, create):
+        """
+        Creates the items of a node or edge, if it is in view, or deletes them.
+
+        Args:
+            items (dict): The items of each node (self._node_items) or edge (self._edge_items).
+            index (int): The index of the node or edge.
+            create (bool): Whether to create the items, rather than delete them.
+        """
+        if not create:
+            for item in items.pop(index, ()):
+                self.canvas.delete(item)
+                self._tooltips.pop(item, None)
+            return
+
+        min_x, min_y, max_x, max_y = self._last_region
+        if items is self._node_items:
+            inside = min_x <= self._xs[index] <= max_x and min_y <= self._ys[index] <= max_y
+        else:
+            inside = (min(self._x1s[index], self._x2s[index]) <= max_x and max(self._x1s[index], self._x2s[index]) >= min_x
+                      and min(self._y1s[index], self._y2s[index]) <= max_y and max(self._y1s[index], self._y2s[index]) >= min_y)
+        if inside and index not in items:
+            if items is self._node_items:
+                items[index] = self._create_node(index)
+                for item in items[index]:
+                    self.canvas.tag_lower(item, "start_point")
+            else:
+                items[index] = self._create_edge(index)
+                self.canvas.tag_raise(items[index][0], "base")
+
+    def _update_points(self, start_point, end_points):
+        """
+        Moves the start point and changes the image of the end points whose priority changed.
+        """
+        self.canvas.coords(self._start_item, *self.to_canvas(start_point.position))
+        for index, (end_point, (item, label, sprite)) in enumerate(zip(end_points, self._end_point_items)):
+            new_sprite = self._end_point_sprite(end_point)
+            if new_sprite != sprite:
+                self.canvas.itemconfigure(item, image=self.sprites.get(*new_sprite))
+                self._end_point_items[index] = (item, label, new_sprite)
+
+    @staticmethod
+    def _end_point_sprite(end_point):
+        """
+        Returns the name and size of the image of an end point.
+        """
+        return ("priority", (25, 25)) if end_point.priority == 1 else ("end_position", (30, 30))
+
+    def _update_vehicles(self, vehicles):
+        """
+        Moves the vehicles whose position changed, creating the items of new vehicles and deleting
+        the ones of vehicles that are gone.
+        """
+        canvas = self.canvas
+        current = set()
+        for i, vehicle in enumerate(vehicles, 1):
+            current.add(vehicle.id)
+            sprite = VEHICLE_SPRITES.get(vehicle.type.transportation)
+            drawn = self._vehicle_items.get(vehicle.id)
+            if drawn is not None and drawn[1] == sprite and drawn[2] == (vehicle.position, i):
+                continue
+
+            position = vehicle.position
+            x, y = self.to_canvas(Position(position.x + VEHICLE_SPACING * i, position.y))
+            if drawn is None or drawn[1] != sprite:
+                if drawn is not None:
+                    canvas.delete(drawn[0])
+                    del self._tooltips[drawn[0]]
+                if sprite is None:
+                    self._vehicle_items.pop(vehicle.id, None)
+                    continue
+                item = canvas.create_image(x, y, image=self.sprites.get(*sprite), anchor=CENTER,
+                                           tags=("vehicle", f"vehicle:{vehicle.id}", "tooltip"))
+                self._tooltips[item] = lambda vehicle_id=vehicle.id: self._vehicle_text(self._vehicles[vehicle_id])
+            else:
+                item = drawn[0]
+                canvas.coords(item, x, y)
+            self._vehicle_items[vehicle.id] = (item, sprite, (vehicle.position, i))
+
+        for vehicle_id in set(self._vehicle_items) - current:
+            item = self._vehicle_items.pop(vehicle_id)[0]
+            canvas.delete(item)
+            del self._tooltips[item]
+
+    @staticmethod
+    def _vehicle_text(vehicle):
+        """
+        Returns the tooltip text of a vehicle.
+        """
+        return (f"Vehicle {vehicle.id} ({vehicle.type.name}) \nFuel: {vehicle.current_fuel}/{vehicle.type.fuel_capacity} "
+                f"\nWeight: {vehicle.current_weight}/{vehicle.type.weight_capacity} \nVolume: "
+                f"{vehicle.current_volume}/{vehicle.type.volume_capacity} \n Average speed: "
+                f"{vehicle.type.average_velocity} km/h")
+
+    def _tooltip_text(self):
+        """
+        Returns the tooltip text of the item under the mouse, worked out from the current state.
+        """
+        items = self.canvas.find_withtag("current")
+        text = self._tooltips.get(items[0]) if items else None
+        return text() if text else ""
@@ -1,22 +1,27 @@
-from os import path
 from tkinter import *
-from PIL import Image, ImageTk
 from ui.graph_canvas import GraphCanvas
+from ui.scene import Scene, SpriteCache
 import time
 from weather import Weather, WeatherCondition
-from graph.position import Position
+from graph.blocked_routes import BlockedRoutes
 
 algorithms = {
     "bfs": "Breadth-first search",
     "dfs": "Depth-first search",
     "ids": "Iterative deepening depth-first search",
     "ucs": "Uniform-Cost search",
+    "bi_ucs": "Bidirectional Uniform-Cost search",
+    "ch": "Contraction Hierarchies search",
     "a_star": "A* search",
+    "bi_a_star": "Bidirectional A* search",
     "greedy": "Greedy search",
+    "ida_star": "Iterative deepening A* search",
+    "lpa_star": "Lifelong Planning A* search",
 }
 
 heuristics = {
     "manhattan_heuristic": "Manhattan Distance",
+    "landmark_heuristic": "Landmarks (ALT)",
     "time_estimation_heuristic": "Time Estimation",
     "blocked_route_heuristic": "Blocked Route",
     "dynamic_supply_priority_heuristic": "Dynamic Supply Priority",
@@ -36,7 +41,7 @@ class Viewer:
     It allows interaction with the simulation like selecting algorithms, heuristics, blocking routes, and displaying simulation results.
     """
 
-    def __init__(self, root, algorithm_callback, start_simulation_callback, restart_simulation_callback, endpoints_callback, reposition_vehicles_callback, change_weather_callback):
+    def __init__(self, root, algorithm_callback, start_simulation_callback, restart_simulation_callback, endpoints_callback, reposition_vehicles_callback, change_weather_callback, serve_all_callback=None, block_route_callback=None, raster=True):
         self.root = root
         self.algorithm_callback = algorithm_callback
         self.start_simulation_callback = start_simulation_callback
@@ -44,6 +49,8 @@ class Viewer:
         self.endpoints_callback = endpoints_callback
         self.reposition_vehicles_callback = reposition_vehicles_callback
         self.change_weather_callback = change_weather_callback
+        self.serve_all_callback = serve_all_callback
+        self.block_route_callback = block_route_callback
         self.selected_end_point_index = 0
 
         root.geometry("1200x600")
@@ -57,39 +64,21 @@ class Viewer:
         self.selected_terrain = list(terrains.keys())[0]
         self.setup_ui()
 
-        self.blocked_routes = set()
-
-        end_image_path = path.join(path.dirname(__file__), "..", "assets", "images", "end_position.png")
-        self.original_end_point_image = Image.open(end_image_path)
-
-        priority_image_path = path.join(path.dirname(__file__), "..", "assets", "images", "priority.png")
-        self.original_priority_point_image = Image.open(priority_image_path)
-
-        start_image_path = path.join(path.dirname(__file__), "..", "assets", "images", "start_position.png")
-        self.original_start_point_image = Image.open(start_image_path)
-
-        truck_image_path = path.join(path.dirname(__file__), "..", "assets", "images", "truck.png")
-        self.original_truck_image = Image.open(truck_image_path)
-
-        boat_image_path = path.join(path.dirname(__file__), "..", "assets", "images", "boat.png")
-        self.original_boat_image = Image.open(boat_image_path)
-
-        drone_image_path = path.join(path.dirname(__file__), "..", "assets", "images", "drone.png")
-        self.original_drone_image = Image.open(drone_image_path)
-
-        square_image_path = path.join(path.dirname(__file__), "..", "assets", "images", "square.png")
-        self.original_square_image = Image.open(square_image_path)
+        self.blocked_routes = BlockedRoutes()
 
         self.tooltip = Label(root, text="", bg="white", fg="black", bd=1, relief=SOLID, padx=5, pady=2)
         self.tooltip.place_forget()
 
-        self.images_on_canvas = []
+        self.sprites = SpriteCache()
+        self.scene = Scene(self.canvas, self.sprites, self.show_tooltip, self.hide_tooltip, raster)
 
     def setup_ui(self):
         menu = Menu(self.root)
 
         # Start Simulation button
         menu.add_command(label="▶ Start Simulation", command=self.start_simulation_callback)
+        if self.serve_all_callback:
+            menu.add_command(label="⇶ Serve All End Points", command=self.serve_all_callback)
 
         # Algorithm selection menu
         algorithm_menu = Menu(menu, tearoff=0)
@@ -146,11 +135,14 @@ class Viewer:
         
         def confirm_block_route():
             route = route_var.get()
-            if "," in route:
+            try:
                 self.block_route(route.strip())
                 print(f"Blocked route: {route.strip()}")
-                self.restart_simulation_callback()
-            else:
+                if self.block_route_callback:
+                    self.block_route_callback(route.strip())
+                else:
+                    self.restart_simulation_callback()
+            except ValueError:
                 print("Invalid route format. Please use 'node1,node2'.")
             block_route_window.destroy()
         
@@ -189,128 +181,8 @@ class Viewer:
         self.tooltip.place_forget()
 
     def display_graph(self, graph, start_point, end_points, vehicles, weather):
-        self.canvas.delete("all")
-        # Scale function for node positions
-        min_x = min(node.position.x for node in graph.nodes.values())
-        max_x = max(node.position.x for node in graph.nodes.values())
-        min_y = min(node.position.y for node in graph.nodes.values())
-        max_y = max(node.position.y for node in graph.nodes.values())
-
-        def scale(x, y):
-            scaled_x = 50 + (x - min_x) / (max_x - min_x) * 700
-            scaled_y = 50 + (y - min_y) / (max_y - min_y) * 500
-            return scaled_x, scaled_y
-
-        # Draw edges
-        drawn_edges = set()
-        for node in graph.nodes.values():
-            for neighbour, open in node.neighbours:
-                route = f'{node.id},{neighbour.id}'
-                if route in drawn_edges or f'{neighbour.id},{node.id}' in drawn_edges:
-                    continue
-                drawn_edges.add(route)
-                
-                x1, y1 = scale(node.position.x, node.position.y)
-                x2, y2 = scale(neighbour.position.x, neighbour.position.y)
-                
-                # Draw the line
-                if route in self.blocked_routes:
-                    self.canvas.create_line(x1, y1, x2, y2, fill="red")
-                else:
-                    self.canvas.create_line(x1, y1, x2, y2, fill="black" if open else "green")
-                
-                # Calculate the midpoint of the edge
-                mid_x = (x1 + x2) / 2
-                mid_y = (y1 + y2) / 2
-                
-                # Tooltip information
-                square_image = self.original_square_image.resize((5, 5), Image.BILINEAR)
-                tk_edge_image = ImageTk.PhotoImage(square_image)
-                self.images_on_canvas.append(tk_edge_image)
-                idEdge = self.canvas.create_image(mid_x, mid_y, image=tk_edge_image, anchor=CENTER)
-                edge_text = f"Edge: {node.id},{neighbour.id}"
-
-                # Bind tooltip to the graphical edge ID
-                self.canvas.tag_bind(idEdge, "<Enter>", lambda e, t=edge_text: self.show_tooltip(e, t))
-                self.canvas.tag_bind(idEdge, "<Leave>", self.hide_tooltip)
-        
-        # Draw Weather & Nodes
-        for node in graph.nodes.values():
-            x, y = scale(node.position.x, node.position.y)
-
-            node_weather = weather.get_condition(Position(node.position.x, node.position.y))
-        
-            if node_weather == WeatherCondition.STORM:
-                self.canvas.create_oval(x - 5, y - 5, x + 5, y + 5, fill="dark violet") 
-            elif node_weather == WeatherCondition.SNOWY:
-                self.canvas.create_oval(x - 5, y - 5, x + 5, y + 5, fill="light sky blue") 
-            elif node_weather == WeatherCondition.RAINY:
-                self.canvas.create_oval(x - 5, y - 5, x + 5, y + 5, fill="navy")
-            elif node_weather == WeatherCondition.SUNNY:
-                self.canvas.create_oval(x - 5, y - 5, x + 5, y + 5, fill="gold")
-
-            x, y = scale(node.position.x, node.position.y)
-            node_id = self.canvas.create_oval(x - 3, y - 3, x + 3, y + 3, fill="blue")
-
-            # Bind tooltip to the graphical edge ID
-            self.canvas.tag_bind(node_id, "<Enter>", lambda e, t="Node: "+str(node.id): self.show_tooltip(e, t))
-            self.canvas.tag_bind(node_id, "<Leave>", self.hide_tooltip)
-
-        # Draw start point
-        x, y = scale(start_point.position.x, start_point.position.y)
-        start_image = self.original_start_point_image.resize((30, 30), Image.BILINEAR)
-        tk_start_image = ImageTk.PhotoImage(start_image)
-        self.images_on_canvas.append(tk_start_image)
-        start_id = self.canvas.create_image(x, y, image=tk_start_image, anchor=CENTER)
-
-        # Tooltip for start point
-        supplies_text = "Contains: \n" + "\n".join(f"{supply.type.name}: {supply.quantity}" for supply in start_point.supplies)
-        self.canvas.tag_bind(start_id, "<Enter>", lambda e, t=supplies_text: self.show_tooltip(e, t))
-        self.canvas.tag_bind(start_id, "<Leave>", self.hide_tooltip)
-
-        # Draw end points
-        for idx, end_point in enumerate(end_points):
-            x, y = scale(end_point.position.x, end_point.position.y)
-            
-            if end_point.priority == 1:
-                end_image = self.original_priority_point_image.resize((25, 25), Image.BILINEAR)
-            else:
-                end_image = self.original_end_point_image.resize((30, 30), Image.BILINEAR)
-            
-            tk_end_image = ImageTk.PhotoImage(end_image)
-            self.images_on_canvas.append(tk_end_image)
-            end_id = self.canvas.create_image(x, y, image=tk_end_image, anchor=CENTER)
-
-            self.canvas.create_text(x + 15, y - 15,text=str(idx + 1),fill="black",font=("Arial", 12, "bold"))
-            # Tooltip para os endpoints
-            needed_supplies_text = "Needed supplies: \n" + "\n".join(
-                f"{supply_type}: {quantity}" for supply_type, quantity in end_point.get_supplies_needed().items()
-            )
-            self.canvas.tag_bind(end_id, "<Enter>", lambda e, t=needed_supplies_text: self.show_tooltip(e, t))
-            self.canvas.tag_bind(end_id, "<Leave>", self.hide_tooltip)
-
-        # Draw vehicles
-        i = 1
-        for vehicle in vehicles:
-            x, y = scale(vehicle.position.x + 0.0006 * i, vehicle.position.y)
-
-            if (vehicle.type.transportation == 0):
-                truck_image = self.original_truck_image.resize((20, 20), Image.BILINEAR)
-                tk_vehicle_image = ImageTk.PhotoImage(truck_image)
-            elif (vehicle.type.transportation == 1):
-                drone_image = self.original_drone_image.resize((25, 25), Image.BILINEAR)
-                tk_vehicle_image = ImageTk.PhotoImage(drone_image)
-            elif (vehicle.type.transportation == 2):
-                boat_image = self.original_boat_image.resize((20, 20), Image.BILINEAR)
-                tk_vehicle_image = ImageTk.PhotoImage(boat_image)
-            self.images_on_canvas.append(tk_vehicle_image)
-            vehicle_id = self.canvas.create_image(x, y, image=tk_vehicle_image, anchor=CENTER)
-            i += 1
-
-            # Tooltip for vehicles
-            vehicle_text = f"Vehicle {vehicle.id} ({vehicle.type.name}) \nFuel: {vehicle.current_fuel}/{vehicle.type.fuel_capacity} \nWeight: {vehicle.current_weight}/{vehicle.type.weight_capacity} \nVolume: {vehicle.current_volume}/{vehicle.type.volume_capacity} \n Average speed: {vehicle.type.average_velocity} km/h"
-            self.canvas.tag_bind(vehicle_id, "<Enter>", lambda e, t=vehicle_text: self.show_tooltip(e, t))
-            self.canvas.tag_bind(vehicle_id, "<Leave>", self.hide_tooltip)
+        # Only the items that changed since the last call are redrawn (see ui/scene.py)
+        self.scene.update(graph, start_point, end_points, vehicles, weather, self.blocked_routes)
 
     def run(self):
         self.root.mainloop()
@@ -320,21 +192,9 @@ class Viewer:
             print("Error: Path requires at least two positions to draw.")
             return
 
-        min_x = min(node.position.x for node in graph.nodes.values())
-        max_x = max(node.position.x for node in graph.nodes.values())
-        min_y = min(node.position.y for node in graph.nodes.values())
-        max_y = max(node.position.y for node in graph.nodes.values())
-
-        def scale(x, y):
-            scaled_x = 50 + (x - min_x) / (max_x - min_x) * 700
-            scaled_y = 50 + (y - min_y) / (max_y - min_y) * 500
-            return scaled_x, scaled_y
-
         def draw_segment(i):
             if i < len(positions) - 1:
-                x1, y1 = scale(positions[i].x, positions[i].y)
-                x2, y2 = scale(positions[i + 1].x, positions[i + 1].y)
-                self.canvas.create_line(x1, y1, x2, y2, fill="green", width=4)
+                self.scene.draw_path_segment(positions[i], positions[i + 1])
                 # All segments get drawn in 1.5 seconds
                 self.root.after(int((1.5 * 1000) // len(positions)), lambda: draw_segment(i + 1))
             else:
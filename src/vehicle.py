@@ -1,6 +1,6 @@
 from enum import Enum
 
-from weather import Weather, WeatherCondition
+from weather import VELOCITY_FACTORS, WeatherCondition
 
 class VehicleStatus(Enum):
     """
@@ -31,13 +31,16 @@ class VehicleType:
         self.average_velocity = average_velocity
 
     def adjust_velocity(self, weather):
-        if weather == WeatherCondition.STORM:
-            return self.average_velocity * 0.5
-        elif weather == WeatherCondition.SNOWY:
-            return self.average_velocity * 0.75
-        elif weather == WeatherCondition.RAINY:
-            return self.average_velocity * 0.9
-        return self.average_velocity
+        """
+        Returns the velocity of the vehicle under a weather condition.
+
+        :param weather: WeatherCondition, or its code as stored in Weather.codes
+        :return: The adjusted velocity
+        """
+        if weather is None:
+            return self.average_velocity
+        code = weather.value if isinstance(weather, WeatherCondition) else weather
+        return self.average_velocity * VELOCITY_FACTORS[code]
 
     def can_access_terrain(self, terrain):
         return self.transportation == terrain
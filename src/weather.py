@@ -1,5 +1,7 @@
 from enum import Enum
 
+import numpy as np
+
 class WeatherCondition(Enum):
     """
     Enum representing different weather conditions.
@@ -9,18 +11,164 @@ class WeatherCondition(Enum):
     SNOWY = 2
     STORM = 3
 
+# Indexed by the value of each WeatherCondition
+CONDITIONS = tuple(WeatherCondition)
+DISTANCE_FACTORS = (1, 1.1, 1.25, 1)
+VELOCITY_FACTORS = (1, 0.9, 0.75, 0.5)
+STORM_CODE = WeatherCondition.STORM.value
+
 class Weather:
     """
     Class for managing weather conditions in the simulation.
+
+    The condition of each node is stored as a uint8 code (the value of its WeatherCondition) in an
+    array indexed by node ID. This makes it cheap to change the weather of many nodes at once, and
+    lets the searches check a node without building a Position to look it up.
+
+    Attributes:
+        codes (numpy.ndarray): uint8 array with the condition code of each node, indexed by node ID.
+        code_bytes (bytearray): The buffer behind codes. Indexing it returns plain ints, which is
+                                faster than indexing the NumPy array one element at a time.
+        xs (numpy.ndarray): float64 array with the x-coordinate of each node, indexed by node ID.
+        ys (numpy.ndarray): float64 array with the y-coordinate of each node, indexed by node ID.
+        version (int): Number increased every time a condition is set, so caches can tell
+                       whether the weather changed since they last looked at it.
     """
-    def __init__(self):
-        self.conditions = {}
+    def __init__(self, graph=None):
+        """
+        Initializes the weather of every node of a graph as SUNNY.
+
+        Node IDs are used as indices, so they must be unique, as the ones assigned by
+        load_map_data_to_graph are.
+
+        :param graph: Graph or CompactGraph whose nodes the weather applies to
+        """
+        self.graph = graph
+        self.version = 0
+        if graph is not None:
+            ids, xs, ys = graph.coordinates()
+        else:
+            ids, xs, ys = np.zeros(0, dtype=np.int32), np.zeros(0), np.zeros(0)
+
+        size = int(ids.max()) + 1 if len(ids) else 0
+        self.code_bytes = bytearray(size)
+        self.codes = np.frombuffer(self.code_bytes, dtype=np.uint8)
+        self.xs = np.full(size, np.nan)
+        self.ys = np.full(size, np.nan)
+        self.xs[ids] = xs
+        self.ys[ids] = ys
+
+    @classmethod
+    def from_codes(cls, graph, code_bytes):
+        """
+        Creates the weather of a graph around an existing buffer of condition codes, such as a block
+        of shared memory, so every change made through it is seen by everyone using the buffer.
+
+        :param graph: Graph or CompactGraph whose nodes the weather applies to
+        :param code_bytes: Writable buffer with one uint8 condition code per node ID
+        :return: Weather reading and writing the buffer
+        """
+        weather = cls(graph)
+        if len(code_bytes) < len(weather.code_bytes):
+            raise ValueError("The buffer is smaller than the number of node IDs of the graph.")
+        weather.code_bytes = code_bytes
+        weather.codes = np.frombuffer(code_bytes, dtype=np.uint8)
+        return weather
+
+    def node_id(self, position):
+        """
+        Returns the ID of the node at a given position, or None if there is none.
+        """
+        if self.graph is None:
+            return None
+        key = self.graph.key_of(position)
+        return self.graph.node_id(key) if key is not None else None
 
     def set_condition(self, position, condition):
-        self.conditions[position] = condition
+        node_id = self.node_id(position)
+        if node_id is None:
+            raise KeyError(position)
+        self.code_bytes[node_id] = condition.value
+        self.version += 1
 
     def get_condition(self, position):
-        return self.conditions.get(position)
-    
+        node_id = self.node_id(position)
+        return CONDITIONS[self.code_bytes[node_id]] if node_id is not None else None
+
     def blocked_position(self, position):
-        return self.conditions[position] == WeatherCondition.STORM
\ No newline at end of file
+        node_id = self.node_id(position)
+        if node_id is None:
+            raise KeyError(position)
+        return self.code_bytes[node_id] == STORM_CODE
+
+    def node_condition(self, node_id):
+        """
+        Returns the weather condition of a node.
+
+        :param node_id: ID of the node
+        :return: WeatherCondition of the node
+        """
+        return CONDITIONS[self.code_bytes[node_id]]
+
+    def node_blocked(self, node_id):
+        """
+        Checks whether a node is blocked by a storm.
+
+        :param node_id: ID of the node
+        :return: True if the node is under a storm, otherwise False
+        """
+        return self.code_bytes[node_id] == STORM_CODE
+
+    def node_distance_factor(self, node_id):
+        """
+        Returns the factor by which the length of a route leading into a node is adjusted.
+
+        :param node_id: ID of the node
+        :return: The multiplier applied to the route's distance
+        """
+        return DISTANCE_FACTORS[self.code_bytes[node_id]]
+
+    def set_node_condition(self, node_id, condition):
+        """
+        Sets the weather condition of a single node.
+
+        :param node_id: ID of the node
+        :param condition: WeatherCondition to set
+        """
+        self.code_bytes[node_id] = condition.value
+        self.version += 1
+
+    def set_nodes_condition(self, node_ids, condition):
+        """
+        Sets the weather condition of several nodes at once.
+
+        :param node_ids: Sequence (or NumPy array) of node IDs
+        :param condition: WeatherCondition to set
+        """
+        self.codes[np.asarray(node_ids, dtype=np.intp)] = condition.value
+        self.version += 1
+
+    def set_region_condition(self, min_x, min_y, max_x, max_y, condition):
+        """
+        Sets the weather condition of every node inside a rectangular region.
+
+        :param min_x: Smallest x-coordinate of the region
+        :param min_y: Smallest y-coordinate of the region
+        :param max_x: Largest x-coordinate of the region
+        :param max_y: Largest y-coordinate of the region
+        :param condition: WeatherCondition to set
+        :return: The number of nodes changed
+        """
+        inside = (self.xs >= min_x) & (self.xs <= max_x) & (self.ys >= min_y) & (self.ys <= max_y)
+        self.codes[inside] = condition.value
+        self.version += 1
+        return int(np.count_nonzero(inside))
+
+    def set_all_conditions(self, condition):
+        """
+        Sets the weather condition of every node.
+
+        :param condition: WeatherCondition to set
+        """
+        self.codes[:] = condition.value
+        self.version += 1
@@ -0,0 +1,5 @@
+import sys
+from os import path
+
+# The modules of src are imported as top-level packages, as bin/bench and bin/route run them
+sys.path.insert(0, path.join(path.dirname(__file__), "..", "src"))
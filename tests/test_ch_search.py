@@ -0,0 +1,27 @@
+import gc
+import weakref
+
+from algorithms.uninformed.ch_search import HIERARCHY_GRAPHS, clear_contraction_hierarchies, get_contraction_hierarchy
+from benchmarks.synthetic import grid_graph
+from graph import contraction_hierarchy
+from graph.compact_graph import CompactGraph
+
+def test_hierarchies_do_not_keep_unused_graphs_alive(tmp_path, monkeypatch):
+    monkeypatch.setattr(contraction_hierarchy, "HIERARCHY_DIRECTORY", str(tmp_path))
+    graph = CompactGraph.from_graph(grid_graph(6, 6))
+    hierarchy = get_contraction_hierarchy(graph)
+    assert get_contraction_hierarchy(graph) is hierarchy
+    graph_ref, hierarchy_ref = weakref.ref(graph), weakref.ref(hierarchy)
+    del graph, hierarchy
+
+    others = [CompactGraph.from_graph(grid_graph(6, 6, seed=seed)) for seed in range(1, HIERARCHY_GRAPHS + 1)]
+    for other in others:
+        get_contraction_hierarchy(other)
+    gc.collect()
+    assert graph_ref() is None and hierarchy_ref() is None
+
+    other_ref = weakref.ref(others[-1])
+    clear_contraction_hierarchies()
+    del others, other
+    gc.collect()
+    assert other_ref() is None
@@ -0,0 +1,42 @@
+import io
+import json
+
+from benchmarks.synthetic import grid_graph, sunny_weather, synthetic_state
+from cli import run_queries
+from graph.spatial_index import NodeIndex
+from weather import WeatherCondition
+
+def build_state():
+    graph = grid_graph(5, 5)
+    positions = list(graph.nodes)
+    return synthetic_state(graph, sunny_weather(graph), positions[0], positions[-1])
+
+def answer(state, queries):
+    output = io.StringIO()
+    run_queries(state, [json.dumps(query) for query in queries], output)
+    return [json.loads(line) for line in output.getvalue().splitlines()]
+
+def test_weather_of_unknown_nodes_is_an_error():
+    state = build_state()
+    results = answer(state, [
+        {"algorithm": "ucs", "weather": {"-1": "STORM"}},
+        {"algorithm": "ucs", "weather": {"3": "RAINY", "999": "STORM"}},
+        {"algorithm": "ucs", "weather": {"3": "RAINY"}},
+    ])
+
+    # Both invalid queries are reported without changing any weather, and the batch goes on
+    assert [result["id"] for result in results] == [1, 2, 3]
+    assert results[0]["error"] == "ValueError: There is no node -1."
+    assert results[1]["error"] == "ValueError: There is no node 999."
+    assert "error" not in results[2] and results[2]["path"] is not None
+    assert state.weather.node_condition(24) == WeatherCondition.SUNNY
+    assert state.weather.node_condition(3) == WeatherCondition.RAINY
+
+def test_end_points_given_by_position_are_snapped():
+    state = build_state()
+    state.node_index = NodeIndex(state.graph)
+    end = state.end_points[0].position
+    results = answer(state, [{"algorithm": "ucs", "end_point": [end.x + 1e-6, end.y - 1e-6]}])
+
+    assert "error" not in results[0]
+    assert results[0]["path"][-1] == [end.x, end.y]
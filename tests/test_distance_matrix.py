@@ -0,0 +1,52 @@
+import random
+
+import numpy as np
+
+from algorithms.distance_matrix import DistanceMatrix
+from benchmarks.synthetic import grid_graph, sunny_weather
+from benchmarks.vehicle_routing import random_state
+from graph.blocked_routes import BlockedRoutes
+from graph.compact_graph import CompactGraph
+from weather import WeatherCondition
+
+def test_refresh_matches_a_full_recompute():
+    rng = random.Random(3)
+    graph = CompactGraph.from_graph(grid_graph(15, 15, seed=3))
+    weather = sunny_weather(graph)
+    state = random_state(graph, weather, 112, rng, 8, 1)
+    blocked_routes = BlockedRoutes()
+    matrix = DistanceMatrix.build(state, 0, weather, blocked_routes)
+
+    refreshed = 0
+    for step in range(40):
+        if step % 4 == 0:
+            a = rng.randrange(len(graph))
+            b = graph.node_id(next(key for key, _ in graph.edges(a)))
+            route = (graph.node_id(a), b)
+            if route in blocked_routes:
+                blocked_routes.discard(route)
+            else:
+                blocked_routes.add(route)
+        else:
+            for node_id in rng.sample(range(len(graph)), 4):
+                weather.set_node_condition(node_id, rng.choice(list(WeatherCondition)))
+
+        refreshed += len(matrix.refresh(weather, blocked_routes))
+        expected = DistanceMatrix.build(state, 0, weather, blocked_routes)
+        np.testing.assert_allclose(matrix.distances, expected.distances)
+        np.testing.assert_allclose(matrix.times, expected.times)
+        for origin in matrix.positions:
+            for destination in matrix.positions:
+                path = matrix.path(origin, destination)
+                assert (path is None) == (expected.path(origin, destination) is None)
+
+    # Some changes did not reach any row
+    assert refreshed < 40 * len(matrix)
+
+def test_refresh_without_changes_recomputes_nothing():
+    graph = CompactGraph.from_graph(grid_graph(10, 10, seed=4))
+    weather = sunny_weather(graph)
+    state = random_state(graph, weather, 0, random.Random(4), 5, 1)
+    matrix = DistanceMatrix.build(state, 0, weather)
+
+    assert matrix.refresh(weather) == []
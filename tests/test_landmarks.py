@@ -0,0 +1,25 @@
+import gc
+import weakref
+
+from algorithms.informed.landmarks import LANDMARK_GRAPHS, clear_landmarks, get_landmarks
+from benchmarks.synthetic import grid_graph
+from graph.compact_graph import CompactGraph
+
+def test_landmarks_do_not_keep_unused_graphs_alive():
+    graph = CompactGraph.from_graph(grid_graph(6, 6))
+    landmarks = get_landmarks(graph)
+    assert get_landmarks(graph) is landmarks
+    graph_ref, landmarks_ref = weakref.ref(graph), weakref.ref(landmarks)
+    del graph, landmarks
+
+    others = [CompactGraph.from_graph(grid_graph(6, 6, seed=seed)) for seed in range(1, LANDMARK_GRAPHS + 1)]
+    for other in others:
+        get_landmarks(other)
+    gc.collect()
+    assert graph_ref() is None and landmarks_ref() is None
+
+    other_ref = weakref.ref(others[-1])
+    clear_landmarks()
+    del others, other
+    gc.collect()
+    assert other_ref() is None
@@ -0,0 +1,29 @@
+import json
+
+import load_dataset
+from benchmarks.synthetic import grid_graph
+
+def test_far_snaps_are_reported_on_stderr(tmp_path, monkeypatch, capsys):
+    graph = grid_graph(5, 5)
+    monkeypatch.setattr(load_dataset, "load_map_data_to_graph", lambda geography: graph)
+    nodes = list(graph.nodes)
+    vehicle_type = {"name": "Camião", "transportation": 0, "fuel_capacity": 100, "weight_capacity": 100,
+                    "volume_capacity": 100, "average_velocity": 60}
+    dataset = {
+        "geography": "synthetic",
+        "start_point": {"position": [nodes[0].x, nodes[0].y], "supplies": [{"type": "Water", "quantity": 10}]},
+        "end_points": [{"position": [nodes[6].x + 1e-6, nodes[6].y], "needs_supplies": {"Water": 5}, "priority": 0},
+                       {"position": [-9.4, 41.55], "needs_supplies": {"Water": 5}, "priority": 0}],
+        "vehicles": [{"id": 1, "position": [nodes[0].x, nodes[0].y], "type": vehicle_type, "current_fuel": 100,
+                      "current_weight": 0, "current_volume": 0, "status": "IDLE"}],
+    }
+    path = tmp_path / "dataset.json"
+    path.write_text(json.dumps(dataset))
+
+    state = load_dataset.load_dataset(path)
+
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert captured.err.count("Warning") == 1 and "End point 2" in captured.err
+    nearest = min(nodes, key=lambda node: (node.x + 9.4) ** 2 + (node.y - 41.55) ** 2)
+    assert [end_point.position for end_point in state.end_points] == [nodes[6], nearest]
@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+from algorithms.registry import find_route
+from benchmarks.synthetic import grid_graph, sunny_weather
+from benchmarks.vehicle_routing import random_state
+from end_point import EndPoint
+from graph.blocked_routes import BlockedRoutes
+from graph.compact_graph import CompactGraph
+from graph.position import Position
+from weather import WeatherCondition
+
+@pytest.mark.parametrize("compact", [False, True], ids=["graph", "compact"])
+@pytest.mark.parametrize("heuristic", ["manhattan_heuristic", "landmark_heuristic"])
+def test_repair_matches_a_fresh_search(compact, heuristic):
+    rng = random.Random(5)
+    graph = CompactGraph.from_graph(grid_graph(12, 12, seed=5, closed=0.1))
+    state = random_state(graph, sunny_weather(graph), 0, rng, 3, 1)
+    if not compact:
+        # The same points, on the graph the compact one was built from
+        state.graph = grid_graph(12, 12, seed=5, closed=0.1)
+    weather = state.weather = sunny_weather(state.graph)
+    blocked_routes = BlockedRoutes()
+    node_ids = list(range(len(graph)))
+
+    for step in range(25):
+        for end_point in state.end_points:
+            args = (state, state.start_point, end_point, "lpa_star", heuristic, 0, weather, blocked_routes)
+            repaired = find_route(*args)
+            fresh = find_route(*args[:3], "a_star", *args[4:])
+            assert (repaired is None) == (fresh is None)
+            if fresh is not None:
+                assert repaired.distance == pytest.approx(fresh.distance)
+
+        if step % 2:
+            for node_id in rng.sample(node_ids, 5):
+                weather.set_node_condition(node_id, rng.choice(list(WeatherCondition)))
+        else:
+            route = (rng.choice(node_ids), rng.choice(node_ids))
+            if route in blocked_routes:
+                blocked_routes.discard(route)
+            else:
+                blocked_routes.add(route)
+            # Block an edge on the current route, so the repair has to find another one
+            path = find_route(state, state.start_point, state.end_points[0], "a_star", heuristic, 0, weather,
+                              blocked_routes)
+            if path is not None and len(path.node_ids) > 2:
+                blocked_routes.add(tuple(path.node_ids[1:3]))
+
+def test_points_that_are_not_nodes_have_no_route():
+    graph = CompactGraph.from_graph(grid_graph(5, 5))
+    weather = sunny_weather(graph)
+    state = random_state(graph, weather, 0, random.Random(0), 1, 1)
+    nowhere = EndPoint(Position(0.0, 0.0), {"Water": 1}, 0)
+    assert find_route(state, state.start_point, nowhere, "lpa_star", "manhattan_heuristic", 0, weather,
+                      BlockedRoutes()) is None
@@ -0,0 +1,100 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+
+import main
+
+from algorithms.registry import find_route
+from algorithms.route_cache import RouteCache
+from benchmarks.synthetic import grid_graph, sunny_weather
+from benchmarks.vehicle_routing import random_state
+from graph.blocked_routes import BlockedRoutes
+from graph.compact_graph import CompactGraph
+from weather import WeatherCondition
+
+ALGORITHMS = (("ucs", None), ("a_star", "manhattan_heuristic"), ("bi_ucs", None))
+
+def distances(state, cache, algorithm, heuristic, blocked_routes):
+    """
+    Returns the distance of the route to each end point, from the cache and from a new search.
+    """
+    cached, searched = [], []
+    for end_point in state.end_points:
+        args = (state, state.start_point, end_point, algorithm, heuristic, 0, state.weather, blocked_routes)
+        for results, route in ((cached, cache.find_route(*args)), (searched, find_route(*args))):
+            results.append(None if route is None else pytest.approx(route.distance))
+    return cached, searched
+
+@pytest.mark.parametrize("algorithm, heuristic", ALGORITHMS)
+def test_selective_invalidation_matches_new_searches(algorithm, heuristic):
+    rng = random.Random(1)
+    graph = CompactGraph.from_graph(grid_graph(15, 15, seed=1))
+    weather = sunny_weather(graph)
+    state = random_state(graph, weather, 112, rng, 20, 1)
+    blocked_routes = BlockedRoutes()
+    cache = RouteCache()
+
+    worse = (WeatherCondition.RAINY, WeatherCondition.SNOWY, WeatherCondition.STORM)
+    for step in range(30):
+        cached, searched = distances(state, cache, algorithm, heuristic, blocked_routes)
+        assert cached == searched
+
+        if step % 3 == 0:
+            # Routes blocked, or unblocked
+            a = rng.randrange(len(graph))
+            b = graph.node_id(next(key for key, _ in graph.edges(a)))
+            route = (graph.node_id(a), b)
+            if route in blocked_routes:
+                blocked_routes.discard(route)
+                cache.invalidate_routes([route], weather, blocked_routes, unblocked=True)
+            else:
+                blocked_routes.add(route)
+                cache.invalidate_routes([route], weather, blocked_routes)
+        else:
+            # Weather getting worse on some nodes, and sometimes better
+            node_ids = rng.sample(range(len(graph)), 3)
+            previous = [weather.node_condition(node_id) for node_id in node_ids]
+            for node_id in node_ids:
+                condition = WeatherCondition.SUNNY if step % 5 == 0 else rng.choice(worse)
+                weather.set_node_condition(node_id, condition)
+            cache.invalidate_nodes(node_ids, weather, blocked_routes, previous)
+
+    # Only the entries touched by a change were dropped
+    assert cache.hits > 0
+
+def test_untold_change_drops_every_entry():
+    graph = CompactGraph.from_graph(grid_graph(10, 10, seed=2))
+    weather = sunny_weather(graph)
+    state = random_state(graph, weather, 0, random.Random(2), 5, 1)
+    blocked_routes = BlockedRoutes()
+    cache = RouteCache()
+    distances(state, cache, "ucs", None, blocked_routes)
+
+    weather.set_node_condition(55, WeatherCondition.STORM)
+    cached, searched = distances(state, cache, "ucs", None, blocked_routes)
+    assert cached == searched
+    assert cache.hits == 0
+
+def test_blocking_a_route_in_the_viewer_keeps_the_other_entries(monkeypatch):
+    graph = CompactGraph.from_graph(grid_graph(10, 10, seed=3))
+    weather = sunny_weather(graph)
+    state = random_state(graph, weather, 0, random.Random(3), 5, 1)
+    app = SimpleNamespace(blocked_routes=BlockedRoutes(), display_graph=lambda *args: None)
+    cache = RouteCache()
+    monkeypatch.setattr(main, "state", state)
+    monkeypatch.setattr(main, "app", app)
+    monkeypatch.setattr(main, "route_cache", cache)
+    distances(state, cache, "ucs", None, app.blocked_routes)
+
+    # The Viewer blocks the first edge of the route to the first end point, then tells main
+    args = (state, state.start_point, state.end_points[0], "ucs", None, 0, weather, app.blocked_routes)
+    a, b = find_route(*args).node_ids[:2]
+    app.blocked_routes.add(f"{a},{b}")
+    main.block_route(f"{a},{b}")
+
+    kept = len(cache)
+    assert 0 < kept < len(state.end_points)
+    cached, searched = distances(state, cache, "ucs", None, app.blocked_routes)
+    assert cached == searched
+    assert cache.hits == kept
@@ -0,0 +1,68 @@
+import random
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import grid_graph
+from graph.position import Position
+from graph.spatial_index import NodeIndex, SpatialIndex
+
+def brute_force_distances(index, x, y):
+    dx = np.maximum(np.maximum(index.min_xs - x, x - index.max_xs), 0)
+    dy = np.maximum(np.maximum(index.min_ys - y, y - index.max_ys), 0)
+    return np.hypot(dx, dy)
+
+def random_points(rng, count, width=1.0, height=1.0):
+    # Rounded coordinates, so that some items are at the same distance and ties get tested
+    xs = np.array([round(rng.uniform(0, width), 2) for _ in range(count)])
+    ys = np.array([round(rng.uniform(0, height), 2) for _ in range(count)])
+    return xs, ys
+
+def random_segments(rng, count):
+    x1s, y1s = random_points(rng, count)
+    x2s = x1s + np.array([rng.uniform(-0.1, 0.1) for _ in range(count)])
+    y2s = y1s + np.array([rng.uniform(-0.1, 0.1) for _ in range(count)])
+    return SpatialIndex.from_segments(x1s, y1s, x2s, y2s)
+
+def queries(rng, count):
+    # Points inside the items' bounding box, around it and far outside of it
+    for _ in range(count):
+        yield rng.uniform(-0.2, 1.2), rng.uniform(-0.2, 1.2)
+    yield from ((-50.0, 0.5), (0.5, 80.0), (100.0, -100.0), (0.5, 0.5))
+
+@pytest.mark.parametrize("build", [
+    lambda rng: SpatialIndex.from_points(*random_points(rng, 500)),
+    lambda rng: SpatialIndex.from_points(*random_points(rng, 300, width=200.0)),
+    lambda rng: random_segments(rng, 300),
+], ids=["points", "elongated", "segments"])
+def test_queries_match_brute_force(build):
+    rng = random.Random(7)
+    index = build(rng)
+    for x, y in queries(rng, 60):
+        distances = brute_force_distances(index, x, y)
+        expected = np.lexsort((np.arange(len(index)), distances))
+        for k in (1, 5, 40):
+            np.testing.assert_array_equal(index.k_nearest(x, y, k), expected[:k])
+        assert index.nearest(x, y) == expected[0]
+
+        radius = rng.uniform(0, 0.3)
+        np.testing.assert_array_equal(index.within_radius(x, y, radius), np.flatnonzero(distances <= radius))
+
+def test_k_larger_than_the_items_returns_them_all():
+    index = SpatialIndex.from_points(np.array([0.0, 1.0, 2.0]), np.array([0.0, 0.0, 0.0]))
+    np.testing.assert_array_equal(index.k_nearest(1.9, 0.0, 10), [2, 1, 0])
+
+def test_empty_index():
+    index = SpatialIndex.from_points(np.zeros(0), np.zeros(0))
+    assert len(index.k_nearest(0.0, 0.0, 3)) == 0
+    assert index.nearest(0.0, 0.0) is None
+    assert len(index.within_radius(0.0, 0.0, 1.0)) == 0
+
+def test_snap_moves_positions_onto_nodes():
+    graph = grid_graph(12, 12, seed=2)
+    node_index = NodeIndex(graph)
+    nodes = list(graph.nodes)
+    positions = [Position(node.x + 1e-5, node.y - 1e-5) for node in nodes[::10]]
+    assert node_index.snap(positions) == nodes[::10]
+    assert node_index.snap([Position(-20.0, 60.0)]) == [min(nodes, key=lambda node: (node.x + 20.0) ** 2
+                                                                                    + (node.y - 60.0) ** 2)]
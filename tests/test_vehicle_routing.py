@@ -0,0 +1,48 @@
+from algorithms.vehicle_routing import plan_tours
+from end_point import EndPoint
+from graph.graph import Graph
+from graph.position import Position
+from load_dataset import State
+from start_point import StartPoint
+from supply import Supply, SupplyType
+from vehicle import Vehicle, VehicleStatus, VehicleType
+from weather import Weather
+
+def build_state(fuels):
+    """
+    A depot with end points A and B 10 away from it and 1 apart, and a higher priority end point C
+    30 away, each needing 4 units of water, and one vehicle of capacity 10 per fuel given.
+    """
+    depot, a, b, c = Position(0, 0), Position(5, 5), Position(5.5, 4.5), Position(-30, 0)
+    graph = Graph()
+    for i, position in enumerate((depot, a, b, c)):
+        graph.add_node(position, i)
+    for first, second in ((depot, a), (depot, b), (a, b), (depot, c)):
+        graph.add_edge(first, second)
+
+    vehicle_type = VehicleType("Carrinha", 0, 100, 10, 10, 60)
+    vehicles = [Vehicle(i, depot, vehicle_type, fuel, 0, 0, VehicleStatus.IDLE) for i, fuel in enumerate(fuels)]
+    end_points = [EndPoint(a, {"Water": 4}, 1), EndPoint(b, {"Water": 4}, 1), EndPoint(c, {"Water": 4}, 3)]
+    start_point = StartPoint(depot, [Supply(100, SupplyType.Water)])
+    return State(0, vehicles, start_point, end_points, graph, Weather(graph))
+
+def test_left_over_visit_goes_to_a_free_vehicle():
+    state = build_state([100, 10.5])
+    plan = plan_tours(state, time_budget=0.1)
+
+    assert plan.unserved == []
+    served = {visit.end_point.position for tour in plan.tours for visit in tour.visits}
+    assert served == {end_point.position for end_point in state.end_points}
+    for tour in plan.tours:
+        assert tour.distance <= tour.vehicle.current_fuel
+        assert tour.weight <= tour.vehicle.type.weight_capacity
+
+def test_visits_out_of_every_vehicle_range_are_unserved():
+    state = build_state([10.5])
+    plan = plan_tours(state, time_budget=0.1)
+
+    # C is too far, and A and B together are 11 away
+    assert len(plan.tours) == 1 and len(plan.tours[0].visits) == 1
+    assert plan.tours[0].distance <= 10.5
+    unserved = {visit.end_point.position for visit in plan.unserved}
+    assert len(unserved) == 2 and Position(-30, 0) in unserved